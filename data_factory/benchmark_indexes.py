@@ -0,0 +1,132 @@
+import datetime
+
+import click
+import factory
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable, Select
+
+from data_factory.factories import ShiftFactory, session
+from data_factory.main import (
+    create_approved_requests_and_members_with_user_tasks,
+    generate_fake_data,
+    get_random_user_ids,
+    logger,
+)
+from src.core.db.models import Member, Report, Shift, User
+from src.core.settings import settings
+
+INDEXES = (
+    "ix_members_shift_id_status",
+    "ix_reports_member_id_task_date",
+    "ix_reports_shift_id_created_at_id",
+    "ix_reports_shift_id_status_created_at_id",
+    "ix_reports_reviewing_member_id",
+    "ix_reports_waiting_task_date",
+)
+EXCLUDING_TASK_AMOUNT = 5
+
+
+class Explain(Executable, ClauseElement):
+    """Запрос EXPLAIN ANALYZE для переданного запроса."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return f"EXPLAIN (ANALYZE, BUFFERS) {compiler.process(element.statement, **kwargs)}"
+
+
+def create_finished_shifts(count: int) -> None:
+    """Создать дополнительные завершенные смены с участниками и отчетами."""
+    with factory.Faker.override_default_locale("ru_RU"):
+        for shift in ShiftFactory.create_batch(count, status=Shift.Status.FINISHED):
+            logger.info("Создание одобренных заявок и заданий для завершенной смены...")
+            create_approved_requests_and_members_with_user_tasks(get_random_user_ids(15, User.Status.VERIFIED), shift)
+
+
+def get_hot_queries() -> dict[str, Select]:
+    """Получить запросы репозиториев, для которых созданы индексы."""
+    shift_id = session.scalars(select(Shift.id).where(Shift.status == Shift.Status.STARTED)).first()
+    member = session.scalars(select(Member).where(Member.shift_id == shift_id)).first()
+    today = datetime.date.today()
+    return {
+        "ReportRepository.get_current_report": select(Report.id).where(
+            Report.member_id == member.id,
+            Report.task_date == today,
+        ),
+        "ReportRepository.get_summaries_of_reports": select(Report.id)
+        .where(Report.shift_id == shift_id, Report.status == Report.Status.REVIEWING)
+        .order_by(Report.created_at, Report.id)
+        .limit(settings.REPORTS_PAGE_SIZE),
+        "ReportRepository.set_status_to_waiting_reports": select(Report.id).where(
+            Report.status == Report.Status.WAITING
+        ),
+        "MemberRepository.get_members_for_excluding": select(Member.id)
+        .join(Report)
+        .where(
+            Member.shift_id == shift_id,
+            Member.status == Member.Status.ACTIVE,
+            Report.status == Report.Status.SKIPPED,
+            Report.task_date >= func.current_date() - EXCLUDING_TASK_AMOUNT,
+        )
+        .group_by(Member.id)
+        .having(func.count() >= EXCLUDING_TASK_AMOUNT),
+        "MemberRepository.get_members_for_reminding": select(Member.id)
+        .join(Report)
+        .where(
+            Member.shift_id == shift_id,
+            Member.status == Member.Status.ACTIVE,
+            Report.status == Report.Status.WAITING,
+            Report.task_date == today,
+        ),
+        "MemberRepository.is_unreviewed_report_exists": select(
+            select(Report.id).where(Report.status == Report.Status.REVIEWING, Report.member_id == member.id).exists()
+        ),
+        "MemberRepository.get_active_members_for_shift": select(Member.id).where(
+            Member.shift_id == shift_id, Member.status == Member.Status.ACTIVE
+        ),
+    }
+
+
+def log_plans(queries: dict[str, Select], title: str) -> None:
+    for name, statement in queries.items():
+        plan = "\n".join(session.scalars(Explain(statement)).all())
+        logger.info(f"{name} ({title}):\n{plan}")
+
+
+def compare_plans() -> None:
+    """Вывести планы выполнения запросов с индексами и без них.
+
+    Индексы удаляются внутри транзакции, которая затем откатывается, поэтому схема БД не меняется.
+    На время сравнения таблицы reports и members блокируются.
+    """
+    session.execute(text("ANALYZE reports, members"))
+    session.commit()
+    queries = get_hot_queries()
+    log_plans(queries, "с индексами")
+    try:
+        for index in INDEXES:
+            session.execute(text(f"DROP INDEX {index}"))
+        log_plans(queries, "без индексов")
+    finally:
+        session.rollback()
+
+
+@click.command()
+@click.option('--fill', is_flag=True, help="Наполнение БД тестовыми данными перед сравнением")
+@click.option('--shifts', default=0, help="Количество дополнительных завершенных смен с отчетами")
+def benchmark_command(fill, shifts) -> None:
+    if fill:
+        generate_fake_data()
+    if shifts:
+        create_finished_shifts(shifts)
+    compare_plans()
+
+
+if __name__ == "__main__":
+    benchmark_command()
@@ -0,0 +1,73 @@
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+import click
+
+from src.core.services.password_hasher import PASSWORD_CONTEXT, PasswordHasher
+from src.core.settings import settings
+
+PASSWORD = "benchmark-password"
+PROBE_INTERVAL = 0.01
+
+
+async def verify_in_event_loop(plain_password: str, hashed_password: str) -> bool:
+    """Проверка пароля прямо в цикле событий, как до переноса хэширования в пул потоков."""
+    return PASSWORD_CONTEXT.verify(plain_password, hashed_password)
+
+
+async def run_logins(verify: Callable[[str, str], Awaitable[bool]], logins: int) -> tuple[float, list[float]]:
+    """Одновременно проверить пароли logins раз и измерить задержки цикла событий.
+
+    Пока идут проверки, отдельная задача засыпает на PROBE_INTERVAL и замеряет, насколько позже
+    она просыпается. Эта задержка - время, на которое откладывается обработка обновлений бота.
+    """
+    hashed_password = PASSWORD_CONTEXT.hash(PASSWORD)
+    lags = []
+    finished = asyncio.Event()
+
+    async def probe() -> None:
+        while not finished.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(verify(PASSWORD, hashed_password) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    finished.set()
+    await probe_task
+    return elapsed, lags
+
+
+def log_result(title: str, logins: int, elapsed: float, lags: list[float]) -> None:
+    click.echo(
+        f"{title}: {logins / elapsed:.1f} входов/с, "
+        f"задержка цикла событий: медиана {statistics.median(lags) * 1000:.1f} мс, "
+        f"максимум {max(lags) * 1000:.1f} мс"
+    )
+
+
+async def compare(logins: int, workers: int) -> None:
+    elapsed, lags = await run_logins(verify_in_event_loop, logins)
+    log_result("В цикле событий", logins, elapsed, lags)
+    password_hasher = PasswordHasher(workers)
+    try:
+        elapsed, lags = await run_logins(password_hasher.verify, logins)
+    finally:
+        password_hasher.shutdown()
+    log_result(f"В пуле потоков ({workers})", logins, elapsed, lags)
+
+
+@click.command()
+@click.option('--logins', default=50, help="Количество одновременных входов администраторов")
+@click.option('--workers', default=settings.PASSWORD_HASHING_WORKERS, help="Количество потоков для проверки паролей")
+def benchmark_command(logins, workers) -> None:
+    asyncio.run(compare(logins, workers))
+
+
+if __name__ == "__main__":
+    benchmark_command()
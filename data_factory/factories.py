@@ -10,7 +10,7 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 from src.bot import services  # noqa: prevent circular imports error
 from src.core.db import models
 from src.core.db.models import Report, Shift, Task
-from src.core.services.authentication_service import AuthenticationService
+from src.core.services.password_hasher import PASSWORD_CONTEXT
 from src.core.services.shift_service import FINAL_MESSAGE
 from src.core.settings import settings
 
@@ -161,6 +161,6 @@ class AdministratorFactory(BaseFactory):
     name = factory.Faker("first_name")
     surname = factory.Faker("last_name")
     email = "user@example.com"
-    hashed_password = AuthenticationService.get_hashed_password("string")
+    hashed_password = PASSWORD_CONTEXT.hash("string")
     role = models.Administrator.Role.ADMINISTRATOR
     status = models.Administrator.Status.ACTIVE
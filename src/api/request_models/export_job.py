@@ -0,0 +1,12 @@
+from typing import Optional
+from uuid import UUID
+
+from src.api.request_models.request_base import RequestBase
+from src.core.db.models import ExportJob
+
+
+class ExportJobCreateRequest(RequestBase):
+    """Модель создания задания на формирование отчёта."""
+
+    report_type: ExportJob.ReportType
+    shift_id: Optional[UUID]
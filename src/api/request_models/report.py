@@ -1,9 +1,11 @@
 from typing import Optional
 
 from pydantic import Field, validator
+from pydantic.schema import UUID
 
 from src.api.request_models.request_base import RequestBase
 from src.core.db.models import Report
+from src.core.settings import settings
 
 
 class ChangeStatusRequest(RequestBase):
@@ -18,6 +20,13 @@ class ChangeStatusRequest(RequestBase):
         return value
 
 
+class ReportsModerationRequest(ChangeStatusRequest):
+    """Модель проверки нескольких отчетов."""
+
+    status: Report.Status = Field(...)
+    report_ids: list[UUID] = Field(..., min_items=1, max_items=settings.REPORTS_MAX_MODERATION_BATCH_SIZE)
+
+
 class ReportUpdateRequest(RequestBase):
     status: Optional[Report.Status]
     report_url: Optional[str]
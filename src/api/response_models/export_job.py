@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.core.db.models import ExportJob
+
+
+class ExportJobResponse(BaseModel):
+    """Схема для отображения информации о задании на формирование отчёта."""
+
+    id: UUID
+    report_type: ExportJob.ReportType
+    shift_id: Optional[UUID]
+    status: ExportJob.Status
+    created_at: datetime
+    finished_at: Optional[datetime]
+    error: Optional[str]
+
+    class Config:
+        orm_mode = True
@@ -17,3 +17,24 @@ class HealthcheckResponse(BaseModel):
 
     timestamp: datetime
     components: list[ComponentItemHealthcheck]
+
+
+class DbPoolStatusResponse(BaseModel):
+    """Model for displaying the database connection pool state from /healthcheck/db_pool."""
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    average_wait_time: float
+    max_wait_time: float
+
+
+class MessageRateStatusResponse(BaseModel):
+    """Model for displaying the bot message sending rate from /healthcheck/message_rate."""
+
+    effective_messages_per_second: float
+    messages_per_second_limit: float
+    max_messages_per_second: float
+    pause_seconds: float
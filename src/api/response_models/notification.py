@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.core.db.models import OutgoingMessage
+
+
+class NotificationResponse(BaseModel):
+    """Схема для отображения статуса отправки уведомления участнику."""
+
+    id: UUID
+    user_id: UUID
+    status: OutgoingMessage.Status
+    attempts: int
+    created_at: datetime
+    send_after: datetime
+    sent_at: Optional[datetime]
+    error: Optional[str]
+
+    class Config:
+        orm_mode = True
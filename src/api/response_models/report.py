@@ -22,6 +22,7 @@ class ReportResponse(BaseModel):
     report_url: Optional[str]
     uploaded_at: Optional[datetime]
     number_attempt: int
+    notification_id: Optional[UUID]
 
     class Config:
         orm_mode = True
@@ -48,6 +49,26 @@ class ReportSummaryResponse(BaseModel):
         orm_mode = True
 
 
+class ReportsModerationResponse(BaseModel):
+    """Результат проверки нескольких отчетов."""
+
+    reviewed: list[UUID]
+    skipped: list[UUID]
+
+    class Config:
+        orm_mode = True
+
+
+class ReportSummaryPageResponse(BaseModel):
+    """Страница списка отчетов с курсором для получения следующей страницы."""
+
+    items: list[ReportSummaryResponse]
+    next_cursor: str | None
+
+    class Config:
+        orm_mode = True
+
+
 class ShortReportResponse(BaseModel):
     """Модель с краткой информацией об отчёте."""
 
@@ -18,9 +18,10 @@ class RequestResponse(BaseModel):
     phone_number: str
     request_status: Request.Status
     user_status: User.Status
+    notification_id: UUID | None
 
     @classmethod
-    def parse_from(cls, obj: Request) -> RequestResponse:
+    def parse_from(cls, obj: Request, notification_id: UUID | None = None) -> RequestResponse:
         """Парсит модель sqlalchemy Request, полученной с помощью метода get класса RequestRepository."""
         return cls(
             request_id=obj.id,
@@ -32,4 +33,5 @@ class RequestResponse(BaseModel):
             phone_number=obj.user.phone_number,
             request_status=obj.status,
             user_status=obj.user.status,
+            notification_id=notification_id,
         )
@@ -3,11 +3,15 @@ from http import HTTPStatus
 from uuid import UUID
 
 from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi_restful.cbv import cbv
 
+from src.api.request_models.export_job import ExportJobCreateRequest
+from src.api.response_models.error import generate_error_responses
+from src.api.response_models.export_job import ExportJobResponse
 from src.core.services.analytics_service import AnalyticsService
+from src.core.services.export_job_service import ExportJobService
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -15,6 +19,7 @@ router = APIRouter(prefix="/analytics", tags=["Analytics"])
 @cbv(router)
 class AnalyticsCBV:
     _analytics_service: AnalyticsService = Depends()
+    _export_job_service: ExportJobService = Depends()
     _token: HTTPAuthorizationCredentials = Depends(HTTPBearer())
 
     @router.get(
@@ -30,8 +35,8 @@ class AnalyticsCBV:
         """Формирует excel файл со всеми отчётами."""
         filename = f"full_report_{datetime.now()}.xlsx"
         headers = {'Content-Disposition': f'attachment; filename={filename}'}
-        workbook = await self._analytics_service.generate_full_report()
-        return StreamingResponse(workbook, headers=headers)
+        report = await self._analytics_service.generate_full_report()
+        return StreamingResponse(report, headers=headers)
 
     @router.get(
         "/tasks",
@@ -50,8 +55,8 @@ class AnalyticsCBV:
         """
         filename = f"tasks_report_{datetime.now()}.xlsx"
         headers = {'Content-Disposition': f'attachment; filename={filename}'}
-        workbook = await self._analytics_service.generate_task_report()
-        return StreamingResponse(workbook, headers=headers)
+        report = await self._analytics_service.generate_task_report()
+        return StreamingResponse(report, headers=headers)
 
     @router.get(
         "/{shift_id}/shift_report",
@@ -69,7 +74,50 @@ class AnalyticsCBV:
         - количество отчетов принятых с 1-й/2-й/3-й попытки;
         - общее количество принятых/отклонённых/не предоставленных отчётов по каждому заданию.
         """
-        filename = await self._analytics_service.generate_shift_report_filename(shift_id)
+        filename, report = await self._analytics_service.generate_report_for_shift(shift_id)
         headers = {'Content-Disposition': f'attachment; filename={filename}'}
-        workbook = await self._analytics_service.generate_report_for_shift(shift_id)
-        return StreamingResponse(workbook, headers=headers)
+        return StreamingResponse(report, headers=headers)
+
+    @router.post(
+        "/exports",
+        response_model=ExportJobResponse,
+        status_code=HTTPStatus.CREATED,
+        summary="Создание задания на формирование отчёта",
+        responses=generate_error_responses(HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND),
+    )
+    async def create_export_job(self, export_job: ExportJobCreateRequest) -> ExportJobResponse:
+        """
+        Ставит в очередь формирование отчёта. Готовность отчёта проверяется по статусу задания.
+
+        - **report_type**: тип отчёта: full - полный отчёт, tasks - отчёт с задачами, shift - отчёт по смене
+        - **shift_id**: id смены, обязателен для отчёта по смене
+
+        Отчёт по завершённой смене кэшируется: если данные смены не менялись,
+        возвращается уже выполненное задание с готовым файлом.
+        """
+        return await self._export_job_service.create_job(export_job.report_type, export_job.shift_id)
+
+    @router.get(
+        "/exports/{job_id}",
+        response_model=ExportJobResponse,
+        status_code=HTTPStatus.OK,
+        summary="Получение статуса задания на формирование отчёта",
+        responses=generate_error_responses(HTTPStatus.NOT_FOUND),
+    )
+    async def get_export_job(self, job_id: UUID) -> ExportJobResponse:
+        """Возвращает задание на формирование отчёта со статусом: queued, running, done, failed или expired."""
+        return await self._export_job_service.get_job(job_id)
+
+    @router.get(
+        "/exports/{job_id}/download",
+        response_model=None,
+        response_class=FileResponse,
+        status_code=HTTPStatus.OK,
+        summary="Скачивание сформированного отчёта",
+        responses=generate_error_responses(HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND),
+    )
+    async def download_export(self, job_id: UUID) -> FileResponse:
+        """Возвращает файл отчёта выполненного задания."""
+        export_job = await self._export_job_service.get_job_with_file(job_id)
+        headers = {'Content-Disposition': f'attachment; filename={export_job.filename}'}
+        return FileResponse(export_job.file_path, headers=headers)
@@ -4,7 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi_restful.cbv import cbv
 
-from src.api.response_models.healthcheck import HealthcheckResponse
+from src.api.response_models.healthcheck import (
+    DbPoolStatusResponse,
+    HealthcheckResponse,
+    MessageRateStatusResponse,
+)
 from src.core.services.healthcheck_service import HealthcheckService
 
 router = APIRouter()
@@ -29,6 +33,29 @@ class HealthcheckCBV:
                 raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=jsonable_encoder(result))
         return result
 
+    @router.get(
+        "/healthcheck/db_pool",
+        response_model=DbPoolStatusResponse,
+        summary="Получить состояние пула соединений с БД.",
+        response_description="Размер пула, количество занятых соединений и время ожидания соединения (в секундах).",
+    )
+    def get_db_pool_status(self) -> DbPoolStatusResponse:
+        """Возвращает метрики пула соединений с БД для мониторинга."""
+        return self.healthcheck_service.get_db_pool_status()
+
+    @router.get(
+        "/healthcheck/message_rate",
+        response_model=MessageRateStatusResponse,
+        summary="Получить скорость отправки сообщений ботом.",
+        response_description=(
+            "Фактическая скорость отправки (сообщений в секунду), текущее и максимальное ограничение скорости "
+            "и оставшееся время паузы после ошибки RetryAfter (в секундах)."
+        ),
+    )
+    def get_message_rate_status(self) -> MessageRateStatusResponse:
+        """Возвращает метрики отправки сообщений ботом для мониторинга."""
+        return self.healthcheck_service.get_message_rate_status()
+
     @router.get(
         "/ping",
         status_code=HTTPStatus.OK,
@@ -0,0 +1,40 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi_restful.cbv import cbv
+from pydantic.schema import UUID
+
+from src.api.response_models.error import generate_error_responses
+from src.api.response_models.notification import NotificationResponse
+from src.core.services.authentication_service import AuthenticationService
+from src.core.services.notification_service import NotificationService
+
+router = APIRouter(prefix="/notifications", tags=["Notification"])
+
+
+@cbv(router)
+class NotificationCBV:
+    authentication_service: AuthenticationService = Depends()
+    token: HTTPAuthorizationCredentials = Depends(HTTPBearer())
+    notification_service: NotificationService = Depends()
+
+    @router.get(
+        "/{notification_id}",
+        response_model=NotificationResponse,
+        status_code=HTTPStatus.OK,
+        summary="Получить статус отправки уведомления участнику.",
+        responses=generate_error_responses(HTTPStatus.NOT_FOUND),
+    )
+    async def get_notification(self, notification_id: UUID) -> NotificationResponse:
+        """
+        Возвращает статус отправки уведомления, id которого передаётся в ответе на проверку отчета или заявки.
+
+        - **status**: queued - ожидает отправки, sent - отправлено, failed - не отправлено после всех попыток,
+        blocked - участник заблокировал бота
+        - **attempts**: количество выполненных попыток отправки
+        - **send_after**: время следующей попытки отправки
+        - **error**: ошибка последней попытки отправки
+        """
+        await self.authentication_service.check_administrator_by_token(self.token)
+        return await self.notification_service.get_notification(notification_id)
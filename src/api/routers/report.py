@@ -1,17 +1,24 @@
+from datetime import date
 from http import HTTPStatus
 from typing import Any
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi_restful.cbv import cbv
 from pydantic.schema import UUID
 
+from src.api.request_models.report import ReportsModerationRequest
 from src.api.response_models.error import generate_error_responses
-from src.api.response_models.report import ReportResponse, ReportSummaryResponse
+from src.api.response_models.report import (
+    ReportResponse,
+    ReportsModerationResponse,
+    ReportSummaryPageResponse,
+)
 from src.core.db.models import Report
 from src.core.services.authentication_service import AuthenticationService
 from src.core.services.report_service import ReportService
 from src.core.services.shift_service import ShiftService
+from src.core.settings import settings
 
 router = APIRouter(prefix="/reports", tags=["Report"])
 
@@ -59,11 +66,16 @@ class ReportsCBV:
     async def approve_task_status(
         self,
         report_id: UUID,
-        request: Request,
     ) -> ReportResponse:
-        """Отчет участника проверен и принят."""
-        administrator = await self.authentication_service.get_current_active_administrator(self.token.credentials)
-        return await self.report_service.approve_report(report_id, administrator.id, request.app.state.bot_instance)
+        """
+        Отчет участника проверен и принят.
+
+        Уведомление участнику отправляется в фоне, статус отправки можно получить по **notification_id**.
+        """
+        administrator = await self.authentication_service.get_current_active_administrator_identity(
+            self.token.credentials
+        )
+        return await self.report_service.approve_report(report_id, administrator.id)
 
     @router.patch(
         "/{report_id}/decline",
@@ -75,32 +87,75 @@ class ReportsCBV:
     async def decline_task_status(
         self,
         report_id: UUID,
-        request: Request,
     ) -> ReportResponse:
-        """Отчет участника проверен и отклонен."""
-        administrator = await self.authentication_service.get_current_active_administrator(self.token.credentials)
-        return await self.report_service.decline_report(report_id, administrator.id, request.app.state.bot_instance)
+        """
+        Отчет участника проверен и отклонен.
+
+        Уведомление участнику отправляется в фоне, статус отправки можно получить по **notification_id**.
+        """
+        administrator = await self.authentication_service.get_current_active_administrator_identity(
+            self.token.credentials
+        )
+        return await self.report_service.decline_report(report_id, administrator.id)
+
+    @router.patch(
+        "/moderate",
+        status_code=HTTPStatus.OK,
+        summary="Проверить несколько заданий.",
+        response_model=ReportsModerationResponse,
+        responses=generate_error_responses(HTTPStatus.BAD_REQUEST),
+    )
+    async def moderate_reports(self, moderation_data: ReportsModerationRequest) -> Any:
+        """
+        Принять или отклонить несколько отчетов участников.
+
+        За каждый принятый отчет участнику будет начислен 1 "ломбарьерчик".
+        Уведомления участникам отправляются в фоне.
+
+        - **report_ids**: список id отчетов
+        - **status**: решение по отчетам (approved или declined)
+
+        В ответе возвращаются id проверенных отчетов (reviewed) и id отчетов,
+        которые не ожидают проверки и были пропущены (skipped).
+        """
+        administrator = await self.authentication_service.get_current_active_administrator_identity(
+            self.token.credentials
+        )
+        return await self.report_service.moderate_reports(
+            moderation_data.report_ids, moderation_data.status, administrator.id
+        )
 
     @router.get(
         "/",
-        response_model=list[ReportSummaryResponse],
+        response_model=ReportSummaryPageResponse,
         summary="Получения списка заданий пользователя по полям status и shift_id.",
-        responses=generate_error_responses(HTTPStatus.NOT_FOUND),
+        responses=generate_error_responses(HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST),
     )
     async def get_report_summary(
         self,
         shift_id: UUID,
         status: Report.Status = None,
+        task_date: date = None,
+        member_id: UUID = None,
+        cursor: str = None,
+        limit: int = Query(settings.REPORTS_PAGE_SIZE, ge=1, le=settings.REPORTS_MAX_PAGE_SIZE),
     ) -> Any:
         """
-        Получения списка задач на проверку с возможностью фильтрации по полям status и shift_id.
+        Получения страницы списка задач на проверку с возможностью фильтрации по полям status и shift_id.
 
-        Список формируется по убыванию поля started_at.
+        Список формируется по возрастанию времени создания отчета.
 
         В запросе передаётся:
 
         - **shift_id**: уникальный id смены, ожидается в формате UUID.uuid4
         - **report.status**: статус задачи
+        - **task_date**: дата задания
+        - **member_id**: id участника смены
+        - **cursor**: курсор следующей страницы из поля next_cursor предыдущего ответа
+        - **limit**: количество отчетов на странице
+
+        В ответе возвращаются отчеты страницы (items) и курсор следующей страницы (next_cursor),
+        для последней страницы курсор не передаётся.
         """
         await self.authentication_service.check_administrator_by_token(self.token)
-        return await self.report_service.get_summaries_of_reports(shift_id, status)
+        return await self.report_service.get_summaries_of_reports(shift_id, status, task_date, member_id, cursor, limit)
@@ -1,7 +1,7 @@
 from http import HTTPStatus
 from typing import Optional
 
-from fastapi import APIRouter, Body, Depends, Request
+from fastapi import APIRouter, Body, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi_restful.cbv import cbv
 from pydantic.schema import UUID
@@ -32,11 +32,14 @@ class RequestCBV:
     async def approve_request_status(
         self,
         request_id: UUID,
-        request: Request,
     ) -> RequestResponse:
-        """Одобрить заявку на участие в акции."""
+        """
+        Одобрить заявку на участие в акции.
+
+        Уведомление участнику отправляется в фоне, статус отправки можно получить по **notification_id**.
+        """
         await self.authentication_service.check_administrator_by_token(self.token)
-        return await self.request_service.approve_request(request_id, request.app.state.bot_instance)
+        return await self.request_service.approve_request(request_id)
 
     @router.patch(
         "/{request_id}/decline",
@@ -48,14 +51,15 @@ class RequestCBV:
     async def decline_request_status(
         self,
         request_id: UUID,
-        request: Request,
         decline_request_data: RequestDeclineRequest | None = Body(None),
     ) -> RequestResponse:
-        """Отклонить заявку на участие в акции."""
+        """
+        Отклонить заявку на участие в акции.
+
+        Уведомление участнику отправляется в фоне, статус отправки можно получить по **notification_id**.
+        """
         await self.authentication_service.check_administrator_by_token(self.token)
-        return await self.request_service.decline_request(
-            request_id, request.app.state.bot_instance, decline_request_data
-        )
+        return await self.request_service.decline_request(request_id, decline_request_data)
 
     @router.get(
         "/",
@@ -4,14 +4,18 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api import routers
-from src.bot.main import start_bot
+from src.bot.main import start_bot, stop_background_workers
 from src.core import exceptions
 from src.core.exception_handlers import (
     application_error_handler,
     internal_exception_handler,
 )
+from src.core.services.export_job_runner import export_job_runner
+from src.core.services.password_hasher import password_hasher
+from src.core.services.report_statistics_refresher import report_statistics_refresher
 from src.core.settings import settings
 from src.core.utils import setup_logging
+from src.excel_generator.renderer import report_renderer
 
 
 def create_app() -> FastAPI:
@@ -33,6 +37,7 @@ def create_app() -> FastAPI:
     app.include_router(routers.administrator_invitation_router)
     app.include_router(routers.analytics_router)
     app.include_router(routers.healthcheck_router)
+    app.include_router(routers.notification_router)
     app.include_router(routers.report_router)
     app.include_router(routers.request_router)
     app.include_router(routers.shift_router)
@@ -51,11 +56,18 @@ def create_app() -> FastAPI:
         # storing bot_instance to extra state of FastAPI app instance
         # refer to https://www.starlette.io/applications/#storing-state-on-the-app-instance
         app.state.bot_instance = bot_instance
+        await export_job_runner.start()
+        await report_statistics_refresher.start()
 
     @app.on_event("shutdown")
     async def on_shutdown():
         """Действия после остановки сервера."""
         bot_instance = app.state.bot_instance
+        await stop_background_workers(bot_instance)
+        await export_job_runner.stop()
+        await report_statistics_refresher.stop()
+        report_renderer.shutdown()
+        password_hasher.shutdown()
         # manually stopping bot updater when running in polling mode
         # see https://github.com/python-telegram-bot/python-telegram-bot/blob/master/telegram/ext/_application.py#L523
         if not settings.BOT_WEBHOOK_MODE:
@@ -1,7 +1,5 @@
 import json
 import urllib
-from pathlib import Path
-from urllib.parse import urljoin
 
 from pydantic import ValidationError
 from telegram import (
@@ -14,7 +12,13 @@ from telegram import (
 from telegram.ext import CallbackContext
 
 from src.api.request_models.user import UserCreateRequest, UserWebhookTelegram
-from src.bot.api_services import get_user_service_callback
+from src.bot.api_services import (
+    get_member_service_callback,
+    get_report_service_callback,
+    get_shift_service_callback,
+    get_user_service_callback,
+)
+from src.bot.photo_downloader import PhotoDownloadJob, photo_downloader
 from src.bot.ui import (
     CONFIRM_SKIP_TASK,
     CONFIRM_SKIP_TASK_KEYBOARD,
@@ -22,20 +26,7 @@ from src.bot.ui import (
     SKIP_A_TASK,
 )
 from src.core import exceptions
-from src.core.db.db import get_session
-from src.core.db.repository import (
-    MemberRepository,
-    ReportRepository,
-    RequestRepository,
-    ShiftRepository,
-    TaskRepository,
-    UserRepository,
-)
-from src.core.services.member_service import MemberService
-from src.core.services.report_service import ReportService
-from src.core.services.shift_service import ShiftService
-from src.core.services.task_service import TaskService
-from src.core.services.user_service import UserService
+from src.core.db.db import get_session_context
 from src.core.settings import settings
 from src.core.utils import get_lombaryers_for_quantity
 
@@ -48,22 +39,26 @@ async def start(update: Update, context: CallbackContext) -> None:
         "каждый день, ребенок будет получать виртуальные \"ломбарьерчики\". "
         "В конце смены мы подведем итоги и наградим самых активных и старательных ребят!"
     )
-    session = get_session()
-    user_service = await get_user_service_callback(session)
-    user = await user_service.get_user_by_telegram_id(update.effective_chat.id)
-    context.user_data["user"] = user
-    if user and user.telegram_blocked:
-        await user_service.unset_telegram_blocked(user)
+    change_user_data_error = None
+    async with get_session_context() as session:
+        user_service = get_user_service_callback(session)
+        user = await user_service.get_user_by_telegram_id(update.effective_chat.id)
+        context.user_data["user"] = user
+        if user and user.telegram_blocked:
+            await user_service.unset_telegram_blocked(user)
+        if user:
+            try:
+                await user_service.check_before_change_user_data(user.id)
+            except exceptions.ApplicationError as e:
+                change_user_data_error = e
     await context.bot.send_message(chat_id=update.effective_chat.id, text=start_text)
+    if change_user_data_error:
+        await update.message.reply_text(
+            text=change_user_data_error.detail,
+            reply_markup=ReplyKeyboardRemove(),
+        )
+        return
     if user:
-        try:
-            await user_service.check_before_change_user_data(user.id)
-        except exceptions.ApplicationError as e:
-            await update.message.reply_text(
-                text=e.detail,
-                reply_markup=ReplyKeyboardRemove(),
-            )
-            return
         await update_user_data(update, context)
     else:
         await register_user(update, context)
@@ -128,11 +123,11 @@ async def web_app_data(update: Update, context: CallbackContext) -> None:
             await register_user(update, context)
         return
     user_scheme.telegram_id = update.effective_user.id
-    session = get_session()
-    registration_service = await get_user_service_callback(session)
     reply_markup, validation_error = None, False
     try:
-        await registration_service.register_user(user_scheme)
+        async with get_session_context() as session:
+            registration_service = get_user_service_callback(session)
+            await registration_service.register_user(user_scheme)
     except exceptions.NotValidValueError as e:
         text = e.detail
         validation_error = True
@@ -157,32 +152,25 @@ async def web_app_data(update: Update, context: CallbackContext) -> None:
             await register_user(update, context)
 
 
-async def download_photo_report_callback(update: Update, context: CallbackContext, shift_user_dir: str) -> str:
-    """Сохранить фото отчёта на диск."""
-    file = await update.message.photo[-1].get_file()
-    file_name = file.file_unique_id + Path(file.file_path).suffix
-    file_path = f"{shift_user_dir}/{file_name}"
-    await file.download_to_drive(custom_path=(settings.USER_REPORTS_DIR / file_path))
-    return file_path
-
-
 async def photo_handler(update: Update, context: CallbackContext) -> None:
-    """Обработка полученного фото."""
-    session_gen = get_session()
-    session = await session_gen.asend(None)
-    user_service = UserService(UserRepository(session), RequestRepository(session))
-    report_service = ReportService(ReportRepository(session), ShiftRepository(session), MemberRepository(session))
-    shift_service = ShiftService(ShiftRepository(session))
+    """Обработка полученного фото.
 
+    Фото загружается и отправляется на проверку в фоне, поэтому участнику отвечают сразу.
+    """
     text = "Твой отчет отправлен на модерацию, после проверки тебе придет уведомление."
 
     try:
-        user = await user_service.get_user_by_telegram_id(update.effective_chat.id)
-        report = await report_service.get_current_report(user.id)
-        shift_dir = await shift_service.get_shift_dir(report.shift_id)
-        file_path = await download_photo_report_callback(update, context, f"{shift_dir}/{user.id}")
-        photo_url = urljoin(settings.USER_REPORTS_URL, file_path)
-        await report_service.send_report(report, photo_url)
+        async with get_session_context() as session:
+            user_service = get_user_service_callback(session)
+            report_service = get_report_service_callback(session)
+            shift_service = get_shift_service_callback(session)
+            user = await user_service.get_user_identity_by_telegram_id(update.effective_chat.id)
+            report = await report_service.get_current_report(user.member_id)
+            await report_service.check_report_can_be_sent(report)
+            shift_dir = await shift_service.get_shift_dir(report.shift_id)
+        photo_downloader.enqueue(
+            PhotoDownloadJob(report.id, user.user_id, update.message.photo[-1].file_id, f"{shift_dir}/{user.user_id}")
+        )
     except exceptions.ApplicationError as e:
         text = e.detail
 
@@ -221,24 +209,18 @@ async def inline_button_handler(update: Update, context: CallbackContext) -> Non
 
 async def get_balance(telegram_id: int) -> int:
     """Метод для получения баланса ломбарьеров."""
-    session_gen = get_session()
-    session = await session_gen.asend(None)
-    member_service = MemberService(MemberRepository(session))
-    return await member_service.get_number_of_lombariers_by_telegram_id(telegram_id)
+    async with get_session_context() as session:
+        member_service = get_member_service_callback(session)
+        return await member_service.get_number_of_lombariers_by_telegram_id(telegram_id)
 
 
 async def skip_report(chat_id: int) -> None:
     """Метод для пропуска задания."""
-    session_gen = get_session()
-    session = await session_gen.asend(None)
-    shift_service = ShiftService(ShiftRepository(session))
-    user_service = UserService(UserRepository(session), RequestRepository(session), shift_service)
-    task_service = TaskService(TaskRepository(session))
-    report_service = ReportService(
-        ReportRepository(session), ShiftRepository(session), MemberRepository(session), task_service
-    )
-    user = await user_service.get_user_by_telegram_id(chat_id)
-    await report_service.skip_current_report(user.id)
+    async with get_session_context() as session:
+        user_service = get_user_service_callback(session)
+        report_service = get_report_service_callback(session)
+        user = await user_service.get_user_identity_by_telegram_id(chat_id)
+        await report_service.skip_current_report(user.member_id)
 
 
 async def incorrect_report_type_handler(update: Update, context: CallbackContext) -> None:
@@ -248,20 +230,19 @@ async def incorrect_report_type_handler(update: Update, context: CallbackContext
 
 async def chat_member_handler(update: Update, context: CallbackContext) -> None:
     """Меняет значение поля telegram_blocked при блокировке/разблокировке бота."""
-    session_gen = get_session()
-    session = await session_gen.asend(None)
-    user_service = UserService(UserRepository(session))
-    user = await user_service.get_user_by_telegram_id(update.effective_user.id)
-    if user is None:
+    async with get_session_context() as session:
+        user_service = get_user_service_callback(session)
+        user = await user_service.get_user_by_telegram_id(update.effective_user.id)
+        if user is None:
+            return None
+        if (
+            update.my_chat_member.new_chat_member.status == update.my_chat_member.new_chat_member.BANNED
+            and update.my_chat_member.old_chat_member.status == update.my_chat_member.old_chat_member.MEMBER
+        ):
+            return await user_service.set_telegram_blocked(user)
+        if (
+            update.my_chat_member.new_chat_member.status == update.my_chat_member.new_chat_member.MEMBER
+            and update.my_chat_member.old_chat_member.status == update.my_chat_member.old_chat_member.BANNED
+        ):
+            return await user_service.unset_telegram_blocked(user)
         return None
-    if (
-        update.my_chat_member.new_chat_member.status == update.my_chat_member.new_chat_member.BANNED
-        and update.my_chat_member.old_chat_member.status == update.my_chat_member.old_chat_member.MEMBER
-    ):
-        return await user_service.set_telegram_blocked(user)
-    if (
-        update.my_chat_member.new_chat_member.status == update.my_chat_member.new_chat_member.MEMBER
-        and update.my_chat_member.old_chat_member.status == update.my_chat_member.old_chat_member.BANNED
-    ):
-        return await user_service.unset_telegram_blocked(user)
-    return None
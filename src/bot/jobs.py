@@ -1,91 +1,145 @@
-import asyncio
+import logging
 from datetime import date
 from urllib.parse import urljoin
+from uuid import UUID
 
+from telegram.error import TelegramError
 from telegram.ext import CallbackContext
 
 from src.bot.api_services import (
     get_member_service_callback,
     get_report_service_callback,
     get_shift_service_callback,
+    get_task_service_callback,
 )
 from src.bot.services import BotService
 from src.bot.ui import DAILY_TASK_BUTTONS
-from src.core.db.db import get_session
-from src.core.db.models import Report
+from src.core.db.db import get_session_context
+from src.core.db.models import Member, OutgoingMessage, Report, Task
 from src.core.settings import settings
 
+TASK_PHOTO_UPLOAD_ATTEMPTS = 3
+
 
 async def send_no_report_reminder_job(context: CallbackContext) -> None:
     """Отправить напоминание об отчёте."""
-    shift_session = get_session()
-    shift_service = await get_shift_service_callback(shift_session)
-    started_shift = await shift_service.get_started_shift_or_none()
-    if not started_shift:
-        return
-    member_session_generator = get_session()
-    member_service = await get_member_service_callback(member_session_generator)
+    async with get_session_context() as session:
+        shift_service = get_shift_service_callback(session)
+        started_shift = await shift_service.get_started_shift_or_none()
+        if not started_shift:
+            return
+        member_service = get_member_service_callback(session)
+        members = await member_service.get_members_with_no_reports(started_shift.id)
     bot_service = BotService(context)
-    members = await member_service.get_members_with_no_reports(started_shift.id)
-    send_message_tasks = [
-        bot_service.send_message(
-            member.user,
-            (
-                f"{member.user.name} {member.user.surname}, мы потеряли тебя! "
-                f"Задание все еще ждет тебя. "
-                f"Напоминаем, что за каждое выполненное задание ты получаешь виртуальные "
-                f"\"ломбарьерчики\", которые можешь обменять на призы и подарки!"
-            ),
-        )
-        for member in members
-    ]
-    context.application.create_task(asyncio.gather(*send_message_tasks))
+    await bot_service.enqueue_messages(
+        [
+            OutgoingMessage(
+                user_id=member.user_id,
+                text=(
+                    f"{member.user.name} {member.user.surname}, мы потеряли тебя! "
+                    f"Задание все еще ждет тебя. "
+                    f"Напоминаем, что за каждое выполненное задание ты получаешь виртуальные "
+                    f"\"ломбарьерчики\", которые можешь обменять на призы и подарки!"
+                ),
+            )
+            for member in members
+        ]
+    )
 
 
 async def send_daily_task_job(context: CallbackContext) -> None:
     """Автоматически запускает смену и рассылает задания."""
-    shift_session = get_session()
-    shift_service = await get_shift_service_callback(shift_session)
-    await shift_service.start_prepared_shift()
-    started_shift = await shift_service.get_started_shift_or_none()
-    if not started_shift:
-        return
-    member_session = get_session()
-    member_service = await get_member_service_callback(member_session)
-    report_session = get_session()
-    report_service = await get_report_service_callback(report_session)
+    async with get_session_context() as session:
+        shift_service = get_shift_service_callback(session)
+        await shift_service.start_prepared_shift()
+        started_shift = await shift_service.get_started_shift_or_none()
+        if not started_shift:
+            return
+        member_service = get_member_service_callback(session)
+        report_service = get_report_service_callback(session)
+
+        await report_service.set_status_to_waiting_reports(Report.Status.SKIPPED)
+        await member_service.exclude_lagging_members(started_shift, context.application)
+        task, members = await report_service.get_today_task_and_active_members(started_shift, date.today().day)
+        await report_service.create_daily_reports(members, task)
+        not_submitted_members_ids = await report_service.get_members_ids_with_previous_report_not_submitted(
+            started_shift.id
+        )
+    messages = get_daily_task_messages(task, members, not_submitted_members_ids)
     bot_service = BotService(context)
+    if not task.telegram_file_id:
+        messages, telegram_file_id = await upload_task_photo(bot_service, members, messages)
+        if telegram_file_id:
+            async with get_session_context() as session:
+                await get_task_service_callback(session).set_telegram_file_id(task.id, telegram_file_id)
+    await bot_service.enqueue_messages(messages)
+
 
-    await report_service.set_status_to_waiting_reports(Report.Status.SKIPPED)
-    await member_service.exclude_lagging_members(started_shift, context.application)
-    task, members = await report_service.get_today_task_and_active_members(started_shift, date.today().day)
-    await report_service.create_daily_reports(members, task)
-    task_photo = urljoin(settings.APPLICATION_URL, task.url)
-    send_message_tasks = [
-        bot_service.send_photo(
-            member.user,
-            task_photo,
-            (
+def get_daily_task_messages(
+    task: Task, members: list[Member], not_submitted_members_ids: set[UUID]
+) -> list[OutgoingMessage]:
+    """Подготовить сообщения с ежедневным заданием для участников смены."""
+    task_photo = task.telegram_file_id or urljoin(settings.APPLICATION_URL, task.url)
+    daily_task_buttons = DAILY_TASK_BUTTONS.to_dict()
+    return [
+        OutgoingMessage(
+            user_id=member.user_id,
+            photo=task_photo,
+            text=(
                 f"Привет, {member.user.name}!\n"
                 f"Вчерашнее задание не было выполнено! Сегодня можешь отправить отчет только по новому заданию. "
                 f"Сегодня твоим заданием будет {task.title}. "
                 f"Не забудь сделать фотографию, как ты выполняешь задание, и отправить на проверку."
             )
-            if await report_service.is_previous_report_not_submitted(member.id)
+            if member.id in not_submitted_members_ids
             else (
                 f"Привет, {member.user.name}!\n"
                 f"Сегодня твоим заданием будет {task.title}. "
                 f"Не забудь сделать фотографию, как ты выполняешь задание, и отправить на проверку."
             ),
-            DAILY_TASK_BUTTONS,
+            reply_markup=daily_task_buttons,
         )
         for member in members
     ]
-    context.application.create_task(asyncio.gather(*send_message_tasks))
+
+
+async def upload_task_photo(
+    bot_service: BotService,
+    members: list[Member],
+    messages: list[OutgoingMessage],
+) -> tuple[list[OutgoingMessage], str | None]:
+    """Загрузить фото задания в Telegram, отправив его первым участникам рассылки.
+
+    После первой успешной отправки в остальных сообщениях рассылки ссылка на фото заменяется на file_id,
+    чтобы Telegram не скачивал файл для каждого участника.
+    Делается не больше TASK_PHOTO_UPLOAD_ATTEMPTS попыток без повторов, сообщения неудачных попыток
+    отправляются вместе с остальными через очередь.
+    Возвращает сообщения, которые ещё нужно поставить в очередь, и file_id фото, если загрузка удалась.
+    Вызывается вне сессии БД, чтобы соединение не удерживалось на время отправки.
+    """
+    remaining_messages = []
+    telegram_file_id = None
+    attempts = 0
+    for member, message in zip(members, messages):
+        if telegram_file_id or attempts >= TASK_PHOTO_UPLOAD_ATTEMPTS or member.user.telegram_blocked:
+            remaining_messages.append(message)
+            continue
+        attempts += 1
+        try:
+            sent_message = await bot_service.send_photo(member.user, message.photo, message.text, DAILY_TASK_BUTTONS)
+        except TelegramError as exc:
+            logging.error(f"Не удалось загрузить фото задания при отправке пользователю {member.user}. Ошибка: {exc}")
+            remaining_messages.append(message)
+            continue
+        telegram_file_id = sent_message.photo[-1].file_id
+    if telegram_file_id:
+        for message in remaining_messages:
+            message.photo = telegram_file_id
+    return remaining_messages, telegram_file_id
 
 
 async def finish_shift_automatically_job(context: CallbackContext) -> None:
     """Автоматически закрывает смену в дату, указанную в finished_at."""
-    session = get_session()
-    shift_service = await get_shift_service_callback(session)
-    await shift_service.finish_shift_automatically(context.application)
+    async with get_session_context() as session:
+        shift_service = get_shift_service_callback(session)
+        await shift_service.finish_shift_automatically(context.application)
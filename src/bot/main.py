@@ -3,7 +3,6 @@ from pathlib import Path
 
 import pytz
 from telegram.ext import (
-    AIORateLimiter,
     Application,
     ApplicationBuilder,
     CallbackQueryHandler,
@@ -30,11 +29,25 @@ from src.bot.jobs import (
     send_daily_task_job,
     send_no_report_reminder_job,
 )
+from src.bot.message_sender import message_sender
+from src.bot.photo_downloader import photo_downloader
 from src.core.settings import settings
 
 HANDLED_MESSAGE_TYPES = filters.PHOTO | filters.TEXT | filters.StatusUpdate.WEB_APP_DATA
 
 
+async def start_background_workers(application: Application) -> None:
+    """Запустить фоновые обработчики бота."""
+    await message_sender.start(application)
+    await photo_downloader.start(application)
+
+
+async def stop_background_workers(application: Application) -> None:
+    """Остановить фоновые обработчики бота."""
+    await photo_downloader.stop()
+    await message_sender.stop()
+
+
 def create_bot() -> Application:
     """Создать бота."""
     Path(settings.USER_REPORTS_DIR).mkdir(parents=True, exist_ok=True)
@@ -46,8 +59,9 @@ def create_bot() -> Application:
         ApplicationBuilder()
         .defaults(defaults)
         .token(settings.BOT_TOKEN)
-        .rate_limiter(AIORateLimiter())
         .persistence(persistence=bot_persistence)
+        .post_init(start_background_workers)
+        .post_stop(stop_background_workers)
         .build()
     )
 
@@ -86,4 +100,5 @@ async def start_bot(webhook_mode: bool = settings.BOT_WEBHOOK_MODE) -> Applicati
     else:
         await bot_instance.updater.start_polling()
     await bot_instance.start()
+    await start_background_workers(bot_instance)
     return bot_instance
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from telegram import KeyboardButton, ReplyKeyboardMarkup
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError
+from telegram.ext import Application
+
+from src.bot.error_handler import error_handler
+from src.bot.rate_limiter import message_rate_limiter
+from src.core.db.db import get_session_context
+from src.core.db.models import OutgoingMessage
+from src.core.db.repository import OutgoingMessageRepository
+from src.core.settings import settings
+
+
+def is_temporary_error(error: TelegramError) -> bool:
+    """Проверить, что ошибка временная и отправку сообщения можно повторить."""
+    return isinstance(error, RetryAfter) or (isinstance(error, NetworkError) and not isinstance(error, BadRequest))
+
+
+class MessageSender:
+    """Пул отправителей сообщений из очереди исходящих сообщений.
+
+    Диспетчер выбирает из БД готовые к отправке сообщения порциями и передаёт их
+    ограниченному числу отправителей, которые доставляют сообщения с учётом лимитов Telegram
+    (см. AdaptiveRateLimiter).
+    Сообщения, которые не успели отправить до перезапуска приложения, остаются в статусе
+    queued и будут отправлены после следующего запуска.
+    """
+
+    def __init__(
+        self,
+        workers_count: int = settings.MESSAGE_SENDER_WORKERS,
+        batch_size: int = settings.MESSAGE_SENDER_BATCH_SIZE,
+        poll_interval: int = settings.MESSAGE_SENDER_POLL_INTERVAL,
+    ) -> None:
+        self.__workers_count = workers_count
+        self.__batch_size = batch_size
+        self.__poll_interval = poll_interval
+        self.__in_progress: set[UUID] = set()
+        self.__tasks: list[asyncio.Task] = []
+
+    async def start(self, application: Application) -> None:
+        """Запустить диспетчер и отправителей."""
+        if self.__tasks:
+            return
+        self.__bot = application.bot
+        self.__queue: asyncio.Queue[OutgoingMessage] = asyncio.Queue(maxsize=self.__batch_size)
+        self.__new_messages_event = asyncio.Event()
+        self.__tasks = [asyncio.create_task(self.__dispatch())]
+        self.__tasks += [asyncio.create_task(self.__work()) for _ in range(self.__workers_count)]
+
+    async def stop(self) -> None:
+        """Остановить диспетчер и отправителей. Неотправленные сообщения остаются в очереди."""
+        for task in self.__tasks:
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        self.__tasks = []
+        self.__in_progress.clear()
+
+    def wake_up(self) -> None:
+        """Сообщить диспетчеру, что в очередь добавлены новые сообщения."""
+        if self.__tasks:
+            self.__new_messages_event.set()
+
+    async def __dispatch(self) -> None:
+        """Выбирает из очереди готовые к отправке сообщения и распределяет их между отправителями."""
+        while True:
+            self.__new_messages_event.clear()
+            try:
+                messages = await self.__get_queued_messages()
+            except Exception as exc:
+                logging.exception(f"Не удалось получить сообщения из очереди: {exc}")
+                messages = []
+            for message in messages:
+                self.__in_progress.add(message.id)
+                await self.__queue.put(message)
+            if len(messages) < self.__batch_size:
+                try:
+                    await asyncio.wait_for(self.__new_messages_event.wait(), self.__poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def __work(self) -> None:
+        """Отправляет сообщения, полученные от диспетчера, и сохраняет результат отправки."""
+        while True:
+            message = await self.__queue.get()
+            try:
+                await self.__deliver(message)
+            except Exception as exc:
+                logging.exception(f"Ошибка при обработке сообщения {message}: {exc}")
+            finally:
+                self.__in_progress.discard(message.id)
+                self.__queue.task_done()
+
+    async def __deliver(self, message: OutgoingMessage) -> None:
+        if message.user.telegram_blocked:
+            await self.__set_status(message, OutgoingMessage.Status.BLOCKED)
+            return
+        try:
+            async with message_rate_limiter.limit(message.user.telegram_id):
+                await self.__send(message)
+        except TelegramError as exc:
+            if is_temporary_error(exc):
+                await self.__retry_later(message, exc)
+                return
+            try:
+                await error_handler(message.user, exc)
+            except TelegramError:
+                logging.error(f"Сообщение пользователю {message.user} не было отправлено. Ошибка: {exc}")
+                await self.__set_status(message, OutgoingMessage.Status.FAILED, exc)
+            else:
+                await self.__set_status(message, OutgoingMessage.Status.BLOCKED, exc)
+        else:
+            await self.__set_status(message, OutgoingMessage.Status.SENT)
+
+    async def __send(self, message: OutgoingMessage) -> None:
+        reply_markup = self.__get_reply_markup(message.reply_markup)
+        if message.photo:
+            await self.__bot.send_photo(
+                chat_id=message.user.telegram_id,
+                photo=message.photo,
+                caption=message.text,
+                reply_markup=reply_markup,
+            )
+        else:
+            await self.__bot.send_message(
+                chat_id=message.user.telegram_id, text=message.text, reply_markup=reply_markup
+            )
+
+    def __get_reply_markup(self, reply_markup: dict | None) -> ReplyKeyboardMarkup | None:
+        """Восстанавливает клавиатуру, сохранённую в сообщении в виде словаря."""
+        if not reply_markup:
+            return None
+        reply_markup = dict(reply_markup)
+        keyboard = [
+            [KeyboardButton.de_json(button, self.__bot) for button in row] for row in reply_markup.pop("keyboard")
+        ]
+        return ReplyKeyboardMarkup(keyboard, **reply_markup)
+
+    async def __retry_later(self, message: OutgoingMessage, error: TelegramError) -> None:
+        """Откладывает повторную отправку сообщения или помечает его неотправленным после последней попытки."""
+        logging.warning(f"Сообщение пользователю {message.user} не было отправлено. Ошибка отправления: {error}")
+        if message.attempts + 1 >= settings.MESSAGE_MAX_ATTEMPTS:
+            await self.__set_status(message, OutgoingMessage.Status.FAILED, error)
+            return
+        if isinstance(error, RetryAfter):
+            retry_delay = error.retry_after
+        else:
+            retry_delay = settings.MESSAGE_RETRY_DELAY * 3**message.attempts
+        async with get_session_context(transaction=True) as session:
+            await OutgoingMessageRepository(session).postpone(
+                message.id, datetime.now() + timedelta(seconds=retry_delay), str(error)
+            )
+
+    async def __get_queued_messages(self) -> list[OutgoingMessage]:
+        async with get_session_context() as session:
+            messages = await OutgoingMessageRepository(session).get_queued(self.__batch_size, self.__in_progress)
+        return messages
+
+    @staticmethod
+    async def __set_status(
+        message: OutgoingMessage, status: OutgoingMessage.Status, error: TelegramError | None = None
+    ) -> None:
+        async with get_session_context(transaction=True) as session:
+            await OutgoingMessageRepository(session).set_status(message.id, status, str(error) if error else None)
+
+
+message_sender = MessageSender()
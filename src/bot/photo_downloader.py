@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from urllib.parse import urljoin
+from uuid import UUID
+
+from telegram.ext import Application
+
+from src.bot.api_services import get_report_service_callback
+from src.bot.services import BotService
+from src.core import exceptions
+from src.core.db.db import get_session_context
+from src.core.db.models import OutgoingMessage
+from src.core.settings import settings
+
+DOWNLOAD_ERROR_MESSAGE = "Не удалось загрузить фотографию. Пожалуйста, отправь её ещё раз."
+
+
+@dataclass
+class PhotoDownloadJob:
+    """Фото отчёта, которое нужно загрузить из Telegram и отправить на проверку."""
+
+    report_id: UUID
+    user_id: UUID
+    file_id: str
+    report_dir: str
+
+
+class PhotoDownloader:
+    """Пул загрузчиков фотоотчётов.
+
+    Обработчик сообщения только ставит фото в очередь и сразу отвечает участнику, а ограниченное
+    число загрузчиков скачивает фото, проверяет по хэшу содержимого, что фото не использовалось
+    в других отчётах, сохраняет его и отправляет отчёт на проверку. Об ошибках участнику
+    сообщается через очередь исходящих сообщений.
+    """
+
+    def __init__(
+        self,
+        workers_count: int = settings.PHOTO_DOWNLOAD_WORKERS,
+        queue_size: int = settings.PHOTO_DOWNLOAD_QUEUE_SIZE,
+    ) -> None:
+        self.__workers_count = workers_count
+        self.__queue_size = queue_size
+        self.__tasks: list[asyncio.Task] = []
+        self.__accepting = False
+
+    async def start(self, application: Application) -> None:
+        """Запустить загрузчиков."""
+        if self.__tasks:
+            return
+        self.__bot = application.bot
+        self.__queue: asyncio.Queue[PhotoDownloadJob] = asyncio.Queue(maxsize=self.__queue_size)
+        self.__tasks = [asyncio.create_task(self.__work()) for _ in range(self.__workers_count)]
+        self.__accepting = True
+
+    async def stop(self) -> None:
+        """Перестать принимать фото, дождаться загрузки фото из очереди и остановить загрузчиков.
+
+        Пользователей, фото которых не успели загрузить за PHOTO_DOWNLOAD_STOP_TIMEOUT секунд,
+        просят отправить фото ещё раз.
+        """
+        if not self.__tasks:
+            return
+        self.__accepting = False
+        try:
+            await asyncio.wait_for(self.__queue.join(), settings.PHOTO_DOWNLOAD_STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            logging.warning(f"Не загружено фотоотчётов при остановке бота: {self.__queue.qsize()}")
+        for task in self.__tasks:
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        self.__tasks = []
+        dropped_jobs = []
+        while not self.__queue.empty():
+            dropped_jobs.append(self.__queue.get_nowait())
+        await self.__notify(dropped_jobs, exceptions.PhotoDownloadStoppedError.detail)
+
+    def enqueue(self, job: PhotoDownloadJob) -> None:
+        """Поставить фото в очередь на загрузку. Если очередь заполнена, фото не принимается."""
+        if not self.__accepting:
+            raise exceptions.PhotoDownloadStoppedError()
+        try:
+            self.__queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise exceptions.PhotoDownloadQueueFullError()
+
+    async def __work(self) -> None:
+        while True:
+            job = await self.__queue.get()
+            try:
+                await self.__process(job)
+            except exceptions.ApplicationError as exc:
+                await self.__notify([job], exc.detail)
+            except asyncio.CancelledError:
+                await self.__notify([job], exceptions.PhotoDownloadStoppedError.detail)
+                raise
+            except Exception as exc:
+                logging.exception(f"Не удалось загрузить фото отчёта {job.report_id}: {exc}")
+                await self.__notify([job], DOWNLOAD_ERROR_MESSAGE)
+            finally:
+                self.__queue.task_done()
+
+    async def __process(self, job: PhotoDownloadJob) -> None:
+        """Проверяет, что отчёт можно отправить, скачивает фото, проверяет его на повторное использование,
+        сохраняет и отправляет отчёт на проверку.
+
+        Фото сохраняется на диск только после всех проверок, а если отправить отчёт всё же не удалось, удаляется.
+        """
+        async with get_session_context() as session:
+            report_service = get_report_service_callback(session)
+            await report_service.check_report_can_be_sent(await report_service.get_report(job.report_id))
+        file = await self.__bot.get_file(job.file_id)
+        content = await file.download_as_bytearray()
+        photo_hash = sha256(content).hexdigest()
+        file_path = f"{job.report_dir}/{file.file_unique_id}{Path(file.file_path).suffix}"
+        photo_url = urljoin(settings.USER_REPORTS_URL, file_path)
+        async with get_session_context() as session:
+            report_service = get_report_service_callback(session)
+            await report_service.check_duplicate_report(photo_hash, photo_url)
+            report = await report_service.get_report(job.report_id)
+            await report_service.check_report_can_be_sent(report)
+            path = settings.USER_REPORTS_DIR / file_path
+            await asyncio.to_thread(self.__save, path, content)
+            try:
+                await report_service.send_report(report, photo_url, photo_hash)
+            except BaseException:
+                await asyncio.to_thread(path.unlink, missing_ok=True)
+                raise
+
+    @staticmethod
+    def __save(path: Path, content: bytearray) -> None:
+        """Сохраняет фото на диск. Выполняется в потоке, чтобы не блокировать цикл событий."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    @staticmethod
+    async def __notify(jobs: list[PhotoDownloadJob], text: str) -> None:
+        try:
+            await BotService.enqueue_messages([OutgoingMessage(user_id=job.user_id, text=text) for job in jobs])
+        except Exception as exc:
+            logging.exception(f"Не удалось уведомить пользователей об ошибке загрузки фото: {exc}")
+
+
+photo_downloader = PhotoDownloader()
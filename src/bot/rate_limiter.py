@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from time import monotonic
+from typing import AsyncIterator
+
+from telegram.error import RetryAfter
+
+from src.core.settings import settings
+
+CHAT_SLOTS_PRUNE_SIZE = 1024
+
+
+@dataclass
+class RateLimiterStatus:
+    effective_messages_per_second: float
+    messages_per_second_limit: float
+    max_messages_per_second: float
+    pause_seconds: float
+
+
+class AdaptiveRateLimiter:
+    """Ограничитель скорости отправки сообщений ботом.
+
+    Отправки равномерно распределяются во времени с учётом общего ограничения скорости,
+    а сообщения одному пользователю отправляются не чаще одного раза за chat_interval секунд.
+    Если Telegram отвечает ошибкой RetryAfter, все отправки приостанавливаются на указанное
+    в ошибке время, а скорость снижается вдвое. После каждой секунды отправки без ошибок
+    скорость повышается на rate_increase сообщений в секунду, но не выше max_rate.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = settings.MESSAGES_PER_SECOND,
+        min_rate: float = settings.MESSAGES_MIN_PER_SECOND,
+        rate_increase: float = settings.MESSAGES_RATE_INCREASE,
+        chat_interval: float = settings.MESSAGE_CHAT_INTERVAL,
+        stats_period: int = settings.MESSAGE_RATE_STATS_PERIOD,
+    ) -> None:
+        self.__max_rate = max_rate
+        self.__min_rate = min_rate
+        self.__rate_increase = rate_increase
+        self.__chat_interval = chat_interval
+        self.__stats_period = stats_period
+        self.__rate = max_rate
+        self.__next_send_at = 0.0
+        self.__resume_at = 0.0
+        self.__chat_next_send_at: dict[int, float] = {}
+        self.__sent_at: deque[float] = deque()
+        self.__lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def limit(self, chat_id: int) -> AsyncIterator[None]:
+        """Дождаться своей очереди на отправку сообщения пользователю и учесть результат отправки."""
+        await self.__wait_for_chat(chat_id)
+        await self.__wait_for_turn()
+        try:
+            yield
+        except RetryAfter as exc:
+            self.slow_down(exc.retry_after)
+            raise
+        self.__register_sent()
+
+    def slow_down(self, retry_after: float) -> None:
+        """Приостановить все отправки на retry_after секунд и снизить скорость отправки.
+
+        Ошибки одновременно отправленных сообщений снижают скорость только один раз за паузу.
+        """
+        now = monotonic()
+        if now >= self.__resume_at:
+            self.__rate = max(self.__min_rate, self.__rate / 2)
+        self.__resume_at = max(self.__resume_at, now + retry_after)
+        logging.warning(
+            f"Превышен лимит отправки сообщений Telegram, отправка приостановлена на {retry_after} с, "
+            f"скорость снижена до {self.__rate:.1f} сообщений в секунду"
+        )
+
+    def get_status(self) -> RateLimiterStatus:
+        """Фактическая скорость отправки за последние stats_period секунд и текущие ограничения."""
+        now = monotonic()
+        self.__remove_old_stats(now)
+        return RateLimiterStatus(
+            effective_messages_per_second=len(self.__sent_at) / self.__stats_period,
+            messages_per_second_limit=self.__rate,
+            max_messages_per_second=self.__max_rate,
+            pause_seconds=max(0.0, self.__resume_at - now),
+        )
+
+    async def __wait_for_chat(self, chat_id: int) -> None:
+        """Занимает ближайшее свободное время отправки пользователю и ждёт его наступления."""
+        now = monotonic()
+        if len(self.__chat_next_send_at) > CHAT_SLOTS_PRUNE_SIZE:
+            self.__chat_next_send_at = {
+                chat: send_at for chat, send_at in self.__chat_next_send_at.items() if send_at > now
+            }
+        send_at = max(now, self.__chat_next_send_at.get(chat_id, now))
+        self.__chat_next_send_at[chat_id] = send_at + self.__chat_interval
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def __wait_for_turn(self) -> None:
+        """Ждёт окончания паузы после RetryAfter и очередного интервала между отправками."""
+        async with self.__lock:
+            while (delay := max(self.__resume_at, self.__next_send_at) - monotonic()) > 0:
+                await asyncio.sleep(delay)
+            self.__next_send_at = monotonic() + 1 / self.__rate
+
+    def __register_sent(self) -> None:
+        """Учитывает отправленное сообщение в статистике и постепенно повышает скорость отправки."""
+        now = monotonic()
+        self.__sent_at.append(now)
+        self.__remove_old_stats(now)
+        self.__rate = min(self.__max_rate, self.__rate + self.__rate_increase / self.__rate)
+
+    def __remove_old_stats(self, now: float) -> None:
+        while self.__sent_at and self.__sent_at[0] <= now - self.__stats_period:
+            self.__sent_at.popleft()
+
+
+message_rate_limiter = AdaptiveRateLimiter()
@@ -2,14 +2,19 @@ import asyncio
 import functools
 import logging
 from datetime import date, datetime
+from uuid import UUID
 
-from telegram import ReplyKeyboardMarkup
+from telegram import Message, ReplyKeyboardMarkup
 from telegram.error import NetworkError, RetryAfter, TelegramError, TimedOut
 from telegram.ext import Application
 
 from src.api.request_models.request import RequestDeclineRequest
 from src.bot.error_handler import error_handler
+from src.bot.message_sender import message_sender
+from src.bot.rate_limiter import message_rate_limiter
 from src.core.db import models
+from src.core.db.db import get_session_context
+from src.core.db.repository import OutgoingMessageRepository
 from src.core.settings import settings
 from src.core.utils import (
     get_current_task_date,
@@ -28,13 +33,17 @@ def check_user_blocked(func):
         user = kwargs['user'] if 'user' in kwargs else args[1]
         if user.telegram_blocked:
             return
-        await func(*args, **kwargs)
+        return await func(*args, **kwargs)
 
     return _func_wrapper
 
 
 def retry(start_sleep_time: int = 3, max_attempt_number: int = 5):
-    """Функция для повторного выполнения метода через некоторое время, если возникла ошибка."""
+    """Функция для повторного выполнения метода через некоторое время, если возникла ошибка.
+
+    После ошибки RetryAfter повтор выполняется сразу: паузу, указанную Telegram, выдерживает
+    ограничитель скорости отправки сообщений.
+    """
 
     def _func_wrapper(func):
         @functools.wraps(func)
@@ -45,8 +54,8 @@ def retry(start_sleep_time: int = 3, max_attempt_number: int = 5):
                     return await func(*args, **kwargs)
                 except (RetryAfter, TimedOut, NetworkError) as exc:
                     logging.exception(f"Сообщение пользователю {user} не было отправлено. Ошибка отправления: {exc}")
-                    retry_delay = start_sleep_time * 3**n
-                    await asyncio.sleep(retry_delay)
+                    if not isinstance(exc, RetryAfter):
+                        await asyncio.sleep(start_sleep_time * 3**n)
                     continue
                 except TelegramError as exc:
                     return await error_handler(user, exc)
@@ -59,65 +68,76 @@ def retry(start_sleep_time: int = 3, max_attempt_number: int = 5):
 class BotService:
     def __init__(self, telegram_bot: Application) -> None:
         self.__bot = telegram_bot.bot
-        self.__bot_application = telegram_bot
 
     @check_user_blocked
     @retry()
     async def send_message(self, user: models.User, text: str) -> None:
-        await self.__bot.send_message(user.telegram_id, text)
-
-    @check_user_blocked
-    @retry()
-    async def send_photo(self, user: models.User, photo: str, caption: str, reply_markup: ReplyKeyboardMarkup) -> None:
-        await self.__bot.send_photo(chat_id=user.telegram_id, photo=photo, caption=caption, reply_markup=reply_markup)
+        async with message_rate_limiter.limit(user.telegram_id):
+            await self.__bot.send_message(user.telegram_id, text)
+
+    async def send_photo(
+        self, user: models.User, photo: str, caption: str, reply_markup: ReplyKeyboardMarkup
+    ) -> Message:
+        """Отправить фото без повторных попыток: ошибки отправки обрабатывает вызывающий код."""
+        async with message_rate_limiter.limit(user.telegram_id):
+            return await self.__bot.send_photo(
+                chat_id=user.telegram_id, photo=photo, caption=caption, reply_markup=reply_markup
+            )
 
-    async def notify_approved_request(self, user: models.User, first_task_date: str) -> None:
-        """Уведомление участника о решении по заявке в telegram.
+    @staticmethod
+    async def enqueue_messages(messages: list[models.OutgoingMessage]) -> list[UUID]:
+        """Поставить сообщения в очередь на отправку.
 
-        - Заявка принята.
+        Сообщения сохраняются в БД и отправляются в фоне с учётом ограничений Telegram.
+        Возвращает id сообщений, по которым можно узнать результат отправки.
         """
-        text = (
+        if not messages:
+            return []
+        async with get_session_context(transaction=True) as session:
+            await OutgoingMessageRepository(session).create_all(messages)
+        message_sender.wake_up()
+        return [message.id for message in messages]
+
+    @classmethod
+    async def enqueue_message(cls, user: models.User, text: str) -> UUID:
+        """Поставить сообщение пользователю в очередь на отправку и вернуть id сообщения."""
+        message_ids = await cls.enqueue_messages([models.OutgoingMessage(user_id=user.id, text=text)])
+        return message_ids[0]
+
+    @staticmethod
+    def get_approved_request_text(user: models.User, first_task_date: str) -> str:
+        """Текст уведомления о принятой заявке."""
+        return (
             f"Привет, {user.name} {user.surname}! Поздравляем, ты в проекте! "
             f"{first_task_date} в {settings.FORMATTED_TASK_TIME} часов утра "
             "тебе поступит первое задание."
         )
-        await self.send_message(user, text)
-
-    async def notify_declined_request(
-        self, user: models.User, decline_request_data: RequestDeclineRequest | None
-    ) -> None:
-        """Уведомление участника о решении по заявке в telegram.
 
-        - Заявка отклонена.
-        """
+    @staticmethod
+    def get_declined_request_text(decline_request_data: RequestDeclineRequest | None) -> str:
+        """Текст уведомления об отклоненной заявке."""
         if decline_request_data and decline_request_data.message:
-            text = decline_request_data.message
-        else:
-            text = (
-                f"К сожалению, на данный момент мы не можем зарегистрировать вас"
-                f" в проекте. Вы можете написать на почту "
-                f"{settings.ORGANIZATIONS_EMAIL}. Чтобы не пропустить актуальные"
-                f" новости Центра \"Ломая барьеры\" - вступайте в нашу группу "
-                f"{settings.ORGANIZATIONS_GROUP}"
-            )
-        await self.send_message(user, text)
-
-    async def notify_approved_task(self, user: models.User, report: models.Report, shift: models.Shift) -> None:
-        """Уведомление участника о проверенном задании.
+            return decline_request_data.message
+        return (
+            f"К сожалению, на данный момент мы не можем зарегистрировать вас"
+            f" в проекте. Вы можете написать на почту "
+            f"{settings.ORGANIZATIONS_EMAIL}. Чтобы не пропустить актуальные"
+            f" новости Центра \"Ломая барьеры\" - вступайте в нашу группу "
+            f"{settings.ORGANIZATIONS_GROUP}"
+        )
 
-        - Задание принято, начислен 1 ломбарьерчик.
-        """
+    @staticmethod
+    def get_approved_task_text(report: models.Report, shift: models.Shift) -> str:
+        """Текст уведомления о принятом задании."""
         photo_date = datetime.strftime(report.uploaded_at, FORMAT_PHOTO_DATE)
         text = f"Твой отчет от {photo_date} принят! Тебе начислен 1 \"ломбарьерчик\". "
         if date.today() < shift.finished_at:
             text = text + f"Следующее задание придет в {settings.FORMATTED_TASK_TIME} часов утра."
-        await self.send_message(user, text)
+        return text
 
-    async def notify_declined_task(self, user: models.User, shift: models.Shift, report: models.Report) -> None:
-        """Уведомление участника о проверенном задании.
-
-        - Задание не принято.
-        """
+    @staticmethod
+    def get_declined_task_text(report: models.Report, shift: models.Shift) -> str:
+        """Текст уведомления об отклоненном задании."""
         text = (
             f"К сожалению, мы не можем принять твой фотоотчет от {report.uploaded_at:%d.%m.%Y}! "
             "Возможно на фотографии не видно, что именно ты выполняешь задание. "
@@ -125,7 +145,7 @@ class BotService:
         if date.today() < shift.finished_at and report.task_date == get_current_task_date():
             count_attempts = settings.NUMBER_ATTEMPTS_SUBMIT_REPORT - report.number_attempt
             text += get_message_with_numbers_attempts(count_attempts)
-        await self.send_message(user, text)
+        return text
 
     async def notify_excluded_members(self, members: list[models.Member]) -> None:
         """Уведомляет участников об исключении из смены."""
@@ -136,33 +156,35 @@ class BotService:
             "Если Вы считаете, что произошла ошибка - обращайтесь "
             f"за помощью на электронную почту {settings.ORGANIZATIONS_EMAIL}."
         )
-        send_message_tasks = [self.send_message(member.user, text) for member in members]
-        self.__bot_application.create_task(asyncio.gather(*send_message_tasks))
+        await self.enqueue_messages([models.OutgoingMessage(user_id=member.user_id, text=text) for member in members])
 
     async def notify_that_shift_is_finished(self, shift: models.Shift) -> None:
         """Уведомляет активных участников об окончании смены."""
-        send_message_tasks = [
-            self.send_message(
-                member.user,
-                shift.final_message.format(
-                    name=member.user.name,
-                    surname=member.user.surname,
-                    numbers_lombaryers=member.numbers_lombaryers,
-                    lombaryers_case=get_lombaryers_for_quantity(member.numbers_lombaryers),
-                ),
-            )
-            for member in shift.members
-        ]
-        self.__bot_application.create_task(asyncio.gather(*send_message_tasks))
+        await self.enqueue_messages(
+            [
+                models.OutgoingMessage(user_id=member.user_id, text=self.get_final_message_text(shift, member))
+                for member in shift.members
+            ]
+        )
+
+    @staticmethod
+    def get_final_message_text(shift: models.Shift, member: models.Member) -> str:
+        """Текст финального сообщения смены для участника."""
+        return shift.final_message.format(
+            name=member.user.name,
+            surname=member.user.surname,
+            numbers_lombaryers=member.numbers_lombaryers,
+            lombaryers_case=get_lombaryers_for_quantity(member.numbers_lombaryers),
+        )
 
     async def notify_that_shift_is_cancelled(self, users: list[models.User], final_message: str) -> None:
         """Уведомляет пользователей об отмене смены."""
-        send_message_tasks = [self.send_message(user, final_message) for user in users]
-        self.__bot_application.create_task(asyncio.gather(*send_message_tasks))
+        await self.enqueue_messages([models.OutgoingMessage(user_id=user.id, text=final_message) for user in users])
 
     async def notify_that_shift_start_date_is_changed(
         self, users: list[models.User], start_date_changed_message: str
     ) -> None:
         """Уведомляет пользователей о переносе даты старта смены."""
-        send_message_tasks = [self.send_message(user, start_date_changed_message) for user in users]
-        self.__bot_application.create_task(asyncio.gather(*send_message_tasks))
+        await self.enqueue_messages(
+            [models.OutgoingMessage(user_id=user.id, text=start_date_changed_message) for user in users]
+        )
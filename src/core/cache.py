@@ -0,0 +1,94 @@
+import abc
+from collections import OrderedDict
+from datetime import datetime, time, timedelta
+from typing import Any, Hashable
+
+MISSING = object()
+
+
+class CacheBackend(abc.ABC):
+    """Асинхронный интерфейс хранилища кэша.
+
+    Кэш можно заменить любой реализацией интерфейса, например общим хранилищем для нескольких
+    экземпляров приложения, обращения к которому не блокируют цикл событий.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Any:
+        """Возвращает значение из кэша или MISSING, если значения нет или оно устарело."""
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Сохраняет значение в кэш."""
+
+    @abc.abstractmethod
+    async def invalidate(self, key: str) -> None:
+        """Удаляет значение из кэша."""
+
+    @abc.abstractmethod
+    async def clear(self) -> None:
+        """Удаляет все значения из кэша."""
+
+
+class TTLCache:
+    """Кэш в памяти процесса приложения.
+
+    Значения устаревают через ttl секунд. Если передан expire_at_midnight, значения
+    устаревают не позже конца текущих суток, так как зависят от текущей даты.
+    Если передан maxsize, кэш хранит не больше maxsize значений и вытесняет давно не запрашиваемые.
+    Значения, которые изменились в БД, нужно явно удалять из кэша после фиксации изменений.
+    """
+
+    def __init__(self, ttl: int, expire_at_midnight: bool = False, maxsize: int | None = None) -> None:
+        self.__ttl = timedelta(seconds=ttl)
+        self.__expire_at_midnight = expire_at_midnight
+        self.__maxsize = maxsize
+        self.__data: OrderedDict[Hashable, tuple[Any, datetime]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """Возвращает значение из кэша или MISSING, если значения нет или оно устарело."""
+        value, expires_at = self.__data.get(key, (MISSING, None))
+        if value is not MISSING and expires_at <= datetime.now():
+            del self.__data[key]
+            return MISSING
+        if value is not MISSING:
+            self.__data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохраняет значение в кэш."""
+        now = datetime.now()
+        expires_at = now + self.__ttl
+        if self.__expire_at_midnight:
+            expires_at = min(expires_at, datetime.combine(now.date() + timedelta(days=1), time.min))
+        self.__data[key] = (value, expires_at)
+        self.__data.move_to_end(key)
+        if self.__maxsize is not None and len(self.__data) > self.__maxsize:
+            self.__data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Удаляет значение из кэша."""
+        self.__data.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаляет все значения из кэша."""
+        self.__data.clear()
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Хранилище кэша в памяти процесса приложения на основе TTLCache."""
+
+    def __init__(self, ttl: int, maxsize: int | None = None) -> None:
+        self.__cache = TTLCache(ttl, maxsize=maxsize)
+
+    async def get(self, key: str) -> Any:
+        return self.__cache.get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        self.__cache.set(key, value)
+
+    async def invalidate(self, key: str) -> None:
+        self.__cache.invalidate(key)
+
+    async def clear(self) -> None:
+        self.__cache.clear()
@@ -14,6 +14,13 @@ class AdministratorAndTokensDTO:
     administrator: Administrator
 
 
+@dataclass
+class AdministratorIdentityDto:
+    id: UUID
+    role: Administrator.Role
+    status: Administrator.Status
+
+
 @dataclass
 class FullReportDto:
     shift_id: UUID
@@ -33,6 +40,18 @@ class FullReportDto:
     photo_url: str
 
 
+@dataclass
+class ReportsPageDto:
+    items: list[FullReportDto]
+    next_cursor: str | None
+
+
+@dataclass
+class ReportsModerationDto:
+    reviewed: list[UUID]
+    skipped: list[UUID]
+
+
 @dataclass
 class TasksAnalyticReportDto:
     sequence_number: int
@@ -55,6 +74,27 @@ class ShiftAnalyticReportDto:
     reports_total: int
 
 
+@dataclass
+class MemberAnalyticReportDto:
+    shift_sequence_number: int
+    surname: str
+    name: str
+    status: str
+    numbers_lombaryers: int
+    approved: int
+    declined: int
+    skipped: int
+    reports_total: int
+
+
+@dataclass
+class UserIdentityDto:
+    user_id: UUID
+    telegram_blocked: bool
+    member_id: UUID | None
+    shift_id: UUID | None
+
+
 @dataclass
 class RequestDTO:
     request_id: UUID
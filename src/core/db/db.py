@@ -1,12 +1,81 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.core.settings import settings
 
-engine = create_async_engine(settings.database_url, future=True, echo=True)
+
+class MonitoredPool(AsyncAdaptedQueuePool):
+    """Пул соединений, собирающий статистику ожидания свободного соединения."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def connect(self):
+        started_at = time.perf_counter()
+        connection = super().connect()
+        wait_time = time.perf_counter() - started_at
+        self.checkouts += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        return connection
+
+
+engine = create_async_engine(
+    make_url(settings.database_url).update_query_dict(
+        {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+    ),
+    echo=settings.DB_ECHO,
+    poolclass=MonitoredPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 async def get_session() -> AsyncSession:
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
     async with async_session() as session:
         yield session
+
+
+@asynccontextmanager
+async def get_session_context(transaction: bool = False) -> AsyncIterator[AsyncSession]:
+    """Открыть сессию БД вне FastAPI (в обработчиках и задачах бота).
+
+    Сессия закрывается и возвращает соединение в пул при выходе из контекста.
+    При transaction=True незафиксированные изменения фиксируются при успешном выходе из контекста,
+    а при ошибке откатываются.
+    """
+    async with async_session() as session:
+        try:
+            yield session
+            if transaction:
+                await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def get_pool_status() -> dict:
+    """Получить состояние пула соединений с БД."""
+    pool: MonitoredPool = engine.pool
+    return dict(
+        size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        checkouts=pool.checkouts,
+        average_wait_time=pool.total_wait_time / pool.checkouts if pool.checkouts else 0.0,
+        max_wait_time=pool.max_wait_time,
+    )
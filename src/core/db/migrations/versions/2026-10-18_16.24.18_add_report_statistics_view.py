@@ -0,0 +1,42 @@
+"""Add report_statistics materialized view
+
+Revision ID: 2c8e5a7d9f31
+Revises: 9d4a6b1f2e57
+Create Date: 2026-10-18 16:24:18.902413
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2c8e5a7d9f31'
+down_revision = '9d4a6b1f2e57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW report_statistics AS
+        SELECT
+            reports.shift_id,
+            reports.task_id,
+            count(*) FILTER (WHERE reports.number_attempt = 0) AS approved_from_1_attempt,
+            count(*) FILTER (WHERE reports.number_attempt = 1) AS approved_from_2_attempt,
+            count(*) FILTER (WHERE reports.number_attempt = 2) AS approved_from_3_attempt,
+            count(*) FILTER (WHERE reports.status = 'approved') AS approved,
+            count(*) FILTER (WHERE reports.status = 'declined') AS declined,
+            count(*) FILTER (WHERE reports.status = 'skipped') AS skipped,
+            count(*) AS reports_total
+        FROM reports
+        JOIN members ON members.id = reports.member_id
+        JOIN users ON users.id = members.user_id
+        WHERE NOT users.is_test_user
+        GROUP BY reports.shift_id, reports.task_id
+        """
+    )
+    op.execute("CREATE UNIQUE INDEX ix_report_statistics_shift_id_task_id ON report_statistics (shift_id, task_id)")
+
+
+def downgrade():
+    op.execute("DROP MATERIALIZED VIEW report_statistics")
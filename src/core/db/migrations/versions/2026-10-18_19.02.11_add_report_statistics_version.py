@@ -0,0 +1,61 @@
+"""Add report_statistics_version
+
+Revision ID: 4b7d2e9a1c63
+Revises: 6e1a3c8b5d24
+Create Date: 2026-10-18 19:02:11.524730
+
+"""
+import uuid
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '4b7d2e9a1c63'
+down_revision = '6e1a3c8b5d24'
+branch_labels = None
+depends_on = None
+
+TRIGGERS = (
+    ("reports", "INSERT OR UPDATE OR DELETE OR TRUNCATE"),
+    ("members", "UPDATE OF user_id OR DELETE OR TRUNCATE"),
+    ("users", "UPDATE OF is_test_user OR DELETE OR TRUNCATE"),
+)
+
+
+def upgrade():
+    op.create_table(
+        'report_statistics_version',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(f"INSERT INTO report_statistics_version (id) VALUES ('{uuid.uuid4()}')")
+    op.execute(
+        """
+        CREATE FUNCTION increment_report_statistics_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE report_statistics_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table_name, events in TRIGGERS:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table_name}_report_statistics_version
+            AFTER {events} ON {table_name}
+            FOR EACH STATEMENT EXECUTE FUNCTION increment_report_statistics_version()
+            """
+        )
+
+
+def downgrade():
+    for table_name, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER {table_name}_report_statistics_version ON {table_name}")
+    op.execute("DROP FUNCTION increment_report_statistics_version()")
+    op.drop_table('report_statistics_version')
@@ -1,6 +1,7 @@
 import enum
 import uuid
 from datetime import datetime
+from pathlib import Path
 
 from sqlalchemy import (
     DATE,
@@ -11,11 +12,14 @@ from sqlalchemy import (
     Column,
     Enum,
     Identity,
+    Index,
     Integer,
     String,
     UniqueConstraint,
+    column,
     func,
     select,
+    table,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import as_declarative
@@ -101,6 +105,7 @@ class Task(Base):
     url = Column(String(length=150), unique=True, nullable=False)
     title = Column(String(length=150), unique=True, nullable=False)
     is_archived = Column(Boolean, default=False, nullable=False)
+    telegram_file_id = Column(String(length=256), nullable=True)
     reports = relationship("Report", back_populates="task")
 
     def __repr__(self):
@@ -190,7 +195,10 @@ class Member(Base):
     reports = relationship("Report", back_populates="member", order_by='Report.task_date')
     member_user_name = deferred((select(User.name).where(User.id == user_id)).scalar_subquery())
 
-    __table_args__ = (UniqueConstraint("user_id", "shift_id", name="_user_shift_uc"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "shift_id", name="_user_shift_uc"),
+        Index("ix_members_shift_id_status", "shift_id", "status"),
+    )
 
     def __repr__(self):
         return f"<Member: {self.id}, status: {self.status}>"
@@ -261,26 +269,49 @@ class Report(Base):
         nullable=False,
     )
     report_url = Column(String(length=4096), unique=True, nullable=True)
+    photo_hash = Column(String(length=64), nullable=True)
     uploaded_at = Column(TIMESTAMP, nullable=True)
     number_attempt = Column(Integer, nullable=False, server_default='0')
 
-    __table_args__ = (UniqueConstraint("shift_id", "task_date", "member_id", name="_member_task_uc"),)
+    __table_args__ = (
+        UniqueConstraint("shift_id", "task_date", "member_id", name="_member_task_uc"),
+        Index("ix_reports_member_id_task_date", "member_id", "task_date"),
+        Index("ix_reports_photo_hash", "photo_hash"),
+        Index("ix_reports_shift_id_created_at_id", "shift_id", "created_at", "id"),
+        Index("ix_reports_shift_id_status_created_at_id", "shift_id", "status", "created_at", "id"),
+        Index(
+            "ix_reports_reviewing_member_id",
+            "member_id",
+            postgresql_where=(status == Status.REVIEWING.value),
+        ),
+        Index(
+            "ix_reports_waiting_task_date",
+            "task_date",
+            "member_id",
+            postgresql_where=(status == Status.WAITING.value),
+        ),
+    )
 
     def __repr__(self):
         return f"<Report: {self.id}, task_date: {self.task_date}, status: {self.status}>"
 
-    def send_report(self, photo_url: str):
+    def check_can_send_report(self) -> None:
+        """Проверить, что статус и количество попыток позволяют отправить отчет на проверку."""
         if self.number_attempt == settings.NUMBER_ATTEMPTS_SUBMIT_REPORT:
             raise exceptions.ExceededAttemptsReportError
-        if not photo_url:
-            raise exceptions.EmptyReportError
         if self.status not in (
             Report.Status.WAITING.value,
             Report.Status.DECLINED.value,
         ):
             raise exceptions.CannotAcceptReportError
+
+    def send_report(self, photo_url: str, photo_hash: str):
+        self.check_can_send_report()
+        if not photo_url:
+            raise exceptions.EmptyReportError
         self.status = Report.Status.REVIEWING.value
         self.report_url = photo_url
+        self.photo_hash = photo_hash
         self.uploaded_at = datetime.now()
         self.number_attempt += 1
 
@@ -290,6 +321,37 @@ class Report(Base):
         self.reviewed_at = datetime.now()
 
 
+# Материализованное представление со статистикой отчётов по заданиям каждой смены.
+# Создаётся миграцией и не входит в метаданные моделей, обновляется ReportStatisticsRefresher.
+report_statistics = table(
+    "report_statistics",
+    column("shift_id", UUID(as_uuid=True)),
+    column("task_id", UUID(as_uuid=True)),
+    column("approved_from_1_attempt", Integer),
+    column("approved_from_2_attempt", Integer),
+    column("approved_from_3_attempt", Integer),
+    column("approved", Integer),
+    column("declined", Integer),
+    column("skipped", Integer),
+    column("reports_total", Integer),
+)
+
+
+class ReportStatisticsVersion(Base):
+    """Версия данных представления report_statistics.
+
+    Таблица содержит одну строку. Счётчик version увеличивается триггерами БД в той же транзакции,
+    в которой изменяются отчёты, участники или признак тестового пользователя.
+    """
+
+    __tablename__ = "report_statistics_version"
+
+    version = Column(BigInteger, nullable=False, server_default="0")
+
+    def __repr__(self):
+        return f"<ReportStatisticsVersion: {self.version}>"
+
+
 class AdministratorInvitation(Base):
     """Модель приглашения администратора/психолога."""
 
@@ -303,3 +365,102 @@ class AdministratorInvitation(Base):
 
     def __repr__(self) -> str:
         return f"<AdministratorInvitation: {self.id}, email: {self.email}, surname: {self.surname}, name: {self.name}>"
+
+
+class OutgoingMessage(Base):
+    """Исходящее сообщение бота в очереди на отправку."""
+
+    class Status(str, enum.Enum):
+        """Статус отправки сообщения."""
+
+        QUEUED = "queued"
+        SENT = "sent"
+        FAILED = "failed"
+        BLOCKED = "blocked"
+
+    __tablename__ = "outgoing_messages"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey(User.id, ondelete="CASCADE"), nullable=False)
+    user = relationship("User")
+    text = Column(String(length=4096), nullable=False)
+    photo = Column(String(length=4096), nullable=True)
+    reply_markup = Column(JSON, nullable=True)
+    status = Column(
+        Enum(Status, name="outgoing_message_status", values_callable=lambda obj: [e.value for e in obj]),
+        default=Status.QUEUED.value,
+        nullable=False,
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+    send_after = Column(TIMESTAMP, default=datetime.now, nullable=False)
+    sent_at = Column(TIMESTAMP, nullable=True)
+    error = Column(String(length=4096), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_outgoing_messages_queued_send_after",
+            "send_after",
+            postgresql_where=(status == Status.QUEUED.value),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<OutgoingMessage: {self.id}, status: {self.status}>"
+
+
+class ExportJob(Base):
+    """Задание на формирование excel-отчёта."""
+
+    class Status(str, enum.Enum):
+        """Статус задания."""
+
+        QUEUED = "queued"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+        EXPIRED = "expired"
+
+    class ReportType(str, enum.Enum):
+        """Тип отчёта."""
+
+        FULL = "full"
+        TASKS = "tasks"
+        SHIFT = "shift"
+
+    __tablename__ = "export_jobs"
+
+    report_type = Column(
+        Enum(ReportType, name="export_report_type", values_callable=lambda obj: [e.value for e in obj]),
+        nullable=False,
+    )
+    shift_id = Column(UUID(as_uuid=True), ForeignKey(Shift.id, ondelete="CASCADE"), nullable=True)
+    status = Column(
+        Enum(Status, name="export_job_status", values_callable=lambda obj: [e.value for e in obj]),
+        default=Status.QUEUED.value,
+        nullable=False,
+    )
+    data_version = Column(String(length=64), nullable=True)
+    filename = Column(String(length=512), nullable=False)
+    finished_at = Column(TIMESTAMP, nullable=True)
+    error = Column(String(length=4096), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_export_jobs_done_cache_key",
+            "report_type",
+            "shift_id",
+            "data_version",
+            postgresql_where=(status == Status.DONE.value),
+        ),
+    )
+
+    @staticmethod
+    def get_file_path(job_id: uuid.UUID) -> Path:
+        """Путь к файлу отчёта задания."""
+        return settings.EXPORTS_DIR / f"{job_id}.xlsx"
+
+    @property
+    def file_path(self) -> Path:
+        return self.get_file_path(self.id)
+
+    def __repr__(self):
+        return f"<ExportJob: {self.id}, report_type: {self.report_type}, status: {self.status}>"
@@ -1,7 +1,9 @@
 from .abstract_repository import AbstractRepository  # noqa
 from .administrator_invitation import AdministratorInvitationRepository  # noqa
 from .administrator_repository import AdministratorRepository  # noqa
+from .export_job_repository import ExportJobRepository  # noqa
 from .member_repository import MemberRepository  # noqa
+from .outgoing_message_repository import OutgoingMessageRepository  # noqa
 from .report_repository import ReportRepository  # noqa
 from .request_repository import RequestRepository  # noqa
 from .shift_repository import ShiftRepository  # noqa
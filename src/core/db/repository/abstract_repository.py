@@ -1,10 +1,13 @@
 import abc
-from typing import Optional, TypeVar
+from copy import deepcopy
+from typing import Any, Optional, TypeVar
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import inspect, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from src.core import exceptions
 
@@ -12,7 +15,10 @@ DatabaseModel = TypeVar("DatabaseModel")
 
 
 class AbstractRepository(abc.ABC):
-    """Абстрактный класс, для реализации паттерна Repository."""
+    """Абстрактный класс, для реализации паттерна Repository.
+
+    Методы репозитория только отправляют изменения в БД (flush), транзакцию фиксирует UnitOfWork.
+    """
 
     def __init__(self, session: AsyncSession, model: DatabaseModel) -> None:
         self._session = session
@@ -34,7 +40,7 @@ class AbstractRepository(abc.ABC):
         """Создает новый объект модели и сохраняет в базе."""
         self._session.add(instance)
         try:
-            await self._session.commit()
+            await self._session.flush()
         except IntegrityError:
             raise exceptions.ObjectAlreadyExistsError(instance)
 
@@ -45,16 +51,61 @@ class AbstractRepository(abc.ABC):
         """Обновляет существующий объект модели в базе."""
         instance.id = instance_id
         instance = await self._session.merge(instance)
-        await self._session.commit()
+        await self._session.flush()
         return instance  # noqa: R504
 
     async def update_all(self, instances: list[DatabaseModel]) -> list[DatabaseModel]:
         """Обновляет несколько измененных объектов модели в базе."""
         self._session.add_all(instances)
-        await self._session.commit()
+        await self._session.flush()
         return instances
 
+    async def bulk_create(self, rows: list[dict[str, Any]], constraint: Optional[str] = None) -> list[UUID]:
+        """Создает объекты модели из словарей со значениями полей пакетным INSERT ... ON CONFLICT DO NOTHING.
+
+        Строки, нарушающие ограничение уникальности constraint, пропускаются, поэтому повторный вызов
+        с теми же данными не приводит к ошибке. Возвращает список id созданных объектов.
+        """
+        if not rows:
+            return []
+        statement = (
+            insert(self._model.__table__).on_conflict_do_nothing(constraint=constraint).returning(self._model.id)
+        )
+        created_ids = await self._session.scalars(statement, rows)
+        created_ids = created_ids.all()
+        await self._session.flush()
+        return created_ids
+
+    async def bulk_update(self, *criteria: Any, **values: Any) -> list[UUID]:
+        """Обновляет одним запросом все объекты модели, удовлетворяющие условиям.
+
+        Объекты не загружаются из базы, возвращается список id обновленных объектов.
+        """
+        statement = update(self._model).where(*criteria).values(**values).returning(self._model.id)
+        updated_ids = await self._session.scalars(statement)
+        updated_ids = updated_ids.all()
+        await self._session.flush()
+        return updated_ids
+
     async def get_all(self) -> list[DatabaseModel]:
         """Возвращает все объекты модели из базы данных."""
         objects = await self._session.execute(select(self._model))
         return objects.scalars().all()
+
+    def _to_cache_state(self, instance: DatabaseModel) -> dict[str, Any]:
+        """Снимок загруженных полей объекта для хранения в кэше вне сессии."""
+        loaded = inspect(instance).dict
+        return {
+            attribute.key: deepcopy(loaded[attribute.key])
+            for attribute in inspect(self._model).column_attrs
+            if attribute.key in loaded
+        }
+
+    async def _from_cache_state(self, state: dict[str, Any]) -> DatabaseModel:
+        """Присоединяет к сессии объект, восстановленный из снимка в кэше, без запроса к БД.
+
+        Изменения объекта не затрагивают снимок, поэтому кэш можно использовать в разных сессиях.
+        """
+        instance = self._model(**deepcopy(state))
+        make_transient_to_detached(instance)
+        return await self._session.merge(instance, load=False)
@@ -1,18 +1,42 @@
+from functools import cache
+
 from fastapi import Depends
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core import exceptions
+from src.core.cache import MISSING, CacheBackend, MemoryCacheBackend
 from src.core.db.db import get_session
+from src.core.db.DTO_models import AdministratorIdentityDto
 from src.core.db.models import Administrator
 from src.core.db.repository import AbstractRepository
+from src.core.settings import settings
+
+
+@cache
+def get_administrator_cache() -> CacheBackend:
+    """Хранилище кэша администраторов.
+
+    По умолчанию кэш хранится в памяти процесса. Другое хранилище подключается
+    переопределением зависимости (app.dependency_overrides[get_administrator_cache]).
+    """
+    return MemoryCacheBackend(settings.ADMINISTRATOR_CACHE_TTL)
 
 
 class AdministratorRepository(AbstractRepository):
-    """Репозиторий для работы с моделью Administrator."""
+    """Репозиторий для работы с моделью Administrator.
+
+    Id, роль и статус администратора проверяются при каждом запросе к API, поэтому хранятся в кэше по email.
+    После изменения роли или статуса администратора кэш нужно сбросить (invalidate_identity).
+    """
 
-    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+    def __init__(
+        self,
+        session: AsyncSession = Depends(get_session),
+        administrator_cache: CacheBackend = Depends(get_administrator_cache),
+    ) -> None:
         super().__init__(session, Administrator)
+        self.__administrator_cache = administrator_cache
 
     async def get_by_email(self, email: str) -> Administrator:
         """Получает из БД администратора по его email. В случае отсутствия бросает ошибку.
@@ -26,6 +50,27 @@ class AdministratorRepository(AbstractRepository):
             raise exceptions.AdministratorNotFoundError
         return administrator
 
+    async def invalidate_identity(self, email: str) -> None:
+        """Удаляет администратора из кэша."""
+        await self.__administrator_cache.invalidate(email)
+
+    async def get_identity_by_email(self, email: str) -> AdministratorIdentityDto:
+        """Получает id, роль и статус администратора по его email. В случае отсутствия бросает ошибку.
+
+        Данные берутся из кэша, а при отсутствии - из БД.
+        """
+        identity = await self.__administrator_cache.get(email)
+        if identity is MISSING:
+            statement = select(Administrator.id, Administrator.role, Administrator.status).where(
+                Administrator.email == email
+            )
+            identity = (await self._session.execute(statement)).first()
+            if not identity:
+                raise exceptions.AdministratorNotFoundError
+            identity = AdministratorIdentityDto(*identity)
+            await self.__administrator_cache.set(email, identity)
+        return identity
+
     async def is_administrator_exists(
         self,
         email: str,
@@ -0,0 +1,64 @@
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db.db import get_session
+from src.core.db.models import ExportJob
+from src.core.db.repository import AbstractRepository
+
+
+class ExportJobRepository(AbstractRepository):
+    """Репозиторий для работы с моделью ExportJob."""
+
+    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+        super().__init__(session, ExportJob)
+
+    async def get_cached(
+        self, report_type: ExportJob.ReportType, shift_id: UUID | None, data_version: str
+    ) -> ExportJob | None:
+        """Получить выполненное или ещё выполняемое задание с отчётом того же типа по той же версии данных."""
+        job = await self._session.scalars(
+            select(ExportJob)
+            .where(
+                ExportJob.status.in_((ExportJob.Status.QUEUED, ExportJob.Status.RUNNING, ExportJob.Status.DONE)),
+                ExportJob.report_type == report_type,
+                ExportJob.shift_id == shift_id,
+                ExportJob.data_version == data_version,
+            )
+            .order_by(desc(ExportJob.created_at))
+        )
+        return job.first()
+
+    async def expire_cached(self, report_type: ExportJob.ReportType, shift_id: UUID | None) -> list[UUID]:
+        """Пометить устаревшими закэшированные отчёты, сформированные по прежним версиям данных."""
+        return await self.bulk_update(
+            ExportJob.status == ExportJob.Status.DONE,
+            ExportJob.report_type == report_type,
+            ExportJob.shift_id == shift_id,
+            ExportJob.data_version.is_not(None),
+            status=ExportJob.Status.EXPIRED,
+        )
+
+    async def expire_finished_before(self, finished_before: datetime) -> list[UUID]:
+        """Пометить устаревшими незакэшированные отчёты, сформированные раньше указанного времени."""
+        return await self.bulk_update(
+            ExportJob.status.in_((ExportJob.Status.DONE, ExportJob.Status.FAILED)),
+            ExportJob.data_version.is_(None),
+            ExportJob.finished_at < finished_before,
+            status=ExportJob.Status.EXPIRED,
+        )
+
+    async def requeue_unfinished(self) -> list[UUID]:
+        """Вернуть в очередь задания, выполнение которых прервалось при остановке приложения."""
+        return await self.bulk_update(
+            ExportJob.status.in_((ExportJob.Status.QUEUED, ExportJob.Status.RUNNING)),
+            status=ExportJob.Status.QUEUED,
+        )
+
+    async def set_status(self, job_id: UUID, status: ExportJob.Status, error: str | None = None) -> None:
+        """Сохранить статус выполнения задания."""
+        finished_at = datetime.now() if status in (ExportJob.Status.DONE, ExportJob.Status.FAILED) else None
+        await self.bulk_update(ExportJob.id == job_id, status=status, error=error, finished_at=finished_at)
@@ -2,18 +2,28 @@ from datetime import datetime
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import func, or_, select
+from sqlalchemy import case, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload, subqueryload
 
+from src.core.cache import MISSING, TTLCache
 from src.core.db.db import get_session
+from src.core.db.DTO_models import MemberAnalyticReportDto
 from src.core.db.models import Member, Report, Shift, User
 from src.core.db.repository import AbstractRepository
 from src.core.exceptions import ObjectNotFoundError
+from src.core.settings import settings
+
+balance_cache = TTLCache(settings.BALANCE_CACHE_TTL, maxsize=settings.BALANCE_CACHE_SIZE)
 
 
 class MemberRepository(AbstractRepository):
-    """Репозиторий для работы с моделью Member."""
+    """Репозиторий для работы с моделью Member.
+
+    Баланс ломбарьерчиков участников текущей смены хранится в кэше по telegram_id.
+    При начислении ломбарьерчиков запись кэша удаляется (invalidate_balance): пользователь может
+    одновременно участвовать в завершаемой и текущей сменах, поэтому баланс берётся из БД по текущей смене.
+    """
 
     def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
         super().__init__(session, Member)
@@ -36,6 +46,27 @@ class MemberRepository(AbstractRepository):
             raise ObjectNotFoundError(Member, member_id)
         return member
 
+    async def get_many_with_user_and_shift(self, member_ids: list[UUID]) -> list[Member]:
+        members = await self._session.scalars(
+            select(Member)
+            .where(Member.id.in_(member_ids))
+            .options(selectinload(Member.user))
+            .options(selectinload(Member.shift))
+        )
+        return members.all()
+
+    async def add_lombaryers(self, lombaryers_by_member_id: dict[UUID, int]) -> None:
+        """Начислить участникам ломбарьерчики одним запросом."""
+        if not lombaryers_by_member_id:
+            return
+        await self._session.execute(
+            update(Member)
+            .where(Member.id.in_(lombaryers_by_member_id))
+            .values(numbers_lombaryers=Member.numbers_lombaryers + case(lombaryers_by_member_id, value=Member.id))
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.flush()
+
     async def get_members_for_excluding(self, shift_id: UUID, task_amount: int) -> list[Member]:
         members = await self._session.scalars(
             select(Member)
@@ -75,20 +106,39 @@ class MemberRepository(AbstractRepository):
         report_under_review = await self._session.execute(select(stmt.exists()))
         return report_under_review.scalar()
 
+    async def get_ids_with_unreviewed_reports(self, member_ids: list[UUID]) -> set[UUID]:
+        """Получить id участников из переданных, у которых есть непроверенные задания."""
+        members_ids = await self._session.scalars(
+            select(Report.member_id)
+            .where(Report.status == Report.Status.REVIEWING, Report.member_id.in_(member_ids))
+            .distinct()
+        )
+        return set(members_ids.all())
+
+    @staticmethod
+    def invalidate_balance(telegram_id: int) -> None:
+        """Удаляет из кэша баланс пользователя."""
+        balance_cache.invalidate(telegram_id)
+
     async def get_number_of_lombariers_by_telegram_id(self, telegram_id: int) -> int:
-        amount = await self._session.execute(
-            select(Member.numbers_lombaryers)
-            .join(User)
-            .where(User.telegram_id == telegram_id)
-            .join(Shift)
-            .where(
-                or_(
-                    Shift.status == Shift.Status.READY_FOR_COMPLETE,
-                    Shift.status == Shift.Status.STARTED,
+        """Баланс ломбарьерчиков в текущей смене. Баланс берётся из кэша, а при отсутствии - из БД."""
+        amount = balance_cache.get(telegram_id)
+        if amount is MISSING:
+            amount = await self._session.execute(
+                select(Member.numbers_lombaryers)
+                .join(User)
+                .where(User.telegram_id == telegram_id)
+                .join(Shift)
+                .where(
+                    or_(
+                        Shift.status == Shift.Status.READY_FOR_COMPLETE,
+                        Shift.status == Shift.Status.STARTED,
+                    )
                 )
             )
-        )
-        return amount.scalars().one_or_none() or 0
+            amount = amount.scalars().one_or_none() or 0
+            balance_cache.set(telegram_id, amount)
+        return amount
 
     async def get_active_members_for_shift(self, shift_id: UUID) -> list[Member]:
         """Возвращает активных участников смены."""
@@ -101,3 +151,36 @@ class MemberRepository(AbstractRepository):
             .options(joinedload(Member.user))
         )
         return members.all()
+
+    async def get_members_statistics_report(self) -> list[MemberAnalyticReportDto]:
+        """Сводный отчёт по участникам начатых и завершённых смен.
+
+        Для каждого участника содержит количество ломбарьерчиков и принятых/отклонённых/не предоставленных отчётов.
+        """
+        stmt = (
+            select(
+                Shift.sequence_number,
+                User.surname,
+                User.name,
+                Member.status,
+                Member.numbers_lombaryers,
+                func.count(Report.id).filter(Report.status == Report.Status.APPROVED),
+                func.count(Report.id).filter(Report.status == Report.Status.DECLINED),
+                func.count(Report.id).filter(Report.status == Report.Status.SKIPPED),
+                func.count(Report.id),
+            )
+            .join(Member.shift)
+            .join(Member.user)
+            .outerjoin(Member.reports)
+            .where(
+                Shift.status.in_((Shift.Status.STARTED, Shift.Status.READY_FOR_COMPLETE, Shift.Status.FINISHED)),
+                User.is_test_user.is_(False),
+            )
+            .group_by(Member.id, Shift.sequence_number, User.surname, User.name)
+            .order_by(Shift.sequence_number, User.surname, User.name)
+        )
+        members = await self._session.execute(stmt)
+        return [
+            MemberAnalyticReportDto(sequence_number, surname, name, status.value, *statistic)
+            for sequence_number, surname, name, status, *statistic in members
+        ]
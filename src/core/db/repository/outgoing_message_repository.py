@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Iterable
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from src.core.db.db import get_session
+from src.core.db.models import OutgoingMessage
+from src.core.db.repository import AbstractRepository
+
+
+class OutgoingMessageRepository(AbstractRepository):
+    """Репозиторий для работы с моделью OutgoingMessage."""
+
+    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+        super().__init__(session, OutgoingMessage)
+
+    async def create_all(self, messages: list[OutgoingMessage]) -> None:
+        """Поставить сообщения в очередь на отправку."""
+        self._session.add_all(messages)
+        await self._session.flush()
+
+    async def get_queued(self, limit: int, exclude_ids: Iterable[UUID] = ()) -> list[OutgoingMessage]:
+        """Получить из очереди сообщения, готовые к отправке, вместе с получателями.
+
+        Аргументы:
+            limit (int) - максимальное количество сообщений
+            exclude_ids (Iterable[UUID]) - id сообщений, которые уже отправляются
+        """
+        statement = select(OutgoingMessage).where(
+            OutgoingMessage.status == OutgoingMessage.Status.QUEUED,
+            OutgoingMessage.send_after <= datetime.now(),
+        )
+        exclude_ids = tuple(exclude_ids)
+        if exclude_ids:
+            statement = statement.where(OutgoingMessage.id.notin_(exclude_ids))
+        statement = (
+            statement.options(joinedload(OutgoingMessage.user))
+            .order_by(OutgoingMessage.send_after, OutgoingMessage.created_at)
+            .limit(limit)
+        )
+        messages = await self._session.scalars(statement)
+        return messages.all()
+
+    async def set_status(self, message_id: UUID, status: OutgoingMessage.Status, error: str | None = None) -> None:
+        """Сохранить результат попытки отправки сообщения."""
+        await self._session.execute(
+            update(OutgoingMessage)
+            .where(OutgoingMessage.id == message_id)
+            .values(
+                status=status,
+                error=error,
+                attempts=OutgoingMessage.attempts + 1,
+                sent_at=datetime.now() if status is OutgoingMessage.Status.SENT else None,
+            )
+        )
+        await self._session.flush()
+
+    async def postpone(self, message_id: UUID, send_after: datetime, error: str) -> None:
+        """Отложить повторную отправку сообщения после временной ошибки."""
+        await self._session.execute(
+            update(OutgoingMessage)
+            .where(OutgoingMessage.id == message_id)
+            .values(send_after=send_after, error=error, attempts=OutgoingMessage.attempts + 1)
+        )
+        await self._session.flush()
@@ -1,15 +1,22 @@
-from datetime import timedelta
-from typing import Optional, Sequence
+from datetime import date, datetime, timedelta
+from typing import Optional
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import desc, exists, select
+from sqlalchemy import or_, select, text, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core import exceptions
 from src.core.db import DTO_models
 from src.core.db.db import get_session
-from src.core.db.models import Member, Report, Shift, Task, User
+from src.core.db.models import (
+    Member,
+    Report,
+    ReportStatisticsVersion,
+    Shift,
+    Task,
+    User,
+)
 from src.core.db.repository import AbstractRepository
 from src.core.utils import get_current_task_date
 
@@ -20,8 +27,14 @@ class ReportRepository(AbstractRepository):
     def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
         super().__init__(session, Report)
 
-    async def get_by_report_url(self, url: str) -> Report:
-        reports = await self._session.execute(select(Report).where(Report.report_url == url))
+    async def get_duplicate(self, photo_hash: str, url: str) -> Optional[Report]:
+        """Получить отчет с тем же содержимым фото или тем же файлом фото.
+
+        Для отчетов, отправленных до сохранения хэша фото, совпадение проверяется по адресу файла.
+        """
+        reports = await self._session.execute(
+            select(Report).where(or_(Report.photo_hash == photo_hash, Report.report_url == url)).limit(1)
+        )
         return reports.scalars().first()
 
     async def get_all_tasks_id_under_review(self) -> Optional[list[UUID]]:
@@ -31,13 +44,24 @@ class ReportRepository(AbstractRepository):
         )
         return all_tasks_id_under_review.all()
 
-    async def create_all(self, reports_list: list[Report]) -> Report:
-        self._session.add_all(reports_list)
-        await self._session.commit()
-        return reports_list
+    async def create_all(self, reports: list[dict]) -> list[UUID]:
+        """Создать отчеты, пропуская уже существующие отчеты участника за ту же дату."""
+        return await self.bulk_create(reports, constraint="_member_task_uc")
+
+    async def get_summaries_of_reports(
+        self,
+        shift_id: UUID,
+        status: Report.Status | None,
+        task_date: date | None = None,
+        member_id: UUID | None = None,
+        cursor: tuple[datetime, UUID] | None = None,
+        limit: int | None = None,
+    ) -> list[DTO_models.FullReportDto]:
+        """Получить отчеты участников по id смены с url фото выполненного задания.
 
-    async def get_summaries_of_reports(self, shift_id: UUID, status: Report.Status) -> list[DTO_models.FullReportDto]:
-        """Получить отчеты участников по id смены с url фото выполненного задания."""
+        Отчеты упорядочены по полям (created_at, id). Для получения следующей страницы
+        передается курсор - значения этих полей у последнего отчета предыдущей страницы.
+        """
         stmt = select(
             Shift.id,
             Shift.status,
@@ -59,7 +83,13 @@ class ReportRepository(AbstractRepository):
             stmt = stmt.where(Report.shift_id == shift_id)
         if status:
             stmt = stmt.where(Report.status == status)
-        stmt = stmt.join(Shift).join(Member).join(User).join(Task).order_by(desc(Shift.started_at))
+        if task_date:
+            stmt = stmt.where(Report.task_date == task_date)
+        if member_id:
+            stmt = stmt.where(Report.member_id == member_id)
+        if cursor:
+            stmt = stmt.where(tuple_(Report.created_at, Report.id) > cursor)
+        stmt = stmt.join(Shift).join(Member).join(User).join(Task).order_by(Report.created_at, Report.id).limit(limit)
         stmt = stmt.where(
             Report.shift_id == Shift.id,
             Report.member_id == Member.id,
@@ -69,11 +99,11 @@ class ReportRepository(AbstractRepository):
         reports = await self._session.execute(stmt)
         return [DTO_models.FullReportDto(*report) for report in reports.all()]
 
-    async def get_current_report(self, user_id: UUID) -> Report:
-        """Получить текущий отчет по id пользователя."""
+    async def get_current_report(self, member_id: UUID) -> Report:
+        """Получить текущий отчет участника смены."""
         reports = await self._session.execute(
             select(Report).where(
-                Report.member_id.in_(select(Member.id).where(Member.user_id == user_id)),
+                Report.member_id == member_id,
                 Report.task_date == get_current_task_date(),
             )
         )
@@ -82,25 +112,59 @@ class ReportRepository(AbstractRepository):
             raise exceptions.CurrentTaskNotFoundError()
         return report
 
-    async def get_waiting_reports(self) -> Sequence[Report]:
-        reports = await self._session.execute(select(Report).where(Report.status == Report.Status.WAITING))
-        return reports.scalars().all()
+    async def set_status_to_waiting_reports(self, status: Report.Status) -> list[UUID]:
+        """Установить статус всем отчетам со статусом waiting."""
+        return await self.bulk_update(Report.status == Report.Status.WAITING, status=status)
+
+    async def decline_unreviewed_reports(self, shift_id: UUID) -> list[UUID]:
+        """Отклонить непроверенные отчеты активных участников смены."""
+        return await self.bulk_update(
+            Report.shift_id == shift_id,
+            Report.status == Report.Status.REVIEWING,
+            Report.member_id.in_(
+                select(Member.id).where(Member.shift_id == shift_id, Member.status == Member.Status.ACTIVE)
+            ),
+            status=Report.Status.DECLINED,
+        )
 
-    async def set_status_to_reports(self, reports_list: Sequence[Report], status: Report.Status) -> None:
-        for report in reports_list:
-            report.status = status
-        self._session.add_all(reports_list)
-        await self._session.commit()
+    async def review_reports(
+        self, report_ids: list[UUID], status: Report.Status, administrator_id: UUID
+    ) -> list[Report]:
+        """Установить статус проверки отчетам одним запросом.
 
-    async def is_previous_report_not_submitted(self, member_id: UUID) -> bool:
-        """Проверить статус вчерашнего отчета по id участника смены."""
+        Изменяются только отчеты, ожидающие проверки. Возвращаются измененные отчеты.
+        """
+        reports = await self._session.scalars(
+            update(Report)
+            .where(Report.id.in_(report_ids), Report.status == Report.Status.REVIEWING)
+            .values(status=status, updated_by=administrator_id, reviewed_at=datetime.now())
+            .returning(Report)
+            .execution_options(synchronize_session=False)
+        )
+        reports = reports.all()
+        await self._session.flush()
+        return reports
+
+    async def get_statistics_data_version(self) -> int:
+        """Получить версию данных, по которым строится представление report_statistics.
+
+        Версию увеличивают триггеры БД при любом изменении отчётов, участников и признака тестового
+        пользователя, в том числе сделанном в обход сервисов приложения или в другом процессе.
+        """
+        return await self._session.scalar(select(ReportStatisticsVersion.version))
+
+    async def refresh_statistics(self) -> None:
+        """Пересчитать материализованное представление со статистикой отчётов."""
+        await self._session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY report_statistics"))
+
+    async def get_members_ids_with_previous_report_not_submitted(self, shift_id: UUID) -> set[UUID]:
+        """Получить id участников смены, у которых вчерашний отчет отклонен или пропущен."""
         yesterday = get_current_task_date() - timedelta(days=1)
-        exists_criteria = select(
-            exists(Report).where(
-                Report.member_id == member_id,
+        members_ids = await self._session.scalars(
+            select(Report.member_id).where(
+                Report.shift_id == shift_id,
                 Report.task_date == yesterday,
                 Report.status.in_([Report.Status.DECLINED, Report.Status.SKIPPED]),
             )
         )
-        report_exists = await self._session.execute(exists_criteria)
-        return report_exists.scalar()
+        return set(members_ids.all())
@@ -42,6 +42,14 @@ class RequestRepository(AbstractRepository):
         )
         return request.scalars().first()
 
+    async def decline_pending_requests(self, shift_id: UUID) -> list[UUID]:
+        """Отклонить все заявки на участие в смене, ожидающие рассмотрения."""
+        return await self.bulk_update(
+            Request.shift_id == shift_id,
+            Request.status == Request.Status.PENDING,
+            status=Request.Status.DECLINED,
+        )
+
     async def get_requests_list(self, status: Optional[Request.Status]) -> list[RequestDTO]:
         statement = select(
             Request.user_id,
@@ -1,4 +1,5 @@
 from datetime import date, timedelta
+from hashlib import sha256
 from typing import Optional
 from uuid import UUID
 
@@ -10,15 +11,36 @@ from sqlalchemy.orm import selectinload, subqueryload
 from src.api.request_models.shift import ShiftSortRequest
 from src.api.response_models.shift import ShiftDtoResponse
 from src.core import exceptions
+from src.core.cache import MISSING, TTLCache
 from src.core.db.db import get_session
 from src.core.db.DTO_models import ShiftAnalyticReportDto
-from src.core.db.models import Member, Report, Request, Shift, Task, User
+from src.core.db.models import (
+    Member,
+    Report,
+    Request,
+    Shift,
+    Task,
+    User,
+    report_statistics,
+)
 from src.core.db.repository import AbstractRepository
+from src.core.db.repository.member_repository import balance_cache
+from src.core.db.repository.user_repository import user_identity_cache
 from src.core.settings import settings
 
+STARTED_SHIFT_CACHE_KEY = "started_shift"
+OPEN_FOR_REGISTRATION_SHIFT_ID_CACHE_KEY = "open_for_registration_shift_id"
+SEQUENCE_NUMBER_CACHE_KEY = "sequence_number"
+
+shift_cache = TTLCache(settings.SHIFT_CACHE_TTL, expire_at_midnight=True)
+
 
 class ShiftRepository(AbstractRepository):
-    """Репозиторий для работы с моделью Shift."""
+    """Репозиторий для работы с моделью Shift.
+
+    Текущая смена, смена, открытая для регистрации, и номера смен запрашиваются почти при каждом
+    обращении к боту, поэтому хранятся в кэше. После изменения смен кэш нужно сбросить (invalidate_cache).
+    """
 
     def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
         super().__init__(session, Shift)
@@ -93,18 +115,33 @@ class ShiftRepository(AbstractRepository):
         shifts = await self._session.execute(shifts)
         return shifts.all()
 
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Сбрасывает закэшированные текущую смену и смену, открытую для регистрации.
+
+        Вместе с текущей сменой меняются текущие участники смен, поэтому сбрасываются и кэши
+        пользователей и балансов ломбарьерчиков.
+        """
+        shift_cache.invalidate(STARTED_SHIFT_CACHE_KEY)
+        shift_cache.invalidate(OPEN_FOR_REGISTRATION_SHIFT_ID_CACHE_KEY)
+        user_identity_cache.clear()
+        balance_cache.clear()
+
     async def get_open_for_registration_shift_id(self) -> UUID:
-        can_be_added_to_active_shift = (
-            Shift.started_at + timedelta(days=settings.DAYS_FROM_START_OF_SHIFT_TO_JOIN) >= date.today()
-        )
-        statement = select(Shift.id).where(
-            or_(
-                and_(Shift.status == Shift.Status.STARTED, can_be_added_to_active_shift),
-                Shift.status == Shift.Status.PREPARING,
-            ),
-        )
-        shift_id = await self._session.execute(statement)
-        shift_id = shift_id.scalars().first()
+        shift_id = shift_cache.get(OPEN_FOR_REGISTRATION_SHIFT_ID_CACHE_KEY)
+        if shift_id is MISSING:
+            can_be_added_to_active_shift = (
+                Shift.started_at + timedelta(days=settings.DAYS_FROM_START_OF_SHIFT_TO_JOIN) >= date.today()
+            )
+            statement = select(Shift.id).where(
+                or_(
+                    and_(Shift.status == Shift.Status.STARTED, can_be_added_to_active_shift),
+                    Shift.status == Shift.Status.PREPARING,
+                ),
+            )
+            shift_id = await self._session.execute(statement)
+            shift_id = shift_id.scalars().first()
+            shift_cache.set(OPEN_FOR_REGISTRATION_SHIFT_ID_CACHE_KEY, shift_id)
         if not shift_id:
             raise exceptions.RegistrationForbiddenError
         return shift_id
@@ -114,25 +151,47 @@ class ShiftRepository(AbstractRepository):
         statement = select(Shift).where(Shift.status == status)
         return (await self._session.scalars(statement)).first()
 
-    async def get_shift_with_request(self, id: UUID) -> Shift:
-        """Получить смену (Shift) по её id вместе со связанными данными.
-
-        Связанные данные: Shift -> Request.
+    async def get_started_shift_or_none(self) -> Optional[Shift]:
+        """Возвращает начатую смену. Смена берётся из кэша и присоединяется к текущей сессии без запроса к БД."""
+        shift_state = shift_cache.get(STARTED_SHIFT_CACHE_KEY)
+        if shift_state is MISSING:
+            shift = await self.get_shift_with_status_or_none(Shift.Status.STARTED)
+            shift_state = self._to_cache_state(shift) if shift else None
+            shift_cache.set(STARTED_SHIFT_CACHE_KEY, shift_state)
+        if shift_state is None:
+            return None
+        return await self._from_cache_state(shift_state)
 
-        Аргументы:
-            id (UUID) - id смены (shift)
-        """
-        statement = select(Shift).where(Shift.id == id).options(selectinload(Shift.requests))
-        request = await self._session.execute(statement)
-        request = request.scalars().first()
-        if request is None:
-            raise exceptions.ObjectNotFoundError(Shift, id)
-        return request
+    async def get_sequence_number(self, shift_id: UUID) -> int:
+        """Возвращает номер смены. Номер смены не меняется, поэтому хранится в кэше."""
+        sequence_number = shift_cache.get((SEQUENCE_NUMBER_CACHE_KEY, shift_id))
+        if sequence_number is MISSING:
+            sequence_number = await self._session.scalar(select(Shift.sequence_number).where(Shift.id == shift_id))
+            if sequence_number is None:
+                raise exceptions.ObjectNotFoundError(Shift, shift_id)
+            shift_cache.set((SEQUENCE_NUMBER_CACHE_KEY, shift_id), sequence_number)
+        return sequence_number
 
     async def check_shift_existence(self, shift_id: UUID) -> bool:
         shift_exists = await self._session.execute(select(select(Shift).where(Shift.id == shift_id).exists()))
         return shift_exists.scalar()
 
+    async def get_report_data_version(self, shift_id: UUID) -> str:
+        """Версия данных отчёта по смене: меняется при любом изменении смены, её отчётов или заданий."""
+        tasks_updated_at = (
+            select(func.max(Task.updated_at))
+            .where(Task.id.in_(select(Report.task_id).where(Report.shift_id == shift_id)))
+            .scalar_subquery()
+        )
+        statement = (
+            select(Shift.updated_at, func.max(Report.updated_at), func.count(Report.id), tasks_updated_at)
+            .outerjoin(Report, Report.shift_id == Shift.id)
+            .where(Shift.id == shift_id)
+            .group_by(Shift.id)
+        )
+        version = await self._session.execute(statement)
+        return sha256(str(version.one()).encode()).hexdigest()
+
     async def get_with_members_with_reviewed_reports(self, shift_id: UUID) -> Shift:
         """Возвращает смену с активными участниками, у которых все задания проверены."""
         members_id = (
@@ -154,8 +213,8 @@ class ShiftRepository(AbstractRepository):
         )
         return shift.scalars().first()
 
-    async def get_with_members_and_unreviewed_reports(self, shift_id: UUID) -> Shift:
-        """Возвращает смену с активными участниками и их непроверенными заданиями."""
+    async def get_with_members_with_unreviewed_reports(self, shift_id: UUID) -> Shift:
+        """Возвращает смену с активными участниками, у которых есть непроверенные задания."""
         members_id = (
             select(Member.id)
             .join(Report)
@@ -170,12 +229,7 @@ class ShiftRepository(AbstractRepository):
         )
         member_stmt = Shift.members.and_(Member.id.in_(members_id))
         shift = await self._session.execute(
-            select(Shift)
-            .where(Shift.id == shift_id)
-            .options(subqueryload(member_stmt).subqueryload(Member.user))
-            .options(
-                subqueryload(member_stmt).subqueryload(Member.reports.and_(Report.status == Report.Status.REVIEWING))
-            )
+            select(Shift).where(Shift.id == shift_id).options(subqueryload(member_stmt).subqueryload(Member.user))
         )
         return shift.scalars().first()
 
@@ -205,36 +259,69 @@ class ShiftRepository(AbstractRepository):
         )
         return await self._session.scalar(statement)
 
-    async def get_shift_statistics_report_by_id(self, shift_id: UUID):
+    async def get_shift_statistics_report_by_id(self, shift_id: UUID) -> list[ShiftAnalyticReportDto]:
         """Отчёт по задачам из выбранной смены.
 
         Содержит:
         - список всех задач;
         - количество отчетов принятых с 1-й/2-й/3-й попытки;
         - общее количество принятых/отклонённых/не предоставленных отчётов по каждому заданию.
+
+        Статистика берётся из материализованного представления report_statistics.
         """
         stmt = (
             select(
                 Task.sequence_number,
                 Task.title,
-                func.count().filter(Report.number_attempt == 0).label('approved_from_1_attempt'),
-                func.count().filter(Report.number_attempt == 1).label('approved_from_2_attempt'),
-                func.count().filter(Report.number_attempt == 2).label('approved_from_3_attempt'),
-                func.count().filter(Report.status == Report.Status.APPROVED).label(Report.Status.APPROVED),
-                func.count().filter(Report.status == Report.Status.DECLINED).label(Report.Status.DECLINED),
-                func.count().filter(Report.status == Report.Status.SKIPPED).label(Report.Status.SKIPPED),
-                func.count().label('reports_total'),
+                report_statistics.c.approved_from_1_attempt,
+                report_statistics.c.approved_from_2_attempt,
+                report_statistics.c.approved_from_3_attempt,
+                report_statistics.c.approved,
+                report_statistics.c.declined,
+                report_statistics.c.skipped,
+                report_statistics.c.reports_total,
             )
-            .where(Report.shift_id == shift_id)
-            .join(Task.reports)
-            .join(Report.member)
-            .join(Member.user)
-            .where(Member.user.has(User.is_test_user == False))  # noqa
-            .group_by(Task.title, Task.sequence_number)
+            .join(report_statistics, report_statistics.c.task_id == Task.id)
+            .where(report_statistics.c.shift_id == shift_id)
             .order_by(Task.sequence_number)
         )
         reports = await self._session.execute(stmt)
-        return tuple(ShiftAnalyticReportDto(*report) for report in reports.all())
+        return [ShiftAnalyticReportDto(*report) for report in reports]
+
+    async def get_shifts_for_report(self) -> list[Shift]:
+        """Начатые и завершённые смены, по которым формируется полный отчёт, в порядке номеров смен."""
+        stmt = (
+            select(Shift)
+            .where(Shift.status.in_((Shift.Status.STARTED, Shift.Status.READY_FOR_COMPLETE, Shift.Status.FINISHED)))
+            .order_by(Shift.sequence_number)
+        )
+        shifts = await self._session.scalars(stmt)
+        return shifts.all()
+
+    async def get_shifts_statistics_report(self) -> list[tuple[UUID, ShiftAnalyticReportDto]]:
+        """Отчёт по задачам сразу для всех смен одним запросом.
+
+        Строки возвращаются вместе с id смены, упорядоченные по сменам и номерам задач.
+        Статистика берётся из материализованного представления report_statistics.
+        """
+        stmt = (
+            select(
+                report_statistics.c.shift_id,
+                Task.sequence_number,
+                Task.title,
+                report_statistics.c.approved_from_1_attempt,
+                report_statistics.c.approved_from_2_attempt,
+                report_statistics.c.approved_from_3_attempt,
+                report_statistics.c.approved,
+                report_statistics.c.declined,
+                report_statistics.c.skipped,
+                report_statistics.c.reports_total,
+            )
+            .join(report_statistics, report_statistics.c.task_id == Task.id)
+            .order_by(report_statistics.c.shift_id, Task.sequence_number)
+        )
+        reports = await self._session.execute(stmt)
+        return [(shift_id, ShiftAnalyticReportDto(*report)) for shift_id, *report in reports]
 
     async def get_all_reports_of_member(self, shift_id: UUID, member_id: UUID) -> list[Report]:
         stmt = (
@@ -1,47 +1,80 @@
+from typing import Iterable
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import func, select
+from sqlalchemy import Integer, cast, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import MISSING, TTLCache
 from src.core.db.db import get_session
 from src.core.db.DTO_models import TasksAnalyticReportDto
-from src.core.db.models import Report, Task, User, Member
+from src.core.db.models import Task, report_statistics
 from src.core.db.repository import AbstractRepository
+from src.core.settings import settings
+
+task_cache = TTLCache(settings.TASK_CACHE_TTL)
 
 
 class TaskRepository(AbstractRepository):
-    """Репозиторий для работы с моделью Task."""
+    """Репозиторий для работы с моделью Task.
+
+    Задания меняются редко, поэтому задания смен хранятся в кэше по id.
+    После изменения задания кэш нужно сбросить (invalidate_cache).
+    """
 
     def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
         super().__init__(session, Task)
 
+    @staticmethod
+    def invalidate_cache(task_id: UUID) -> None:
+        """Удаляет задание из кэша."""
+        task_cache.invalidate(task_id)
+
+    async def get_many_cached(self, task_ids: Iterable[UUID]) -> dict[UUID, Task]:
+        """Возвращает задания по id. Задания берутся из кэша, недостающие загружаются одним запросом."""
+        task_states = {task_id: task_cache.get(task_id) for task_id in set(task_ids)}
+        missing_task_ids = [task_id for task_id, task_state in task_states.items() if task_state is MISSING]
+        if missing_task_ids:
+            tasks = await self._session.scalars(select(Task).where(Task.id.in_(missing_task_ids)))
+            for task in tasks:
+                task_states[task.id] = self._to_cache_state(task)
+                task_cache.set(task.id, task_states[task.id])
+        return {
+            task_id: await self._from_cache_state(task_state)
+            for task_id, task_state in task_states.items()
+            if task_state is not MISSING
+        }
+
     async def get_task_ids_list(self) -> list[UUID]:
         """Список task_id неархивированных заданий."""
         task_ids = await self._session.execute(select(Task.id).where(Task.is_archived.is_(False)))
         return task_ids.scalars().all()
 
-    async def get_tasks_statistics_report(self) -> tuple[TasksAnalyticReportDto]:
+    async def set_telegram_file_id(self, task_id: UUID, telegram_file_id: str | None) -> None:
+        """Сохраняет file_id фото задания, загруженного в Telegram."""
+        await self._session.execute(update(Task).where(Task.id == task_id).values(telegram_file_id=telegram_file_id))
+        await self._session.flush()
+
+    async def get_tasks_statistics_report(self) -> list[TasksAnalyticReportDto]:
         """Отчёт по задачам со всех смен.
 
         Содержит:
         - список всех задач;
         - общее количество принятых/отклонённых/не предоставленных отчётов по каждому заданию.
+
+        Статистика берётся из материализованного представления report_statistics.
         """
         stmt = (
             select(
                 Task.sequence_number,
                 Task.title,
-                func.count().filter(Report.status == Report.Status.APPROVED).label(Report.Status.APPROVED),
-                func.count().filter(Report.status == Report.Status.DECLINED).label(Report.Status.DECLINED),
-                func.count().filter(Report.status == Report.Status.SKIPPED).label(Report.Status.SKIPPED),
+                cast(func.sum(report_statistics.c.approved), Integer),
+                cast(func.sum(report_statistics.c.declined), Integer),
+                cast(func.sum(report_statistics.c.skipped), Integer),
             )
-            .join(Task.reports)
-            .join(Report.member)
-            .join(Member.user)
-            .where(Member.user.has(User.is_test_user == False))  # noqa
+            .join(report_statistics, report_statistics.c.task_id == Task.id)
             .group_by(Task.id, Task.sequence_number)
             .order_by(Task.sequence_number)
         )
         tasks = await self._session.execute(stmt)
-        return tuple(TasksAnalyticReportDto(*task) for task in tasks.all())
+        return [TasksAnalyticReportDto(*task) for task in tasks]
@@ -6,14 +6,24 @@ from sqlalchemy import asc, case, desc, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.request_models.user import UserDescAscSortRequest, UserFieldSortRequest
+from src.core.cache import MISSING, TTLCache
 from src.core.db.db import get_session
-from src.core.db.DTO_models import ShiftByUserWithReportSummaryDto
+from src.core.db.DTO_models import ShiftByUserWithReportSummaryDto, UserIdentityDto
 from src.core.db.models import Member, Report, Request, Shift, User
 from src.core.db.repository import AbstractRepository
+from src.core.settings import settings
+
+user_identity_cache = TTLCache(
+    settings.USER_IDENTITY_CACHE_TTL, expire_at_midnight=True, maxsize=settings.USER_IDENTITY_CACHE_SIZE
+)
 
 
 class UserRepository(AbstractRepository):
-    """Репозиторий для работы с моделью User."""
+    """Репозиторий для работы с моделью User.
+
+    Обработчики бота по telegram_id получают из кэша id пользователя и текущего участника смены.
+    После изменения пользователя или его участия в сменах кэш нужно сбросить (invalidate_identity).
+    """
 
     def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
         super().__init__(session, User)
@@ -55,6 +65,37 @@ class UserRepository(AbstractRepository):
         user = await self._session.execute(select(User).where(User.telegram_id == telegram_id))
         return user.scalars().first()
 
+    @staticmethod
+    def invalidate_identity(telegram_id: int) -> None:
+        """Удаляет пользователя из кэша."""
+        user_identity_cache.invalidate(telegram_id)
+
+    async def get_identity_by_telegram_id(self, telegram_id: int) -> Optional[UserIdentityDto]:
+        """Возвращает id пользователя, признак блокировки бота и участника текущей смены.
+
+        Текущей считается последняя начатая смена или смена, ожидающая проверки отчётов.
+        Результат хранится в кэше, в том числе для незарегистрированных пользователей.
+        """
+        identity = user_identity_cache.get(telegram_id)
+        if identity is MISSING:
+            current_member = (
+                select(Member.id, Member.user_id, Member.shift_id, Shift.started_at)
+                .join(Member.shift)
+                .where(Shift.status.in_((Shift.Status.STARTED, Shift.Status.READY_FOR_COMPLETE)))
+                .subquery()
+            )
+            statement = (
+                select(User.id, User.telegram_blocked, current_member.c.id, current_member.c.shift_id)
+                .outerjoin(current_member, current_member.c.user_id == User.id)
+                .where(User.telegram_id == telegram_id)
+                .order_by(current_member.c.started_at.desc().nulls_last())
+                .limit(1)
+            )
+            identity = (await self._session.execute(statement)).first()
+            identity = UserIdentityDto(*identity) if identity else None
+            user_identity_cache.set(telegram_id, identity)
+        return identity
+
     async def check_user_existence(self, telegram_id: int, phone_number: str) -> bool:
         user_exists = await self._session.execute(
             select(
@@ -119,6 +160,14 @@ class UserRepository(AbstractRepository):
 
         return users.scalars().all()
 
+    async def decline_pending_users_by_shift_id(self, shift_id: UUID) -> list[UUID]:
+        """Отклонить пользователей, подавших заявку на участие в смене и ожидающих рассмотрения."""
+        return await self.bulk_update(
+            User.id.in_(select(Request.user_id).where(Request.shift_id == shift_id)),
+            User.status == User.Status.PENDING,
+            status=User.Status.DECLINED,
+        )
+
     async def get_test_users(self) -> list[User]:
         users = await self._session.execute(select(User).where(User.is_test_user == True))  # noqa
         return users.scalars().all()
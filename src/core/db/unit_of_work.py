@@ -0,0 +1,44 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db.db import get_session
+
+UNIT_OF_WORK_DEPTH = "unit_of_work_depth"
+
+
+class UnitOfWork:
+    """Единица работы с БД, общая для всех репозиториев одной сессии.
+
+    Репозитории только отправляют изменения в БД (flush), а транзакция фиксируется один раз
+    при выходе из внешнего блока `async with unit_of_work`. Вложенные блоки (когда один сервис
+    вызывает другой) транзакцию не фиксируют. При ошибке транзакция откатывается целиком.
+    Глубина вложенности хранится в самой сессии, поэтому все экземпляры UnitOfWork
+    одной сессии работают согласованно.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+        self.__session = session
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self.__session.info[UNIT_OF_WORK_DEPTH] = self.__session.info.get(UNIT_OF_WORK_DEPTH, 0) + 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.__session.info[UNIT_OF_WORK_DEPTH] -= 1
+        if self.__session.info[UNIT_OF_WORK_DEPTH]:
+            return
+        if exc_type is None:
+            await self.__session.commit()
+        else:
+            await self.__session.rollback()
+
+
+def require_unit_of_work(unit_of_work: UnitOfWork) -> UnitOfWork:
+    """Проверяет, что сервису передан UnitOfWork.
+
+    Вне FastAPI зависимости не внедряются, и без явно переданного UnitOfWork сервис
+    не смог бы зафиксировать изменения, поэтому такой сервис не создаётся.
+    """
+    if not isinstance(unit_of_work, UnitOfWork):
+        raise TypeError("Сервису, создаваемому вне FastAPI, необходимо явно передать UnitOfWork")
+    return unit_of_work
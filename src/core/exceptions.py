@@ -232,6 +232,36 @@ class InvalidDateFormatError(BadRequestError):
     detail = "Некорректный формат даты. Ожидаемый формат: YYYY-MM-DD."
 
 
+class PhotoDownloadQueueFullError(ApplicationError):
+    """Очередь загрузки фотоотчётов заполнена."""
+
+    detail = "Сейчас отправляется слишком много отчётов. Пожалуйста, отправь фотографию ещё раз через несколько минут."
+
+
+class PhotoDownloadStoppedError(ApplicationError):
+    """Загрузка фотоотчётов остановлена на время перезапуска бота."""
+
+    detail = "Бот перезапускается и не смог принять фотографию. Пожалуйста, отправь её ещё раз через несколько минут."
+
+
+class ReportRenderQueueFullError(ApplicationError):
+    status_code: HTTPStatus = HTTPStatus.SERVICE_UNAVAILABLE
+    detail = "Сейчас формируется слишком много отчётов. Попробуйте повторить запрос позже."
+
+
+class ExportJobNotReadyError(BadRequestError):
+    def __init__(self, status: str):
+        self.detail = "Файл отчёта недоступен, статус задания: {}.".format(status)
+
+
+class ExportShiftRequiredError(BadRequestError):
+    detail = "Для отчёта по смене необходимо указать id смены."
+
+
+class InvalidCursorError(BadRequestError):
+    detail = "Некорректный курсор для получения следующей страницы."
+
+
 class InvitationAlreadyRegisteredError(BadRequestError):
     detail = "Невозможно изменить состояние приглашения. Пользователь уже зарегистрирован."
 
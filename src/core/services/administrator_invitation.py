@@ -12,6 +12,7 @@ from src.core.db.repository import (
     AdministratorInvitationRepository,
     AdministratorRepository,
 )
+from src.core.db.unit_of_work import UnitOfWork, require_unit_of_work
 from src.core.settings import settings
 
 
@@ -20,9 +21,11 @@ class AdministratorInvitationService:
         self,
         administrator_mail_request_repository: AdministratorInvitationRepository = Depends(),
         administrator_repository: AdministratorRepository = Depends(),
+        unit_of_work: UnitOfWork = Depends(),
     ) -> None:
         self.__administrator_mail_request_repository = administrator_mail_request_repository
         self.__administrator_repository = administrator_repository
+        self.__unit_of_work = require_unit_of_work(unit_of_work)
 
     async def create_mail_request(self, invitation_data: AdministratorInvitationRequest) -> AdministratorInvitation:
         """Создает в БД приглашение для регистрации нового администратора/'эксперта'.
@@ -33,9 +36,10 @@ class AdministratorInvitationService:
         if await self.__administrator_repository.is_administrator_exists(invitation_data.email):
             raise exceptions.AdministratorAlreadyExistsError
         expiration_date = datetime.now() + settings.INVITE_LINK_EXPIRATION_TIME
-        return await self.__administrator_mail_request_repository.create(
-            AdministratorInvitation(**invitation_data.dict(), expired_datetime=expiration_date)
-        )
+        async with self.__unit_of_work:
+            return await self.__administrator_mail_request_repository.create(
+                AdministratorInvitation(**invitation_data.dict(), expired_datetime=expiration_date)
+            )
 
     async def get_invitation_by_token(self, token: UUID) -> AdministratorInvitation:
         return await self.__administrator_mail_request_repository.get_mail_request_by_token(token)
@@ -44,7 +48,8 @@ class AdministratorInvitationService:
         """Устанавливаем прошедшую дату в invitation.expired_datetime."""
         invitation = await self.__administrator_mail_request_repository.get_mail_request_by_token(token)
         invitation.expired_datetime = datetime.now() - settings.INVITE_LINK_EXPIRATION_TIME
-        await self.__administrator_mail_request_repository.update(invitation.id, invitation)
+        async with self.__unit_of_work:
+            await self.__administrator_mail_request_repository.update(invitation.id, invitation)
 
     async def list_all_invitations(self) -> list[AdministratorInvitation]:
         return await self.__administrator_mail_request_repository.get_all_invitations()
@@ -57,7 +62,8 @@ class AdministratorInvitationService:
         if invitation.expired_datetime < datetime.now():
             raise exceptions.InvitationAlreadyDeactivatedError
         invitation.expired_datetime = datetime.now() - settings.INVITE_LINK_EXPIRATION_TIME
-        return await self.__administrator_mail_request_repository.update(invitation_id, invitation)
+        async with self.__unit_of_work:
+            return await self.__administrator_mail_request_repository.update(invitation_id, invitation)
 
     async def reactivate_invitation(self, invitation_id: UUID) -> AdministratorInvitation:
         invitation = await self.get_invitation_by_id(invitation_id)
@@ -67,4 +73,5 @@ class AdministratorInvitationService:
             raise exceptions.InvitationAlreadyRegisteredError
         invitation.expired_datetime = datetime.now() + settings.INVITE_LINK_EXPIRATION_TIME
 
-        return await self.__administrator_mail_request_repository.update(invitation_id, invitation)
+        async with self.__unit_of_work:
+            return await self.__administrator_mail_request_repository.update(invitation_id, invitation)
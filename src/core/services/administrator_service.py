@@ -9,6 +9,7 @@ from src.api.request_models.administrator import (
 from src.core import exceptions
 from src.core.db.models import Administrator
 from src.core.db.repository import AdministratorRepository
+from src.core.db.unit_of_work import UnitOfWork, require_unit_of_work
 from src.core.email import EmailProvider
 from src.core.services.administrator_invitation import AdministratorInvitationService
 from src.core.services.authentication_service import AuthenticationService
@@ -21,10 +22,12 @@ class AdministratorService:
         administrator_repository: AdministratorRepository = Depends(),
         administrator_invitation_service: AdministratorInvitationService = Depends(),
         email: EmailProvider = Depends(),
+        unit_of_work: UnitOfWork = Depends(),
     ):
         self.__administrator_repository = administrator_repository
         self.__administrator_invitation_service = administrator_invitation_service
         self.__email = email
+        self.__unit_of_work = require_unit_of_work(unit_of_work)
 
     async def register_new_administrator(self, token: UUID, schema: AdministratorRegistrationRequest) -> Administrator:
         """Регистрация нового администратора."""
@@ -33,12 +36,13 @@ class AdministratorService:
             name=schema.name,
             surname=schema.surname,
             email=invitation.email,
-            hashed_password=AuthenticationService.get_hashed_password(schema.password.get_secret_value()),
+            hashed_password=await AuthenticationService.get_hashed_password(schema.password.get_secret_value()),
             status=Administrator.Status.ACTIVE,
             role=Administrator.Role.EXPERT,
         )
-        administrator = await self.__administrator_repository.create(administrator)
-        await self.__administrator_invitation_service.close_invitation(token)
+        async with self.__unit_of_work:
+            administrator = await self.__administrator_repository.create(administrator)
+            await self.__administrator_invitation_service.close_invitation(token)
         return administrator  # noqa: R504
 
     async def get_administrators_filter_by_role_and_status(
@@ -64,10 +68,11 @@ class AdministratorService:
 
     async def __set_new_password(self, password: str, email: str) -> Administrator:
         """Хэширует пароль, сохраняет его в БД, возвращает объект Administrator с обновленными данными."""
-        hashed_password = AuthenticationService.get_hashed_password(password)
+        hashed_password = await AuthenticationService.get_hashed_password(password)
         administrator = await self.__administrator_repository.get_by_email(email)
         instance = Administrator(hashed_password=hashed_password)
-        return await self.__administrator_repository.update(administrator.id, instance)
+        async with self.__unit_of_work:
+            return await self.__administrator_repository.update(administrator.id, instance)
 
     async def change_administrator_status(
         self, administrator_id: UUID, status: Administrator.Status, changer_token: str
@@ -82,7 +87,10 @@ class AdministratorService:
 
         administrator.status = status
 
-        return await self.__administrator_repository.update(administrator.id, administrator)
+        async with self.__unit_of_work:
+            administrator = await self.__administrator_repository.update(administrator.id, administrator)
+        await self.__administrator_repository.invalidate_identity(administrator.email)
+        return administrator
 
     async def change_administrator_role(
         self, administrator_id: UUID, role: Administrator.Role, changer_token: str
@@ -97,7 +105,10 @@ class AdministratorService:
 
         administrator.role = role
 
-        return await self.__administrator_repository.update(administrator.id, administrator)
+        async with self.__unit_of_work:
+            administrator = await self.__administrator_repository.update(administrator.id, administrator)
+        await self.__administrator_repository.invalidate_identity(administrator.email)
+        return administrator
 
     async def get_by_id(self, administrator_id: UUID) -> Administrator:
         """Возвращает сущность администратора по id."""
@@ -109,4 +120,5 @@ class AdministratorService:
         administrator = await self.__administrator_repository.get(administrator_id)
         administrator.name = schema.name
         administrator.surname = schema.surname
-        return await self.__administrator_repository.update(administrator_id, administrator)
+        async with self.__unit_of_work:
+            return await self.__administrator_repository.update(administrator_id, administrator)
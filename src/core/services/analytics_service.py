@@ -1,50 +1,55 @@
+import asyncio
+from collections import defaultdict
 from datetime import date
-from io import BytesIO
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
 from urllib.parse import quote_plus
 from uuid import UUID
 
 from fastapi import Depends
-from openpyxl import Workbook
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.db.db import get_session_context
+from src.core.db.models import ExportJob, Shift
+from src.core.db.repository.member_repository import MemberRepository
 from src.core.db.repository.shift_repository import ShiftRepository
 from src.core.db.repository.task_repository import TaskRepository
-from src.excel_generator.builder import AnalyticReportBuilder
+from src.excel_generator.builder import AnalyticReportSheet
+from src.excel_generator.member_builder import MemberAnalyticReportSettings
+from src.excel_generator.renderer import report_renderer
 from src.excel_generator.shift_builder import ShiftAnalyticReportSettings
 from src.excel_generator.task_builder import TaskAnalyticReportSettings
 
+T = TypeVar("T")
+
+
+async def fetch_in_new_session(query: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """Выполнить запрос в отдельной сессии, чтобы независимые запросы шли параллельно по разным соединениям с БД."""
+    async with get_session_context() as session:
+        return await query(session)
+
 
 class AnalyticsService:
-    """Сервис для получения отчётов."""
+    """Сервис для получения отчётов.
+
+    Данные для отчётов получаются из БД, а сам файл отчёта формируется в пуле процессов.
+    """
 
     def __init__(
         self,
         task_repository: TaskRepository = Depends(),
         shift_repository: ShiftRepository = Depends(),
-        task_report_builder: AnalyticReportBuilder = Depends(),
     ) -> None:
-        self.__task_report_builder = task_report_builder
         self.__task_repository = task_repository
         self.__shift_repository = shift_repository
 
     @staticmethod
-    async def __generate_task_report_description() -> str:
+    def __generate_task_report_description() -> str:
         """Генерация описания к отчёту с заданиями."""
         return f"Отчёт по задачам\nдата формирования отчёта: {date.today().strftime('%d.%m.%Y')}"
 
-    async def __generate_task_report(self, workbook: Workbook) -> None:
-        """Генерация отчёта с заданиями."""
-        tasks_statistic = await self.__task_repository.get_tasks_statistics_report()
-        description = await self.__generate_task_report_description()
-        await self.__task_report_builder.generate_report(
-            description,
-            tasks_statistic,
-            workbook=workbook,
-            analytic_task_report_full=TaskAnalyticReportSettings,
-        )
-
-    async def __generate_shift_report_description(self, shift_id: UUID) -> str:
-        """Генерация описания к отчёту по выбранной смене."""
-        shift = await self.__shift_repository.get(shift_id)
+    @staticmethod
+    def __generate_shift_report_description(shift: Shift) -> str:
+        """Генерация описания к отчёту по смене."""
         return (
             f"Отчёт по смене №{shift.sequence_number} ({shift.title})\n"
             f"дата старта: {shift.started_at.strftime('%d.%m.%Y')}\n"
@@ -52,39 +57,84 @@ class AnalyticsService:
             f"дата формирования отчёта: {date.today().strftime('%d.%m.%Y')}"
         )
 
-    async def __generate_report_for_shift(self, workbook: Workbook, shift_id: UUID) -> None:
-        """Генерация отчёта по выбранной смене."""
-        shift_statistic = await self.__shift_repository.get_shift_statistics_report_by_id(shift_id)
-        description = await self.__generate_shift_report_description(shift_id)
-        await self.__task_report_builder.generate_report(
-            description,
-            shift_statistic,
-            workbook=workbook,
-            analytic_task_report_full=ShiftAnalyticReportSettings,
+    @staticmethod
+    def __generate_member_report_description() -> str:
+        """Генерация описания к сводному отчёту по участникам."""
+        return f"Сводный отчёт по участникам смен\nдата формирования отчёта: {date.today().strftime('%d.%m.%Y')}"
+
+    async def __generate_task_report(self) -> AnalyticReportSheet:
+        """Генерация листа отчёта с заданиями."""
+        tasks_statistic = await self.__task_repository.get_tasks_statistics_report()
+        return AnalyticReportSheet(
+            self.__generate_task_report_description(), tasks_statistic, TaskAnalyticReportSettings
         )
 
-    async def generate_full_report(self) -> BytesIO:
+    async def __generate_report_for_shift(self, shift: Shift) -> AnalyticReportSheet:
+        """Генерация листа отчёта по выбранной смене."""
+        shift_statistic = await self.__shift_repository.get_shift_statistics_report_by_id(shift.id)
+        return AnalyticReportSheet(
+            self.__generate_shift_report_description(shift), shift_statistic, ShiftAnalyticReportSettings
+        )
+
+    async def __generate_full_report(self) -> tuple[AnalyticReportSheet]:
+        """Генерация листов полного отчёта: задачи, отдельный лист для каждой смены и сводка по участникам.
+
+        Все данные получаются четырьмя независимыми запросами, которые выполняются одновременно
+        в отдельных сессиях. Статистика всех смен получается одним запросом и разбивается по листам.
+        """
+        tasks_statistic, shifts, shifts_statistic, members_statistic = await asyncio.gather(
+            fetch_in_new_session(lambda session: TaskRepository(session).get_tasks_statistics_report()),
+            fetch_in_new_session(lambda session: ShiftRepository(session).get_shifts_for_report()),
+            fetch_in_new_session(lambda session: ShiftRepository(session).get_shifts_statistics_report()),
+            fetch_in_new_session(lambda session: MemberRepository(session).get_members_statistics_report()),
+        )
+        statistic_by_shift = defaultdict(list)
+        for shift_id, task_statistic in shifts_statistic:
+            statistic_by_shift[shift_id].append(task_statistic)
+        shift_sheets = tuple(
+            AnalyticReportSheet(
+                self.__generate_shift_report_description(shift),
+                statistic_by_shift[shift.id],
+                ShiftAnalyticReportSettings,
+                sheet_name=f"Смена №{shift.sequence_number}",
+            )
+            for shift in shifts
+        )
+        return (
+            AnalyticReportSheet(self.__generate_task_report_description(), tasks_statistic, TaskAnalyticReportSettings),
+            *shift_sheets,
+            AnalyticReportSheet(
+                self.__generate_member_report_description(), members_statistic, MemberAnalyticReportSettings
+            ),
+        )
+
+    async def get_report_sheets(
+        self, report_type: ExportJob.ReportType, shift_id: UUID | None = None
+    ) -> tuple[AnalyticReportSheet]:
+        """Получение данных листов отчёта указанного типа."""
+        if report_type is ExportJob.ReportType.SHIFT:
+            return (await self.__generate_report_for_shift(await self.__shift_repository.get(shift_id)),)
+        if report_type is ExportJob.ReportType.TASKS:
+            return (await self.__generate_task_report(),)
+        return await self.__generate_full_report()
+
+    async def generate_full_report(self) -> AsyncIterator[bytes]:
         """Генерация полного отчёта."""
-        workbook = self.__task_report_builder.create_workbook()
-        await self.__generate_task_report(workbook)
-        await self.__generate_task_report(workbook)
-        return await self.__task_report_builder.get_report_response(workbook)
+        return await report_renderer.render(await self.get_report_sheets(ExportJob.ReportType.FULL))
 
-    async def generate_task_report(self) -> BytesIO:
+    async def generate_task_report(self) -> AsyncIterator[bytes]:
         """Генерация отчёта с заданиями."""
-        workbook = self.__task_report_builder.create_workbook()
-        await self.__generate_task_report(workbook)
-        return await self.__task_report_builder.get_report_response(workbook)
+        return await report_renderer.render(await self.get_report_sheets(ExportJob.ReportType.TASKS))
 
-    async def generate_report_for_shift(self, shift_id: UUID) -> BytesIO:
-        """Генерация отчёта по выбранной смене."""
-        workbook = self.__task_report_builder.create_workbook()
-        await self.__generate_report_for_shift(workbook, shift_id)
-        return await self.__task_report_builder.get_report_response(workbook)
+    async def generate_report_for_shift(self, shift_id: UUID) -> tuple[str, AsyncIterator[bytes]]:
+        """Генерация отчёта по выбранной смене. Возвращает название файла и содержимое отчёта."""
+        shift = await self.__shift_repository.get(shift_id)
+        report = await report_renderer.render((await self.__generate_report_for_shift(shift),))
+        return self.get_shift_report_filename(shift), report
 
-    async def generate_shift_report_filename(self, shift_id: UUID) -> str:
+    @staticmethod
+    def get_shift_report_filename(shift: Shift) -> str:
         """Генерация названия файла отчета по смене."""
-        shift = await self.__shift_repository.get(shift_id)
         shift_name = shift.title.replace(' ', '_').replace('.', '')
         filename = f"Отчёт_по_смене_№{shift.sequence_number}_{shift_name}_{date.today().strftime('%d-%m-%Y')}.xlsx"
         return quote_plus(filename)
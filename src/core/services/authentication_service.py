@@ -3,16 +3,16 @@ import datetime as dt
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from src.api.request_models.administrator import AdministratorAuthenticateRequest
 from src.core import exceptions
-from src.core.db.DTO_models import AdministratorAndTokensDTO
+from src.core.db.DTO_models import AdministratorAndTokensDTO, AdministratorIdentityDto
 from src.core.db.models import Administrator
 from src.core.db.repository import AdministratorRepository
+from src.core.db.unit_of_work import UnitOfWork, require_unit_of_work
+from src.core.services.password_hasher import password_hasher
 from src.core.settings import settings
 
-PASSWORD_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto")
 OAUTH2_SCHEME = OAuth2PasswordBearer(tokenUrl="/administrators/login", scheme_name="JWT")
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
@@ -21,13 +21,16 @@ ALGORITHM = "HS256"
 
 
 class AuthenticationService:
-    def __init__(self, administrator_repository: AdministratorRepository = Depends()):
+    def __init__(
+        self, administrator_repository: AdministratorRepository = Depends(), unit_of_work: UnitOfWork = Depends()
+    ):
         self.__administrator_repository = administrator_repository
+        self.__unit_of_work = require_unit_of_work(unit_of_work)
 
     @staticmethod
-    def get_hashed_password(password: str) -> str:
-        """Получить хэш пароля."""
-        return PASSWORD_CONTEXT.hash(password)
+    async def get_hashed_password(password: str) -> str:
+        """Получить хэш пароля. Хэш вычисляется в пуле потоков, не блокируя цикл событий."""
+        return await password_hasher.hash(password)
 
     @staticmethod
     def get_email_from_token(token: str) -> str:
@@ -41,9 +44,9 @@ class AuthenticationService:
             raise exceptions.UnauthorizedError
         return email
 
-    def __verify_hashed_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Сравнить открытый пароль с хэшем."""
-        return PASSWORD_CONTEXT.verify(plain_password, hashed_password)
+    async def __verify_hashed_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Сравнить открытый пароль с хэшем. Проверка выполняется в пуле потоков, не блокируя цикл событий."""
+        return await password_hasher.verify(plain_password, hashed_password)
 
     def __create_jwt_token(self, email: str, expires_delta: int) -> str:
         """Создать jwt-токен.
@@ -62,7 +65,7 @@ class AuthenticationService:
         if administrator.status == Administrator.Status.BLOCKED:
             raise exceptions.AdministratorBlockedError
         password = auth_data.password.get_secret_value()
-        if not self.__verify_hashed_password(password, administrator.hashed_password):
+        if not await self.__verify_hashed_password(password, administrator.hashed_password):
             raise exceptions.InvalidAuthenticationDataError
         return administrator
 
@@ -70,7 +73,8 @@ class AuthenticationService:
         """Получить refresh- и access- токены и информацию об администраторе."""
         administrator = await self.__authenticate_administrator(auth_data)
         administrator.last_login_at = dt.datetime.now()
-        await self.__administrator_repository.update(administrator.id, administrator)
+        async with self.__unit_of_work:
+            await self.__administrator_repository.update(administrator.id, administrator)
         return AdministratorAndTokensDTO(
             access_token=self.__create_jwt_token(administrator.email, ACCESS_TOKEN_EXPIRE_MINUTES),
             refresh_token=self.__create_jwt_token(administrator.email, REFRESH_TOKEN_EXPIRE_MINUTES),
@@ -99,9 +103,12 @@ class AuthenticationService:
 
         email = self.get_email_from_token(token.credentials)
 
-        administrator_exists = await self.__administrator_repository.is_administrator_exists(email, role)
+        try:
+            administrator = await self.__administrator_repository.get_identity_by_email(email)
+        except exceptions.AdministratorNotFoundError:
+            raise exceptions.ForbiddenError
 
-        if not administrator_exists:
+        if role is not None and administrator.role != role:
             raise exceptions.ForbiddenError
 
     async def get_current_active_administrator(self, token: str) -> Administrator:
@@ -112,6 +119,17 @@ class AuthenticationService:
             raise exceptions.AdministratorBlockedError
         return administrator
 
+    async def get_current_active_administrator_identity(self, token: str) -> AdministratorIdentityDto:
+        """Получить id, роль и статус текущего активного администратора, используя токен.
+
+        В отличие от get_current_active_administrator данные берутся из кэша.
+        """
+        email = self.get_email_from_token(token)
+        administrator = await self.__administrator_repository.get_identity_by_email(email)
+        if administrator.status == Administrator.Status.BLOCKED:
+            raise exceptions.AdministratorBlockedError
+        return administrator
+
     async def refresh(self, refresh_token: str | None) -> AdministratorAndTokensDTO:
         """Получить новую пару refresh- и access- токенов и информацию об администраторе."""
         if not refresh_token:
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from datetime import datetime
+from uuid import UUID
+
+from src.core.db.db import get_session_context
+from src.core.db.models import ExportJob
+from src.core.db.repository import ExportJobRepository, ShiftRepository, TaskRepository
+from src.core.services.analytics_service import AnalyticsService
+from src.core.services.report_statistics_refresher import report_statistics_refresher
+from src.core.settings import settings
+from src.excel_generator.renderer import report_renderer
+
+
+class ExportJobRunner:
+    """Фоновый обработчик заданий на формирование отчётов.
+
+    Задания выполняются по очереди ограниченным числом обработчиков, файл отчёта формируется
+    в пуле процессов и сохраняется в EXPORTS_DIR. Задания, прерванные остановкой приложения,
+    снова ставятся в очередь при следующем запуске. Файлы отчётов, кроме кэша отчётов
+    по завершённым сменам, удаляются по истечении EXPORT_FILE_LIFETIME.
+    """
+
+    def __init__(self, workers_count: int = settings.EXPORT_JOB_WORKERS) -> None:
+        self.__workers_count = workers_count
+        self.__tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Запустить обработчики заданий."""
+        if self.__tasks:
+            return
+        settings.EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        self.__queue: asyncio.Queue[UUID] = asyncio.Queue()
+        async with get_session_context(transaction=True) as session:
+            job_ids = await ExportJobRepository(session).requeue_unfinished()
+        for job_id in job_ids:
+            self.__queue.put_nowait(job_id)
+        self.__tasks = [asyncio.create_task(self.__remove_expired_files())]
+        self.__tasks += [asyncio.create_task(self.__work()) for _ in range(self.__workers_count)]
+
+    async def stop(self) -> None:
+        """Остановить обработчики. Невыполненные задания будут выполнены после следующего запуска."""
+        for task in self.__tasks:
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        self.__tasks = []
+
+    def enqueue(self, job_id: UUID) -> None:
+        """Поставить задание в очередь на выполнение."""
+        if self.__tasks:
+            self.__queue.put_nowait(job_id)
+
+    async def __work(self) -> None:
+        while True:
+            job_id = await self.__queue.get()
+            try:
+                await self.__run(job_id)
+            except Exception as exc:
+                logging.exception(f"Ошибка при выполнении задания на формирование отчёта {job_id}: {exc}")
+            finally:
+                self.__queue.task_done()
+
+    async def __run(self, job_id: UUID) -> None:
+        async with get_session_context(transaction=True) as session:
+            export_job_repository = ExportJobRepository(session)
+            job = await export_job_repository.get(job_id)
+            await export_job_repository.set_status(job_id, ExportJob.Status.RUNNING)
+        try:
+            await report_statistics_refresher.refresh_if_stale()
+            async with get_session_context() as session:
+                analytics_service = AnalyticsService(TaskRepository(session), ShiftRepository(session))
+                sheets = await analytics_service.get_report_sheets(job.report_type, job.shift_id)
+            await report_renderer.render_to_file(sheets, str(job.file_path), wait_for_slot=True)
+        except Exception as exc:
+            logging.exception(f"Не удалось сформировать отчёт {job}: {exc}")
+            await self.__set_status(job_id, ExportJob.Status.FAILED, str(exc))
+        else:
+            await self.__set_status(job_id, ExportJob.Status.DONE)
+
+    async def __remove_expired_files(self) -> None:
+        """Периодически удаляет устаревшие файлы отчётов."""
+        while True:
+            try:
+                async with get_session_context(transaction=True) as session:
+                    job_ids = await ExportJobRepository(session).expire_finished_before(
+                        datetime.now() - settings.EXPORT_FILE_LIFETIME
+                    )
+                remove_export_files(job_ids)
+            except Exception as exc:
+                logging.exception(f"Не удалось удалить устаревшие файлы отчётов: {exc}")
+            await asyncio.sleep(settings.EXPORT_CLEANUP_INTERVAL)
+
+    @staticmethod
+    async def __set_status(job_id: UUID, status: ExportJob.Status, error: str | None = None) -> None:
+        async with get_session_context(transaction=True) as session:
+            await ExportJobRepository(session).set_status(job_id, status, error)
+
+
+def remove_export_files(job_ids: list[UUID]) -> None:
+    """Удалить файлы отчётов заданий."""
+    for job_id in job_ids:
+        ExportJob.get_file_path(job_id).unlink(missing_ok=True)
+
+
+export_job_runner = ExportJobRunner()
@@ -0,0 +1,70 @@
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import Depends
+
+from src.core import exceptions
+from src.core.db.models import ExportJob, Shift
+from src.core.db.repository import ExportJobRepository, ShiftRepository
+from src.core.db.unit_of_work import UnitOfWork, require_unit_of_work
+from src.core.services.analytics_service import AnalyticsService
+from src.core.services.export_job_runner import export_job_runner, remove_export_files
+
+
+class ExportJobService:
+    """Сервис заданий на формирование отчётов.
+
+    Отчёт по завершённой смене больше не меняется, поэтому сформированный файл кэшируется
+    и выдаётся повторно, пока не изменится версия данных смены. Пока такой отчёт формируется,
+    повторные запросы получают уже созданное задание.
+    """
+
+    def __init__(
+        self,
+        export_job_repository: ExportJobRepository = Depends(),
+        shift_repository: ShiftRepository = Depends(),
+        analytics_service: AnalyticsService = Depends(),
+        unit_of_work: UnitOfWork = Depends(),
+    ) -> None:
+        self.__export_job_repository = export_job_repository
+        self.__shift_repository = shift_repository
+        self.__analytics_service = analytics_service
+        self.__unit_of_work = require_unit_of_work(unit_of_work)
+
+    async def create_job(self, report_type: ExportJob.ReportType, shift_id: UUID | None) -> ExportJob:
+        """Создать задание на формирование отчёта или вернуть закэшированный отчёт."""
+        data_version = None
+        if report_type is ExportJob.ReportType.SHIFT:
+            if shift_id is None:
+                raise exceptions.ExportShiftRequiredError()
+            shift = await self.__shift_repository.get(shift_id)
+            filename = self.__analytics_service.get_shift_report_filename(shift)
+            if shift.status is Shift.Status.FINISHED:
+                data_version = await self.__shift_repository.get_report_data_version(shift_id)
+                cached_job = await self.__export_job_repository.get_cached(report_type, shift_id, data_version)
+                if cached_job and (cached_job.status is not ExportJob.Status.DONE or cached_job.file_path.exists()):
+                    return cached_job
+        else:
+            shift_id = None
+            filename = f"{report_type.value}_report_{datetime.now()}.xlsx"
+        expired_job_ids = []
+        async with self.__unit_of_work:
+            if data_version:
+                expired_job_ids = await self.__export_job_repository.expire_cached(report_type, shift_id)
+            job = await self.__export_job_repository.create(
+                ExportJob(report_type=report_type, shift_id=shift_id, data_version=data_version, filename=filename)
+            )
+        remove_export_files(expired_job_ids)
+        export_job_runner.enqueue(job.id)
+        return job
+
+    async def get_job(self, job_id: UUID) -> ExportJob:
+        """Получить задание на формирование отчёта."""
+        return await self.__export_job_repository.get(job_id)
+
+    async def get_job_with_file(self, job_id: UUID) -> ExportJob:
+        """Получить выполненное задание, файл отчёта которого можно скачать."""
+        job = await self.__export_job_repository.get(job_id)
+        if job.status is not ExportJob.Status.DONE or not job.file_path.exists():
+            raise exceptions.ExportJobNotReadyError(job.status.value)
+        return job
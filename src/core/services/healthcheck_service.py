@@ -1,4 +1,5 @@
 import logging
+from dataclasses import asdict
 from datetime import datetime
 from http import HTTPStatus
 
@@ -8,8 +9,12 @@ from telegram.ext import Application
 
 from src.api.response_models.healthcheck import (
     ComponentItemHealthcheck,
+    DbPoolStatusResponse,
     HealthcheckResponse,
+    MessageRateStatusResponse,
 )
+from src.bot.rate_limiter import message_rate_limiter
+from src.core.db.db import get_pool_status
 from src.core.db.repository import ReportRepository
 from src.core.settings import settings
 
@@ -47,3 +52,13 @@ class HealthcheckService:
     async def get_healthcheck_status(self, bot: Application.bot) -> HealthcheckResponse:
         components = [await self.__get_bot_status(bot), await self.__get_api_status(), await self.__get_db_status()]
         return HealthcheckResponse(timestamp=datetime.now(), components=components)
+
+    @staticmethod
+    def get_db_pool_status() -> DbPoolStatusResponse:
+        """Возвращает состояние пула соединений с БД и статистику ожидания соединения."""
+        return DbPoolStatusResponse(**get_pool_status())
+
+    @staticmethod
+    def get_message_rate_status() -> MessageRateStatusResponse:
+        """Возвращает фактическую скорость отправки сообщений ботом и текущие ограничения скорости."""
+        return MessageRateStatusResponse(**asdict(message_rate_limiter.get_status()))
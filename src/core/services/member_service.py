@@ -6,6 +6,7 @@ from telegram.ext import Application
 from src.bot import services
 from src.core.db.models import Member, Shift
 from src.core.db.repository import MemberRepository, ShiftRepository
+from src.core.db.unit_of_work import UnitOfWork, require_unit_of_work
 from src.core.settings import settings
 from src.core.utils import get_current_task_date
 
@@ -15,9 +16,11 @@ class MemberService:
         self,
         member_repository: MemberRepository = Depends(),
         shift_repository: ShiftRepository = Depends(),
+        unit_of_work: UnitOfWork = Depends(),
     ) -> None:
         self.__member_repository = member_repository
         self.__shift_repository = shift_repository
+        self.__unit_of_work = require_unit_of_work(unit_of_work)
         self.__telegram_bot = services.BotService
 
     async def exclude_lagging_members(self, shift: Shift, bot: Application) -> None:
@@ -30,9 +33,10 @@ class MemberService:
             shift.id, settings.SEQUENTIAL_TASKS_PASSES_FOR_EXCLUDE
         )
         lagging_members = [member for member in lagging_members if member.user.is_test_user is False]
-        for member in lagging_members:
-            member.status = Member.Status.EXCLUDED
-            await self.__member_repository.update(member.id, member)
+        async with self.__unit_of_work:
+            for member in lagging_members:
+                member.status = Member.Status.EXCLUDED
+                await self.__member_repository.update(member.id, member)
         await self.__telegram_bot(bot).notify_excluded_members(lagging_members)
 
     async def get_members_with_no_reports(self, shift_id: UUID) -> list[Member]:
@@ -0,0 +1,17 @@
+from uuid import UUID
+
+from fastapi import Depends
+
+from src.core.db.models import OutgoingMessage
+from src.core.db.repository import OutgoingMessageRepository
+
+
+class NotificationService:
+    """Сервис уведомлений участников, отправляемых ботом из очереди исходящих сообщений."""
+
+    def __init__(self, outgoing_message_repository: OutgoingMessageRepository = Depends()) -> None:
+        self.__outgoing_message_repository = outgoing_message_repository
+
+    async def get_notification(self, notification_id: UUID) -> OutgoingMessage:
+        """Получить уведомление со статусом отправки."""
+        return await self.__outgoing_message_repository.get(notification_id)
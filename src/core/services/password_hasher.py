@@ -0,0 +1,46 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from src.core.settings import settings
+
+PASSWORD_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasher:
+    """Пул потоков для хэширования и проверки паролей.
+
+    Хэширование bcrypt занимает сотни миллисекунд процессорного времени и блокировало бы цикл событий,
+    который также обрабатывает обновления бота. Реализация bcrypt освобождает GIL на время вычислений,
+    поэтому пула потоков достаточно. Одновременно вычисляется не больше workers_count хэшей,
+    остальные запросы ожидают в очереди пула, не блокируя цикл событий.
+    """
+
+    def __init__(self, workers_count: int = settings.PASSWORD_HASHING_WORKERS) -> None:
+        self.__workers_count = workers_count
+        self.__executor: ThreadPoolExecutor | None = None
+
+    async def hash(self, password: str) -> str:
+        """Получить хэш пароля."""
+        return await asyncio.get_running_loop().run_in_executor(self.__get_executor(), PASSWORD_CONTEXT.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Сравнить открытый пароль с хэшем."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__get_executor(), PASSWORD_CONTEXT.verify, plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        """Остановить потоки пула."""
+        if self.__executor:
+            self.__executor.shutdown(cancel_futures=True)
+            self.__executor = None
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.__workers_count, thread_name_prefix="password_hasher")
+        return self.__executor
+
+
+password_hasher = PasswordHasher()
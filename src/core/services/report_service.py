@@ -1,20 +1,26 @@
+from collections import Counter
 from datetime import date, timedelta
-from typing import Sequence
 from urllib.parse import urljoin
 
 from fastapi import Depends
 from pydantic.schema import UUID
-from telegram.ext import Application
 
 from src.api.response_models.report import ReportResponse
 from src.bot import services
+from src.bot.message_sender import message_sender
 from src.core import exceptions
 from src.core.db import DTO_models
-from src.core.db.models import Member, Report, Shift, Task
-from src.core.db.repository import MemberRepository, ReportRepository, ShiftRepository
+from src.core.db.models import Member, OutgoingMessage, Report, Shift, Task
+from src.core.db.repository import (
+    MemberRepository,
+    OutgoingMessageRepository,
+    ReportRepository,
+    ShiftRepository,
+)
+from src.core.db.unit_of_work import UnitOfWork, require_unit_of_work
 from src.core.services.task_service import TaskService
 from src.core.settings import settings
-from src.core.utils import get_current_task_date, get_lombaryers_for_quantity
+from src.core.utils import decode_cursor, encode_cursor, get_current_task_date
 
 
 class ReportService:
@@ -30,19 +36,23 @@ class ReportService:
         report_repository: ReportRepository = Depends(),
         shift_repository: ShiftRepository = Depends(),
         member_repository: MemberRepository = Depends(),
+        outgoing_message_repository: OutgoingMessageRepository = Depends(),
         task_service: TaskService = Depends(),
+        unit_of_work: UnitOfWork = Depends(),
     ) -> None:
         self.__telegram_bot = services.BotService
         self.__report_repository = report_repository
         self.__shift_repository = shift_repository
         self.__member_repository = member_repository
+        self.__outgoing_message_repository = outgoing_message_repository
         self.__task_service = task_service
+        self.__unit_of_work = require_unit_of_work(unit_of_work)
 
     async def get_report(self, id: UUID) -> Report:
         return await self.__report_repository.get(id)
 
-    async def check_duplicate_report(self, url: str) -> None:
-        report = await self.__report_repository.get_by_report_url(url)
+    async def check_duplicate_report(self, photo_hash: str, url: str) -> None:
+        report = await self.__report_repository.get_duplicate(photo_hash, url)
         if report:
             raise exceptions.DuplicateReportError
 
@@ -50,65 +60,162 @@ class ReportService:
         if report.status == Report.Status.SKIPPED:
             raise exceptions.ReportAlreadySkippedError
 
+    async def check_report_can_be_sent(self, report: Report) -> None:
+        """Проверить, что отчет не пропущен и его можно отправить на проверку."""
+        await self.check_report_skipped(report)
+        report.check_can_send_report()
+
     async def get_today_task_and_active_members(
             self, shift: Shift, current_day_of_month: int) -> tuple[Task, list[Member]]:
         """Получить ежедневное задание и список активных участников смены."""
         members = await self.__member_repository.get_active_members_for_shift(shift.id)
-        task = await self.__task_service.get_task_by_day_of_month(shift.tasks, current_day_of_month)
+        task = await self.__task_service.get_task_by_day_of_month(shift, current_day_of_month)
         return task, members
 
-    async def approve_report(self, report_id: UUID, administrator_id: UUID, bot: Application) -> ReportResponse:
-        """Задание принято: изменение статуса, начисление 1 /"ломбарьерчика/", уведомление участника."""
-        report = await self.__report_repository.get(report_id)
-        self.__can_change_status(report.status)
-        report.status = Report.Status.APPROVED
-        report.set_reviewer(administrator_id)
-        report = await self.__report_repository.update(report_id, report)
-        member = await self.__member_repository.get_with_user_and_shift(report.member_id)
-        member.numbers_lombaryers += 1
-        await self.__member_repository.update(member.id, member)
-        await self.__telegram_bot(bot).notify_approved_task(member.user, report, member.shift)
-        await self.__notify_member_about_finished_shift(member, bot)
-        return report
+    async def approve_report(self, report_id: UUID, administrator_id: UUID) -> ReportResponse:
+        """Задание принято: изменение статуса, начисление 1 /"ломбарьерчика/", уведомление участника.
 
-    async def decline_report(self, report_id: UUID, administrator_id: UUID, bot: Application) -> ReportResponse:
-        """Задание отклонено: изменение статуса, уведомление участника в телеграм."""
-        report = await self.__report_repository.get(report_id)
-        self.__can_change_status(report.status)
-        report.status = Report.Status.DECLINED
-        report.set_reviewer(administrator_id)
-        report = await self.__report_repository.update(report_id, report)
-        member = await self.__member_repository.get_with_user_and_shift(report.member_id)
-        await self.__telegram_bot(bot).notify_declined_task(member.user, member.shift, report)
-        await self.__notify_member_about_finished_shift(member, bot)
-        return report
+        Уведомление ставится в очередь исходящих сообщений в той же транзакции, что и изменение статуса,
+        результат отправки доступен по notification_id.
+        """
+        async with self.__unit_of_work:
+            report = await self.__report_repository.get(report_id)
+            self.__can_change_status(report.status)
+            report.status = Report.Status.APPROVED
+            report.set_reviewer(administrator_id)
+            report = await self.__report_repository.update(report_id, report)
+            member = await self.__member_repository.get_with_user_and_shift(report.member_id)
+            member.numbers_lombaryers += 1
+            await self.__member_repository.update(member.id, member)
+            message = OutgoingMessage(
+                user_id=member.user_id, text=self.__telegram_bot.get_approved_task_text(report, member.shift)
+            )
+            await self.__outgoing_message_repository.create_all([message])
+            shift_finished = await self.__notify_member_about_finished_shift(member)
+        self.__member_repository.invalidate_balance(member.user.telegram_id)
+        self.__after_review_committed(shift_finished)
+        return self.__get_report_response(report, message.id)
+
+    async def decline_report(self, report_id: UUID, administrator_id: UUID) -> ReportResponse:
+        """Задание отклонено: изменение статуса, уведомление участника в телеграм.
+
+        Уведомление ставится в очередь исходящих сообщений в той же транзакции, что и изменение статуса,
+        результат отправки доступен по notification_id.
+        """
+        async with self.__unit_of_work:
+            report = await self.__report_repository.get(report_id)
+            self.__can_change_status(report.status)
+            report.status = Report.Status.DECLINED
+            report.set_reviewer(administrator_id)
+            report = await self.__report_repository.update(report_id, report)
+            member = await self.__member_repository.get_with_user_and_shift(report.member_id)
+            message = OutgoingMessage(
+                user_id=member.user_id, text=self.__telegram_bot.get_declined_task_text(report, member.shift)
+            )
+            await self.__outgoing_message_repository.create_all([message])
+            shift_finished = await self.__notify_member_about_finished_shift(member)
+        self.__after_review_committed(shift_finished)
+        return self.__get_report_response(report, message.id)
+
+    async def moderate_reports(
+        self, report_ids: list[UUID], status: Report.Status, administrator_id: UUID
+    ) -> DTO_models.ReportsModerationDto:
+        """Проверка нескольких отчетов: изменение статусов, начисление "ломбарьерчиков" за принятые задания.
+
+        Статусы и балансы участников изменяются пакетными запросами, отчеты, которые не ожидают проверки,
+        пропускаются. Уведомления участникам ставятся в очередь исходящих сообщений, а смены, в которых
+        не осталось непроверенных заданий, закрываются в той же транзакции.
+        """
+        report_ids = list(dict.fromkeys(report_ids))
+        get_text = (
+            self.__telegram_bot.get_approved_task_text
+            if status == Report.Status.APPROVED
+            else self.__telegram_bot.get_declined_task_text
+        )
+        async with self.__unit_of_work:
+            reports = await self.__report_repository.review_reports(report_ids, status, administrator_id)
+            if not reports:
+                return DTO_models.ReportsModerationDto(reviewed=[], skipped=report_ids)
+            if status == Report.Status.APPROVED:
+                await self.__member_repository.add_lombaryers(Counter(report.member_id for report in reports))
+            members = await self.__member_repository.get_many_with_user_and_shift(
+                list({report.member_id for report in reports})
+            )
+            members_with_unreviewed_reports = await self.__member_repository.get_ids_with_unreviewed_reports(
+                [member.id for member in members if member.shift.status is Shift.Status.READY_FOR_COMPLETE]
+            )
+            members = {member.id: member for member in members}
+            finished_members = [
+                member
+                for member in members.values()
+                if member.shift.status is Shift.Status.READY_FOR_COMPLETE
+                and member.id not in members_with_unreviewed_reports
+            ]
+            messages = []
+            for report in reports:
+                member = members[report.member_id]
+                messages.append(OutgoingMessage(user_id=member.user_id, text=get_text(report, member.shift)))
+            messages += [
+                OutgoingMessage(
+                    user_id=member.user_id, text=self.__telegram_bot.get_final_message_text(member.shift, member)
+                )
+                for member in finished_members
+            ]
+            await self.__outgoing_message_repository.create_all(messages)
+            shift_finished = False
+            for shift in {member.shift.id: member.shift for member in finished_members}.values():
+                shift_finished |= await self.__finish_shift_with_all_reports_reviewed(shift)
+        if status == Report.Status.APPROVED:
+            for member in members.values():
+                self.__member_repository.invalidate_balance(member.user.telegram_id)
+        self.__after_review_committed(shift_finished)
+        reviewed_ids = {report.id for report in reports}
+        return DTO_models.ReportsModerationDto(
+            reviewed=[report_id for report_id in report_ids if report_id in reviewed_ids],
+            skipped=[report_id for report_id in report_ids if report_id not in reviewed_ids],
+        )
 
-    async def skip_current_report(self, user_id: UUID) -> Report:
+    async def skip_current_report(self, member_id: UUID | None) -> Report:
         """Задание пропущено: изменение статуса."""
-        report = await self.__report_repository.get_current_report(user_id)
+        report = await self.get_current_report(member_id)
         if report.status is Report.Status.SKIPPED:
             raise exceptions.ReportAlreadySkippedError
         if report.status is not Report.Status.WAITING:
             raise exceptions.ReportCantBeSkippedError
         report.status = Report.Status.SKIPPED
-        return await self.__report_repository.update(report.id, report)
+        async with self.__unit_of_work:
+            report = await self.__report_repository.update(report.id, report)
+        return report
+
+    @staticmethod
+    def __get_report_response(report: Report, notification_id: UUID) -> ReportResponse:
+        """Ответ с отчетом и id уведомления участника о результате проверки."""
+        response = ReportResponse.from_orm(report)
+        response.notification_id = notification_id
+        return response
 
-    async def __notify_member_about_finished_shift(self, member: Member, bot: Application) -> None:
-        """Уведомляет пользователя об окончании смены, если у него не осталось непроверенных заданий."""
+    async def __notify_member_about_finished_shift(self, member: Member) -> bool:
+        """Ставит в очередь уведомление пользователя об окончании смены, если у него не осталось
+        непроверенных заданий, и закрывает смену. Вызывается внутри транзакции проверки отчета.
+
+        Возвращает True, если смена закрыта.
+        """
         if (
-            member.shift.status is Shift.Status.READY_FOR_COMPLETE
-            and not await self.__member_repository.is_unreviewed_report_exists(member.id)
+            member.shift.status is not Shift.Status.READY_FOR_COMPLETE
+            or await self.__member_repository.is_unreviewed_report_exists(member.id)
         ):
-            await self.__finish_shift_with_all_reports_reviewed(member.shift)
-            await self.__telegram_bot(bot).send_message(
-                member.user,
-                member.shift.final_message.format(
-                    name=member.user.name,
-                    surname=member.user.surname,
-                    numbers_lombaryers=member.numbers_lombaryers,
-                    lombaryers_case=get_lombaryers_for_quantity(member.numbers_lombaryers),
-                ),
-            )
+            return False
+        final_message_text = self.__telegram_bot.get_final_message_text(member.shift, member)
+        await self.__outgoing_message_repository.create_all(
+            [OutgoingMessage(user_id=member.user_id, text=final_message_text)]
+        )
+        return await self.__finish_shift_with_all_reports_reviewed(member.shift)
+
+    def __after_review_committed(self, shift_finished: bool) -> None:
+        """Сбрасывает кеши и будит отправку уведомлений после фиксации транзакции проверки отчетов."""
+        if shift_finished:
+            self.__shift_repository.invalidate_cache()
+        message_sender.wake_up()
 
     def __can_change_status(self, status: Report.Status) -> None:
         """Проверка статуса задания перед изменением."""
@@ -117,44 +224,66 @@ class ReportService:
         if status is Report.Status.WAITING:
             raise exceptions.ReportWaitingPhotoError
 
-    async def __finish_shift_with_all_reports_reviewed(self, shift: Shift) -> None:
-        """Закрывает смену, если не осталось непроверенных заданий."""
-        if not await self.__shift_repository.is_unreviewed_report_exists(shift.id):
-            shift.status = Shift.Status.FINISHED
-            await self.__shift_repository.update(shift.id, shift)
+    async def __finish_shift_with_all_reports_reviewed(self, shift: Shift) -> bool:
+        """Закрывает смену, если не осталось непроверенных заданий. Вызывается внутри транзакции.
+
+        Возвращает True, если смена закрыта.
+        """
+        if await self.__shift_repository.is_unreviewed_report_exists(shift.id):
+            return False
+        shift.status = Shift.Status.FINISHED
+        await self.__shift_repository.update(shift.id, shift)
+        return True
 
     async def get_summaries_of_reports(
         self,
         shift_id: UUID,
-        status: Report.Status,
-    ) -> list[DTO_models.FullReportDto]:
-        """Получает из БД список отчетов участников.
+        status: Report.Status | None,
+        task_date: date | None,
+        member_id: UUID | None,
+        cursor: str | None,
+        limit: int,
+    ) -> DTO_models.ReportsPageDto:
+        """Получает из БД страницу списка отчетов участников.
 
-        Список берется по id смены и/или статусу заданий с url фото выполненного задания.
+        Список берется по id смены и/или статусу заданий, дате задания и участнику
+        с url фото выполненного задания. Вместе со страницей возвращается курсор следующей страницы.
         """
+        decoded_cursor = decode_cursor(cursor) if cursor else None
         shift_exists = await self.__shift_repository.check_shift_existence(shift_id)
         if not shift_exists:
             raise exceptions.ObjectNotFoundError(Shift, shift_id)
-        reports = await self.__report_repository.get_summaries_of_reports(shift_id, status)
+        reports = await self.__report_repository.get_summaries_of_reports(
+            shift_id, status, task_date, member_id, decoded_cursor, limit + 1
+        )
+        next_cursor = None
+        if len(reports) > limit:
+            del reports[limit:]
+            next_cursor = encode_cursor(reports[-1].report_created_at, reports[-1].report_id)
         for report in reports:
             report.task_url = urljoin(settings.APPLICATION_URL, report.task_url)
             if report.photo_url:
                 report.photo_url = urljoin(settings.APPLICATION_URL, report.photo_url)
-        return reports
+        return DTO_models.ReportsPageDto(reports, next_cursor)
 
-    async def get_current_report(self, user_id: UUID) -> Report:
-        return await self.__report_repository.get_current_report(user_id)
+    async def get_current_report(self, member_id: UUID | None) -> Report:
+        """Получить текущий отчет участника текущей смены."""
+        if member_id is None:
+            raise exceptions.CurrentTaskNotFoundError()
+        return await self.__report_repository.get_current_report(member_id)
 
-    async def send_report(self, report: Report, photo_url: str) -> Report:
+    async def send_report(self, report: Report, photo_url: str, photo_hash: str) -> Report:
+        """Отправить отчет на проверку. Фото должно быть заранее проверено на повторное использование."""
         await self.check_report_skipped(report)
-        await self.check_duplicate_report(photo_url)
-        report.send_report(photo_url)
-        return await self.__report_repository.update(report.id, report)
+        report.send_report(photo_url, photo_hash)
+        async with self.__unit_of_work:
+            report = await self.__report_repository.update(report.id, report)
+        return report
 
-    async def create_daily_reports(self, members: list[Member], task: Task) -> None:
+    async def create_daily_reports(self, members: list[Member], task: Task) -> list[UUID]:
         current_date = date.today()
         reports = [
-            Report(
+            dict(
                 shift_id=member.shift_id,
                 task_id=task.id,
                 status=(
@@ -165,22 +294,21 @@ class ReportService:
             )
             for member in members
         ]
-        await self.__report_repository.create_all(reports)
-
-    async def __get_waiting_reports(self) -> Sequence[Report]:
-        """Получаем список отчетов участников со статусом waiting."""
-        return await self.__report_repository.get_waiting_reports()
+        async with self.__unit_of_work:
+            report_ids = await self.__report_repository.create_all(reports)
+        return report_ids
 
-    async def set_status_to_waiting_reports(self, status: Report.Status):
+    async def set_status_to_waiting_reports(self, status: Report.Status) -> list[UUID]:
         """Устанавливаем статус всем отчетам со статусом waiting."""
-        reports_list = await self.__get_waiting_reports()
-        return await self.__report_repository.set_status_to_reports(reports_list, status)
+        async with self.__unit_of_work:
+            report_ids = await self.__report_repository.set_status_to_waiting_reports(status)
+        return report_ids
 
-    async def create_not_participated_reports(self, member_id: UUID, shift: Shift) -> None:
+    async def create_not_participated_reports(self, member_id: UUID, shift: Shift) -> list[UUID]:
         """Создаем пропущенные отчеты со статусом not_participate участнику, который пришел на смену позже."""
         count_of_missed_days = (get_current_task_date() - shift.started_at).days
         reports = [
-            Report(
+            dict(
                 shift_id=shift.id,
                 task_id=shift.tasks[str((shift.started_at + timedelta(days=day)).day)],
                 status=Report.Status.NOT_PARTICIPATE,
@@ -189,8 +317,10 @@ class ReportService:
             )
             for day in range(0, count_of_missed_days + 1)
         ]
-        await self.__report_repository.create_all(reports)
+        async with self.__unit_of_work:
+            report_ids = await self.__report_repository.create_all(reports)
+        return report_ids
 
-    async def is_previous_report_not_submitted(self, member_id: UUID) -> bool:
-        """Проверяет статус вчерашнего отчета."""
-        return await self.__report_repository.is_previous_report_not_submitted(member_id)
+    async def get_members_ids_with_previous_report_not_submitted(self, shift_id: UUID) -> set[UUID]:
+        """Получает id участников смены, не сдавших вчерашний отчет."""
+        return await self.__report_repository.get_members_ids_with_previous_report_not_submitted(shift_id)
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+
+from src.core.db.db import get_session_context
+from src.core.db.repository import ReportRepository
+from src.core.settings import settings
+
+
+class ReportStatisticsRefresher:
+    """Обновление материализованного представления report_statistics.
+
+    Представление пересчитывается, только если с последнего пересчёта изменилась версия данных
+    в таблице report_statistics_version, которую ведут триггеры БД, поэтому учитываются и изменения,
+    сделанные в обход сервисов приложения или в другом процессе. Проверка версии читает одну строку.
+    Она выполняется в фоне раз в REPORT_STATISTICS_REFRESH_INTERVAL секунд и перед формированием
+    отчёта в фоновом задании. Отчёты, которые выгружаются в ответ на запрос, не ждут пересчёта
+    и строятся по статистике, устаревшей не более чем на интервал пересчёта.
+    """
+
+    def __init__(self, refresh_interval: int = settings.REPORT_STATISTICS_REFRESH_INTERVAL) -> None:
+        self.__refresh_interval = refresh_interval
+        self.__data_version: int | None = None
+        self.__lock = asyncio.Lock()
+        self.__task: asyncio.Task | None = None
+
+    async def refresh_if_stale(self) -> None:
+        """Пересчитать статистику, если после последнего пересчёта данные в БД изменились."""
+        async with self.__lock:
+            async with get_session_context(transaction=True) as session:
+                report_repository = ReportRepository(session)
+                data_version = await report_repository.get_statistics_data_version()
+                if data_version == self.__data_version:
+                    return
+                await report_repository.refresh_statistics()
+            self.__data_version = data_version
+
+    async def start(self) -> None:
+        """Запустить периодический пересчёт статистики."""
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """Остановить периодический пересчёт статистики."""
+        if self.__task is not None:
+            self.__task.cancel()
+            await asyncio.gather(self.__task, return_exceptions=True)
+            self.__task = None
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.refresh_if_stale()
+            except Exception as exc:
+                logging.exception(f"Не удалось обновить статистику отчётов: {exc}")
+            await asyncio.sleep(self.__refresh_interval)
+
+
+report_statistics_refresher = ReportStatisticsRefresher()
@@ -21,13 +21,14 @@ from src.api.response_models.shift import (
 )
 from src.bot import services
 from src.core import exceptions
-from src.core.db.models import Member, Report, Request, Shift, User
+from src.core.db.models import Member, Report, Request, Shift
 from src.core.db.repository import (
     ReportRepository,
     RequestRepository,
     ShiftRepository,
     UserRepository,
 )
+from src.core.db.unit_of_work import UnitOfWork, require_unit_of_work
 from src.core.services.task_service import TaskService
 from src.core.settings import settings
 from src.core.utils import add_months
@@ -50,12 +51,14 @@ class ShiftService:
         report_repository: ReportRepository = Depends(),
         user_repository: UserRepository = Depends(),
         request_repository: RequestRepository = Depends(),
+        unit_of_work: UnitOfWork = Depends(),
     ) -> None:
         self.__shift_repository = shift_repository
         self.__task_service = task_service
         self.__report_repository = report_repository
         self.__user_repository = user_repository
         self.__request_repository = request_repository
+        self.__unit_of_work = require_unit_of_work(unit_of_work)
         self.__telegram_bot = services.BotService
 
     @staticmethod
@@ -165,13 +168,14 @@ class ShiftService:
         path.mkdir(parents=True, exist_ok=True)
 
     async def get_shift_dir(self, shift_id: UUID) -> str:
-        shift = await self.__shift_repository.get(shift_id)
-        return f"shift_{shift.sequence_number}"
+        sequence_number = await self.__shift_repository.get_sequence_number(shift_id)
+        return f"shift_{sequence_number}"
 
     async def get_test_users_and_create_request_to_shift(self, shift_id: UUID) -> None:
         users = await self.__user_repository.get_test_users()
-        for user in users:
-            await self.__request_repository.create(Request(user_id=user.id, shift_id=shift_id))
+        async with self.__unit_of_work:
+            for user in users:
+                await self.__request_repository.create(Request(user_id=user.id, shift_id=shift_id))
 
     async def create_new_shift(self, new_shift: ShiftCreateRequest) -> Shift:
         shift = Shift(**new_shift.dict())
@@ -186,9 +190,11 @@ class ShiftService:
             if day == 31:
                 break
         shift.tasks = month_tasks
-        shift = await self.__shift_repository.create(instance=shift)
-        await self.__create_shift_dir(shift.id)
-        await self.get_test_users_and_create_request_to_shift(shift.id)
+        async with self.__unit_of_work:
+            shift = await self.__shift_repository.create(instance=shift)
+            await self.__create_shift_dir(shift.id)
+            await self.get_test_users_and_create_request_to_shift(shift.id)
+        self.__shift_repository.invalidate_cache()
         return shift
 
     async def get_shift(self, shift_id: UUID) -> Shift:
@@ -197,8 +203,15 @@ class ShiftService:
     async def update_shift(self, bot: Application, shift_id: UUID, update_shift_data: ShiftUpdateRequest) -> Shift:
         shift: Shift = await self.__shift_repository.get(shift_id)
         await self.__validate_shift_on_update(shift, update_shift_data)
-        if shift.started_at != update_shift_data.started_at:
-            shift.started_at = update_shift_data.started_at
+        started_at_changed = shift.started_at != update_shift_data.started_at
+        shift.started_at = update_shift_data.started_at
+        shift.finished_at = update_shift_data.finished_at
+        shift.title = update_shift_data.title
+        shift.final_message = update_shift_data.final_message
+        async with self.__unit_of_work:
+            shift = await self.__shift_repository.update(shift_id, shift)
+        self.__shift_repository.invalidate_cache()
+        if started_at_changed:
             users = await self.__user_repository.get_users_by_shift_id(shift.id)
             await self.__telegram_bot(bot).notify_that_shift_start_date_is_changed(
                 users,
@@ -206,22 +219,22 @@ class ShiftService:
                     started_at=shift.started_at.strftime('%d.%m.%Y'),
                 ),
             )
-
-        shift.finished_at = update_shift_data.finished_at
-        shift.title = update_shift_data.title
-        shift.final_message = update_shift_data.final_message
-        return await self.__shift_repository.update(shift_id, shift)
+        return shift
 
     async def start_shift(self, shift_id: UUID) -> Shift:
         shift = await self.__shift_repository.get(shift_id)
         await shift.start()
-        await self.__shift_repository.update(shift_id, shift)
+        async with self.__unit_of_work:
+            await self.__shift_repository.update(shift_id, shift)
+        self.__shift_repository.invalidate_cache()
         return shift
 
     async def finish_shift(self, bot: Application, shift_id: UUID) -> Shift:
         shift = await self.__shift_repository.get_with_members(shift_id, Member.Status.ACTIVE)
         await shift.finish()
-        await self.__shift_repository.update(shift_id, shift)
+        async with self.__unit_of_work:
+            await self.__shift_repository.update(shift_id, shift)
+        self.__shift_repository.invalidate_cache()
         await self.__telegram_bot(bot).notify_that_shift_is_finished(shift)
         return shift
 
@@ -252,12 +265,16 @@ class ShiftService:
         if shift.status is Shift.Status.READY_FOR_COMPLETE:
             await self.__decline_reports_and_notify_users(shift.id, bot)
             shift.status = Shift.Status.FINISHED
-            await self.__shift_repository.update(shift.id, shift)
+            async with self.__unit_of_work:
+                await self.__shift_repository.update(shift.id, shift)
+            self.__shift_repository.invalidate_cache()
         if shift.finished_at + timedelta(days=1) == date.today():
             await self.__notify_users_with_reviewed_reports(shift.id, bot)
             unreviewed_report_exists = await self.__shift_repository.is_unreviewed_report_exists(shift.id)
             shift.status = Shift.Status.READY_FOR_COMPLETE if unreviewed_report_exists else Shift.Status.FINISHED
-            await self.__shift_repository.update(shift.id, shift)
+            async with self.__unit_of_work:
+                await self.__shift_repository.update(shift.id, shift)
+            self.__shift_repository.invalidate_cache()
 
     async def __notify_users_with_reviewed_reports(self, shift_id: UUID, bot: Application) -> None:
         """Уведомляет пользователей, у которых нет непроверенных отчетов, об окончании смены."""
@@ -266,38 +283,25 @@ class ShiftService:
 
     async def __decline_reports_and_notify_users(self, shift_id: UUID, bot: Application) -> None:
         """Отклоняет непроверенные задания, уведомляет пользователей об окончании смены."""
-        shift = await self.__shift_repository.get_with_members_and_unreviewed_reports(shift_id)
-        reports_for_update = []
-        for member in shift.members:
-            for report in member.reports:
-                report.status = Report.Status.DECLINED
-                reports_for_update.append(report)
-        await self.__report_repository.update_all(reports_for_update)
+        async with self.__unit_of_work:
+            shift = await self.__shift_repository.get_with_members_with_unreviewed_reports(shift_id)
+            await self.__report_repository.decline_unreviewed_reports(shift_id)
         await self.__telegram_bot(bot).notify_that_shift_is_finished(shift)
 
     async def cancel_shift(
         self, bot: Application, shift_id: UUID, cancel_shift_data: Optional[ShiftCancelRequest] = None
     ) -> Shift:
-        shift = await self.__shift_repository.get_shift_with_request(shift_id)
+        shift = await self.__shift_repository.get(shift_id)
         final_message = "Смена отменена"
         if cancel_shift_data:
             final_message = cancel_shift_data.final_message
         await shift.cancel(final_message)
-        await self.__shift_repository.update(shift_id, shift)
-        requests_to_update = []
-        for request in shift.requests:
-            if request.status == Request.Status.PENDING:
-                request.status = Request.Status.DECLINED.value
-                requests_to_update.append(request)
-        await self.__request_repository.update_all(requests_to_update)
-
-        users = await self.__user_repository.get_users_by_shift_id(shift.id)
-        users_to_update = []
-        for user in users:
-            if user.status == User.Status.PENDING:
-                user.status = User.Status.DECLINED.value
-                users_to_update.append(user)
-        await self.__user_repository.update_all(users_to_update)
+        async with self.__unit_of_work:
+            await self.__shift_repository.update(shift_id, shift)
+            await self.__request_repository.decline_pending_requests(shift_id)
+            await self.__user_repository.decline_pending_users_by_shift_id(shift_id)
+        self.__shift_repository.invalidate_cache()
+        users = await self.__user_repository.get_users_by_shift_id(shift_id)
         await self.__telegram_bot(bot).notify_that_shift_is_cancelled(users, final_message)
         return shift
 
@@ -306,11 +310,13 @@ class ShiftService:
         shift = await self.__shift_repository.get_preparing_shift_with_started_at_today()
         if shift:
             shift.status = Shift.Status.STARTED.value
-            await self.__shift_repository.update(shift.id, shift)
+            async with self.__unit_of_work:
+                await self.__shift_repository.update(shift.id, shift)
+            self.__shift_repository.invalidate_cache()
 
     async def get_started_shift_or_none(self) -> Optional[Shift]:
         """Возвращает активную на данный момент смену или None."""
-        return await self.__shift_repository.get_shift_with_status_or_none(Shift.Status.STARTED)
+        return await self.__shift_repository.get_started_shift_or_none()
 
     async def get_all_report_of_member_for_shift(self, shift_id: UUID, member_id: UUID) -> list[Report]:
         return await self.__shift_repository.get_all_reports_of_member(shift_id, member_id)
@@ -7,12 +7,14 @@ from src.api.request_models.task import TaskCreateRequest, TaskUpdateRequest
 from src.core import exceptions
 from src.core.db.models import Shift, Task
 from src.core.db.repository.task_repository import TaskRepository
+from src.core.db.unit_of_work import UnitOfWork, require_unit_of_work
 from src.core.settings import settings
 
 
 class TaskService:
-    def __init__(self, task_repository: TaskRepository = Depends()) -> None:
+    def __init__(self, task_repository: TaskRepository = Depends(), unit_of_work: UnitOfWork = Depends()) -> None:
         self.__task_repository = task_repository
+        self.__unit_of_work = require_unit_of_work(unit_of_work)
 
     async def __download_file(self, file: UploadFile) -> str:
         file_name = file.filename.replace(' ', '_')
@@ -24,19 +26,33 @@ class TaskService:
     async def get_task_ids_list(self) -> list[UUID]:
         return await self.__task_repository.get_task_ids_list()
 
-    async def get_task_by_day_of_month(self, tasks: Shift.tasks, day_of_month: int) -> Task:
-        task_id = tasks.get(str(day_of_month))
-        task = await self.__task_repository.get_or_none(task_id)
+    async def get_shift_tasks(self, shift: Shift) -> dict[int, Task]:
+        """Задания смены по дням месяца.
+
+        Задания смены загружаются одним запросом при первом обращении, а затем берутся из кэша.
+        """
+        task_ids = {int(day): UUID(task_id) for day, task_id in shift.tasks.items()}
+        tasks = await self.__task_repository.get_many_cached(task_ids.values())
+        return {day: tasks[task_id] for day, task_id in task_ids.items() if task_id in tasks}
+
+    async def get_task_by_day_of_month(self, shift: Shift, day_of_month: int) -> Task:
+        task = (await self.get_shift_tasks(shift)).get(day_of_month)
         if not task:
             raise exceptions.TodayTaskNotFoundError()
         return task
 
+    async def set_telegram_file_id(self, task_id: UUID, telegram_file_id: str) -> None:
+        async with self.__unit_of_work:
+            await self.__task_repository.set_telegram_file_id(task_id, telegram_file_id)
+        self.__task_repository.invalidate_cache(task_id)
+
     async def create_task(self, new_task: TaskCreateRequest) -> Task:
         task = Task(
             title=new_task.title,
         )
         task.url = await self.__download_file(new_task.image)
-        return await self.__task_repository.create(instance=task)
+        async with self.__unit_of_work:
+            return await self.__task_repository.create(instance=task)
 
     async def get_task(self, task_id: UUID) -> Task:
         return await self.__task_repository.get(task_id)
@@ -48,9 +64,16 @@ class TaskService:
         task = await self.__task_repository.get(task_id)
         task.title = update_task_data.title
         task.url = await self.__download_file(update_task_data.image)
-        return await self.__task_repository.update(task_id, task)
+        task.telegram_file_id = None
+        async with self.__unit_of_work:
+            task = await self.__task_repository.update(task_id, task)
+        self.__task_repository.invalidate_cache(task_id)
+        return task
 
     async def change_status(self, task_id: UUID) -> Task:
         task = await self.__task_repository.get(task_id)
         task.is_archived = not task.is_archived
-        return await self.__task_repository.update(task_id, task)
+        async with self.__unit_of_work:
+            task = await self.__task_repository.update(task_id, task)
+        self.__task_repository.invalidate_cache(task_id)
+        return task
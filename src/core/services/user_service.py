@@ -11,9 +11,11 @@ from src.api.request_models.user import (
 )
 from src.api.response_models.user import UserDetailResponse, UserWithStatusResponse
 from src.core import exceptions
+from src.core.db.DTO_models import UserIdentityDto
 from src.core.db.models import Request, User
 from src.core.db.repository.request_repository import RequestRepository
 from src.core.db.repository.user_repository import UserRepository
+from src.core.db.unit_of_work import UnitOfWork, require_unit_of_work
 from src.core.services.shift_service import ShiftService
 from src.core.settings import settings
 
@@ -46,21 +48,25 @@ class UserService:
         user_repository: UserRepository = Depends(),
         request_repository: RequestRepository = Depends(),
         shift_service: ShiftService = Depends(),
+        unit_of_work: UnitOfWork = Depends(),
     ) -> None:
         self.__user_repository = user_repository
         self.__request_repository = request_repository
         self.__shift_service = shift_service
+        self.__unit_of_work = require_unit_of_work(unit_of_work)
 
     async def register_user(self, new_user_data: UserCreateRequest) -> None:
         """Регистрация пользователя. Отправка запроса на участие в смене."""
         shift_id = await self.__shift_service.get_open_for_registration_shift_id()
-        user = await self.__update_or_create_user(new_user_data)
-        request = await self.__request_repository.get_by_user_and_shift(user.id, shift_id)
-        if request:
-            await self.__update_request_data(request)
-        else:
-            request = Request(user_id=user.id, shift_id=shift_id)
-            await self.__request_repository.create(request)
+        async with self.__unit_of_work:
+            user = await self.__update_or_create_user(new_user_data)
+            request = await self.__request_repository.get_by_user_and_shift(user.id, shift_id)
+            if request:
+                await self.__update_request_data(request)
+            else:
+                request = Request(user_id=user.id, shift_id=shift_id)
+                await self.__request_repository.create(request)
+        self.__user_repository.invalidate_identity(new_user_data.telegram_id)
 
     async def __update_request_data(self, request: Request) -> None:
         """Обработка повторного запроса пользователя на участие в смене."""
@@ -95,6 +101,10 @@ class UserService:
         """Получить участника проекта по его telegram_id."""
         return await self.__user_repository.get_by_telegram_id(telegram_id)
 
+    async def get_user_identity_by_telegram_id(self, telegram_id: int) -> Optional[UserIdentityDto]:
+        """Получить id участника проекта и участника текущей смены по telegram_id. Данные берутся из кэша."""
+        return await self.__user_repository.get_identity_by_telegram_id(telegram_id)
+
     async def get_user_by_id_with_shifts_detail(self, user_id: UUID) -> UserDetailResponse:
         """Получить участника проекта с информацией о сменах по его id."""
         user = await self.__user_repository.get(user_id)
@@ -114,11 +124,15 @@ class UserService:
 
     async def set_telegram_blocked(self, user: User) -> None:
         user.telegram_blocked = True
-        await self.__user_repository.update(user.id, user)
+        async with self.__unit_of_work:
+            await self.__user_repository.update(user.id, user)
+        self.__user_repository.invalidate_identity(user.telegram_id)
 
     async def unset_telegram_blocked(self, user: User) -> None:
         user.telegram_blocked = False
-        await self.__user_repository.update(user.id, user)
+        async with self.__unit_of_work:
+            await self.__user_repository.update(user.id, user)
+        self.__user_repository.invalidate_identity(user.telegram_id)
 
     async def check_before_change_user_data(self, user_id: UUID) -> None:
         available_shift = await self.__shift_service.get_open_for_registration_shift_id()
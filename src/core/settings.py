@@ -30,6 +30,13 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str  # пароль для подключения к БД
     DB_HOST: str  # название сервиса (контейнера)
     DB_PORT: str  # порт для подключения к БД
+    DB_POOL_SIZE: int = 10  # количество постоянных соединений в пуле
+    DB_MAX_OVERFLOW: int = 20  # сколько соединений можно открыть сверх DB_POOL_SIZE при нагрузке
+    DB_POOL_TIMEOUT: int = 30  # время ожидания (в секундах) свободного соединения
+    DB_POOL_RECYCLE: int = 1800  # время (в секундах), через которое соединение будет переоткрыто
+    DB_POOL_PRE_PING: bool = True  # проверять соединение перед выдачей из пула
+    DB_STATEMENT_CACHE_SIZE: int = 100  # размер кэша подготовленных запросов asyncpg для каждого соединения
+    DB_ECHO: bool = False  # выводить в лог все SQL-запросы
 
     # Схема и домен, на котором развернуто приложение (например: http://example.net)
     APPLICATION_URL: str
@@ -79,6 +86,63 @@ class Settings(BaseSettings):
     # Количество попыток для сдачи фотоотчета для одного задания
     NUMBER_ATTEMPTS_SUBMIT_REPORT: int = 3
 
+    # Размер страницы списка отчетов на проверку
+    REPORTS_PAGE_SIZE: int = 50  # количество отчетов на странице по умолчанию
+    REPORTS_MAX_PAGE_SIZE: int = 200  # максимально допустимое количество отчетов на странице
+    REPORTS_MAX_MODERATION_BATCH_SIZE: int = 200  # максимальное количество отчетов в одном запросе на проверку
+
+    # Настройки очереди исходящих сообщений бота
+    MESSAGE_SENDER_WORKERS: int = 8  # количество одновременно работающих отправителей
+    MESSAGES_PER_SECOND: int = 25  # ограничение скорости отправки (лимит Telegram - 30 сообщений в секунду)
+    MESSAGES_MIN_PER_SECOND: int = 5  # ниже этой скорости отправка не снижается после ошибок RetryAfter
+    MESSAGES_RATE_INCREASE: float = 1  # на сколько сообщений в секунду растет скорость за секунду без ошибок
+    MESSAGE_CHAT_INTERVAL: float = 1  # минимальный интервал (в секундах) между сообщениями одному пользователю
+    MESSAGE_RATE_STATS_PERIOD: int = 10  # период (в секундах) расчета фактической скорости отправки
+    MESSAGE_SENDER_BATCH_SIZE: int = 100  # сколько сообщений выбирать из очереди за один запрос
+    MESSAGE_SENDER_POLL_INTERVAL: int = 5  # период (в секундах) проверки очереди на наличие новых сообщений
+    MESSAGE_MAX_ATTEMPTS: int = 5  # количество попыток отправки сообщения
+    MESSAGE_RETRY_DELAY: int = 3  # начальная задержка (в секундах) перед повторной отправкой
+
+    # Настройки загрузки фотоотчётов
+    PHOTO_DOWNLOAD_WORKERS: int = 4  # количество одновременно загружаемых фотографий
+    PHOTO_DOWNLOAD_QUEUE_SIZE: int = 200  # сколько фотографий может ожидать загрузки, остальные не принимаются
+    PHOTO_DOWNLOAD_STOP_TIMEOUT: int = 30  # сколько секунд при остановке бота ждать загрузки фотографий из очереди
+
+    # Количество потоков для хэширования и проверки паролей администраторов
+    PASSWORD_HASHING_WORKERS: int = 2
+
+    # Настройки пула процессов для формирования excel-отчётов
+    REPORT_RENDER_WORKERS: int = 2  # количество процессов, одновременно формирующих отчёты
+    REPORT_RENDER_QUEUE_SIZE: int = 4  # сколько отчётов может ожидать формирования, остальные запросы отклоняются
+
+    # Настройки заданий на формирование отчётов
+    EXPORTS_DIR: Path = BASE_DIR / "data" / "exports"  # директория для файлов сформированных отчётов
+    EXPORT_JOB_WORKERS: int = 1  # количество одновременно выполняемых заданий
+    EXPORT_FILE_LIFETIME = timedelta(days=1)  # сколько хранятся файлы отчётов, кроме кэша завершённых смен
+    EXPORT_CLEANUP_INTERVAL: int = 3600  # период (в секундах) удаления устаревших файлов отчётов
+
+    # Период (в секундах) обновления статистики отчётов для аналитики, если отчёты изменились
+    REPORT_STATISTICS_REFRESH_INTERVAL: int = 60
+
+    # Время (в секундах) хранения в кэше текущей смены и смены, открытой для регистрации.
+    # Кэш также сбрасывается при изменении смен и в начале новых суток
+    SHIFT_CACHE_TTL: int = 600
+
+    # Время (в секундах) хранения заданий в кэше. Кэш задания сбрасывается при его изменении
+    TASK_CACHE_TTL: int = 3600
+
+    # Настройки кэша пользователей бота по telegram_id: id пользователя, блокировка бота, текущий участник смены
+    USER_IDENTITY_CACHE_TTL: int = 600  # время (в секундах) хранения в кэше
+    USER_IDENTITY_CACHE_SIZE: int = 10000  # максимальное количество пользователей в кэше
+
+    # Настройки кэша баланса ломбарьерчиков участников текущей смены по telegram_id
+    BALANCE_CACHE_TTL: int = 3600  # время (в секундах) хранения в кэше
+    BALANCE_CACHE_SIZE: int = 10000  # максимальное количество балансов в кэше
+
+    # Время (в секундах) хранения в кэше id, роли и статуса администратора для проверки токена.
+    # Кэш администратора также сбрасывается при изменении его роли или статуса
+    ADMINISTRATOR_CACHE_TTL: int = 60
+
     # Время жизни ссылки для приглашения на регистрацию
     INVITE_LINK_EXPIRATION_TIME = timedelta(days=1)
 
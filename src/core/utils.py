@@ -2,13 +2,16 @@ import logging
 import secrets
 import string
 import sys
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from calendar import monthrange
 from datetime import date, datetime, timedelta
 from random import shuffle
+from uuid import UUID
 
 import pytz
 from loguru import logger
 
+from src.core import exceptions
 from src.core.settings import settings
 
 
@@ -27,6 +30,20 @@ def add_months(source_date: date, months: int):
     return date(year, month, day)
 
 
+def encode_cursor(created_at: datetime, object_id: UUID) -> str:
+    """Сформировать курсор для постраничного вывода по полям (created_at, id) последнего объекта страницы."""
+    return urlsafe_b64encode(f"{created_at.isoformat()}|{object_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Получить значения полей (created_at, id) из курсора."""
+    try:
+        created_at, object_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(object_id)
+    except ValueError:
+        raise exceptions.InvalidCursorError()
+
+
 def generate_password() -> str:
     """Генерация пароля в соответствии с правилами."""
     password_chars = [secrets.choice(string.ascii_uppercase) for _ in range(2)]
@@ -1,123 +1,128 @@
 import enum
-from dataclasses import astuple
-from io import BytesIO
+from dataclasses import astuple, dataclass
+from typing import Iterable
 
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, Side
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 
-from src.core.db.DTO_models import TasksAnalyticReportDto
+from src.core.db.DTO_models import (
+    MemberAnalyticReportDto,
+    ShiftAnalyticReportDto,
+    TasksAnalyticReportDto,
+)
 from src.excel_generator.task_builder import BaseAnalyticReportSettings
 
 
+@dataclass
+class AnalyticReportSheet:
+    """Данные листа отчёта, передаваемые в процесс формирования отчёта.
+
+    Данные передаются в другой процесс целиком, поэтому хранятся списком, а не итератором по курсору БД.
+    """
+
+    description: str
+    data: list[TasksAnalyticReportDto | ShiftAnalyticReportDto | MemberAnalyticReportDto]
+    report_settings: type[BaseAnalyticReportSettings]
+    sheet_name: str | None = None
+
+
 class AnalyticReportBuilder:
-    """Интерфейс строителя."""
+    """Интерфейс строителя.
+
+    Отчёт формируется в режиме write-only: строки записываются на диск по мере добавления,
+    а стили ячеек задаются заранее созданными именованными стилями.
+    """
 
-    async def generate_report(
+    def generate_report(
         self,
         description: str,
-        data: tuple[TasksAnalyticReportDto],
+        data: Iterable[TasksAnalyticReportDto | ShiftAnalyticReportDto | MemberAnalyticReportDto],
         workbook: Workbook,
         analytic_task_report_full: BaseAnalyticReportSettings,
+        sheet_name: str | None = None,
     ) -> Workbook:
-        """Генерация листа с данными."""
-        worksheet = self._create_sheet(workbook, sheet_name=analytic_task_report_full.sheet_name)
-        analytic_task_report_full.row_count = 0
-        self.__add_description(worksheet, description, analytic_task_report_full)
-        self.__add_header(worksheet, analytic_task_report_full)
-        self.__add_data(worksheet, data, analytic_task_report_full)
-        self.__add_footer(worksheet, analytic_task_report_full)
-        self.__apply_styles(worksheet)
+        """Генерация листа с данными. Если название листа не передано, берётся из конфигурации отчёта."""
+        worksheet = self._create_sheet(workbook, sheet_name=sheet_name or analytic_task_report_full.sheet_name)
+        columns_count = len(analytic_task_report_full.header_data)
+        self.__set_dimensions(worksheet, columns_count)
+        self.__add_description(worksheet, description, columns_count)
+        self.__add_row(worksheet, analytic_task_report_full.header_data, self.Styles.HEADER_STYLE.value)
+        last_row = 2
+        for row in data:
+            self.__add_row(worksheet, astuple(row), self.Styles.DATA_STYLE.value)
+            last_row += 1
+        self.__add_row(worksheet, analytic_task_report_full.get_footer_data(last_row), self.Styles.FOOTER_STYLE.value)
         return workbook
 
-    def __add_row(
-        self,
-        worksheet: Worksheet,
-        analytic_task_report: BaseAnalyticReportSettings,
-        data: tuple[str | int],
-    ) -> None:
-        analytic_task_report.row_count += 1
-        for index, value in enumerate(data, start=1):
-            worksheet.cell(row=analytic_task_report.row_count, column=index, value=value)
-
     @staticmethod
-    async def get_report_response(workbook: Workbook) -> BytesIO:
-        """Создание ответа."""
-        stream = BytesIO()
-        workbook.save(stream)
-        stream.seek(0)
-        return stream
+    def __add_row(worksheet: WriteOnlyWorksheet, data: tuple[str | int], style: str) -> None:
+        """Добавляет строку с заданным именованным стилем ячеек."""
+        row = []
+        for value in data:
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.style = style
+            row.append(cell)
+        worksheet.append(row)
 
-    @staticmethod
-    def create_workbook() -> Workbook:
+    @classmethod
+    def create_workbook(cls) -> Workbook:
         """Генерация excel файла."""
-        workbook = Workbook()
-        workbook.remove_sheet(workbook.active)
+        workbook = Workbook(write_only=True)
+        for named_style in cls.__get_named_styles():
+            workbook.add_named_style(named_style)
         return workbook
 
     @staticmethod
-    def _create_sheet(workbook: Workbook, sheet_name: str) -> Worksheet:
+    def _create_sheet(workbook: Workbook, sheet_name: str) -> WriteOnlyWorksheet:
         """Создаёт лист внутри отчёта."""
         return workbook.create_sheet(sheet_name)
 
-    def __add_description(
-        self,
-        worksheet: Worksheet,
-        description: str,
-        analytic_task_report: BaseAnalyticReportSettings,
-    ) -> None:
-        """Заполняет описание отчета."""
-        self.__add_row(worksheet, analytic_task_report, (description,))
-
-    def __add_header(self, worksheet: Worksheet, analytic_task_report: BaseAnalyticReportSettings) -> None:
-        """Заполняет первые строки в листе."""
-        self.__add_row(worksheet, analytic_task_report, analytic_task_report.header_data)
-
-    def __add_data(
-        self,
-        worksheet: Worksheet,
-        data: tuple[TasksAnalyticReportDto],
-        analytic_task_report: BaseAnalyticReportSettings,
-    ) -> None:
-        """Заполняет строки данными из БД."""
-        for task in data:
-            self.__add_row(worksheet, analytic_task_report, data=astuple(task))
-
-    def __add_footer(self, worksheet: Worksheet, analytic_task_report: BaseAnalyticReportSettings) -> None:
-        """Заполняет последнюю строку в листе."""
-        self.__add_row(worksheet, analytic_task_report, data=analytic_task_report.footer_data)
-
-    def __apply_styles(self, worksheet: Worksheet):
-        """Задаёт форматирование отчёта."""
-        rows = list(worksheet.iter_rows())
-        worksheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(rows[0]))
-        # задаём стиль для описания отчета
-        description_rows = rows[0]
-        for cell in description_rows:
-            cell.font = self.Styles.FONT_STANDART.value
-            cell.alignment = self.Styles.DESCRIPTION_ALIGNMENT.value
-        # задаём стиль для хэдера
-        header_cells = rows[1]
-        for cell in header_cells:
-            cell.font = self.Styles.FONT_BOLD.value
-            cell.alignment = self.Styles.ALIGNMENT_HEADER.value
-        # задаём стиль для ячеек с данными
-        data_rows = rows[2:-1]
-        for row in data_rows:
-            for cell in row:
-                cell.font = self.Styles.FONT_STANDART.value
-                cell.alignment = self.Styles.ALIGNMENT_STANDART.value
-        # задаём стиль для футера
-        footer_cells = rows[-1]
-        for cell in footer_cells:
-            cell.font = self.Styles.FONT_BOLD.value
-            cell.alignment = self.Styles.ALIGNMENT_STANDART.value
-        # задаём стиль границ и колонок
-        for row in rows:
-            for cell in row:
-                cell.border = self.Styles.BORDER.value
+    def __set_dimensions(self, worksheet: WriteOnlyWorksheet, columns_count: int) -> None:
+        """Задаёт размеры колонок и строк. В режиме write-only задаётся до записи строк."""
         worksheet.column_dimensions["B"].width = self.Styles.WIDTH.value
         worksheet.row_dimensions[1].height = self.Styles.HEIGHT.value
+        worksheet.merged_cells.add(f"A1:{get_column_letter(columns_count)}1")
+
+    def __add_description(self, worksheet: WriteOnlyWorksheet, description: str, columns_count: int) -> None:
+        """Заполняет описание отчета."""
+        self.__add_row(
+            worksheet,
+            (description,) + ("",) * (columns_count - 1),
+            self.Styles.DESCRIPTION_STYLE.value,
+        )
+
+    @classmethod
+    def __get_named_styles(cls) -> tuple[NamedStyle]:
+        """Создаёт именованные стили отчёта. Стили привязываются к книге, поэтому создаются для каждой книги."""
+        return (
+            NamedStyle(
+                name=cls.Styles.DESCRIPTION_STYLE.value,
+                font=cls.Styles.FONT_STANDART.value,
+                alignment=cls.Styles.DESCRIPTION_ALIGNMENT.value,
+                border=cls.Styles.BORDER.value,
+            ),
+            NamedStyle(
+                name=cls.Styles.HEADER_STYLE.value,
+                font=cls.Styles.FONT_BOLD.value,
+                alignment=cls.Styles.ALIGNMENT_HEADER.value,
+                border=cls.Styles.BORDER.value,
+            ),
+            NamedStyle(
+                name=cls.Styles.DATA_STYLE.value,
+                font=cls.Styles.FONT_STANDART.value,
+                alignment=cls.Styles.ALIGNMENT_STANDART.value,
+                border=cls.Styles.BORDER.value,
+            ),
+            NamedStyle(
+                name=cls.Styles.FOOTER_STYLE.value,
+                font=cls.Styles.FONT_BOLD.value,
+                alignment=cls.Styles.ALIGNMENT_STANDART.value,
+                border=cls.Styles.BORDER.value,
+            ),
+        )
 
     class Styles(enum.Enum):
         FONT_BOLD = Font(name='Times New Roman', size=11, bold=True)
@@ -130,3 +135,7 @@ class AnalyticReportBuilder:
         )
         WIDTH = 50
         HEIGHT = 55
+        DESCRIPTION_STYLE = "report_description"
+        HEADER_STYLE = "report_header"
+        DATA_STYLE = "report_data"
+        FOOTER_STYLE = "report_footer"
@@ -0,0 +1,32 @@
+from src.excel_generator.task_builder import BaseAnalyticReportSettings
+
+
+class MemberAnalyticReportSettings(BaseAnalyticReportSettings):
+    """Конфигурация сводного отчёта по участникам смен."""
+
+    sheet_name: str = "Участники"
+    header_data: tuple[str] = (
+        "№ Смены",
+        "Фамилия",
+        "Имя",
+        "Статус участника",
+        "Кол-во ломбарьерчиков",
+        "Кол-во одобренных отчётов",
+        "Кол-во отклонённых отчётов",
+        "Кол-во не предоставленных отчётов",
+        "Всего отчётов",
+    )
+
+    @staticmethod
+    def get_footer_data(last_row: int) -> tuple[str]:
+        return (
+            "ИТОГО:",
+            "",
+            "",
+            "",
+            f"=SUM(E2:E{last_row})",
+            f"=SUM(F2:F{last_row})",
+            f"=SUM(G2:G{last_row})",
+            f"=SUM(H2:H{last_row})",
+            f"=SUM(I2:I{last_row})",
+        )
@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import mkstemp
+from typing import AsyncIterator
+
+from src.core import exceptions
+from src.core.settings import settings
+from src.excel_generator.builder import AnalyticReportBuilder, AnalyticReportSheet
+
+REPORT_CHUNK_SIZE = 64 * 1024
+
+
+def render_report(sheets: tuple[AnalyticReportSheet], path: str) -> None:
+    """Формирует файл отчёта по указанному пути. Выполняется в отдельном процессе."""
+    builder = AnalyticReportBuilder()
+    workbook = builder.create_workbook()
+    for sheet in sheets:
+        builder.generate_report(sheet.description, sheet.data, workbook, sheet.report_settings, sheet.sheet_name)
+    workbook.save(path)
+
+
+class ReportRenderer:
+    """Пул процессов для формирования excel-отчётов.
+
+    Формирование отчёта нагружает процессор, поэтому выполняется вне цикла событий приложения.
+    Одновременно формируется не больше workers_count отчётов и ещё не больше queue_size ожидают
+    свободного процесса. Если очередь заполнена, запрос на формирование отчёта отклоняется,
+    а фоновые задания ждут освобождения места в очереди.
+    """
+
+    def __init__(
+        self,
+        workers_count: int = settings.REPORT_RENDER_WORKERS,
+        queue_size: int = settings.REPORT_RENDER_QUEUE_SIZE,
+    ) -> None:
+        self.__workers_count = workers_count
+        self.__slots = asyncio.Semaphore(workers_count + queue_size)
+        self.__executor: ProcessPoolExecutor | None = None
+
+    async def render(self, sheets: tuple[AnalyticReportSheet]) -> AsyncIterator[bytes]:
+        """Сформировать отчёт в пуле процессов и вернуть его содержимое частями."""
+        file_descriptor, path = mkstemp(suffix=".xlsx")
+        os.close(file_descriptor)
+        try:
+            await self.render_to_file(sheets, path)
+        except BaseException:
+            os.remove(path)
+            raise
+        return self.__read_report(path)
+
+    async def render_to_file(
+        self, sheets: tuple[AnalyticReportSheet], path: str, wait_for_slot: bool = False
+    ) -> None:
+        """Сформировать отчёт в пуле процессов и сохранить его по указанному пути.
+
+        Если очередь заполнена, при wait_for_slot=True ожидает освобождения места,
+        иначе выбрасывает ReportRenderQueueFullError.
+        """
+        if not wait_for_slot and self.__slots.locked():
+            raise exceptions.ReportRenderQueueFullError()
+        async with self.__slots:
+            await asyncio.get_running_loop().run_in_executor(self.__get_executor(), render_report, sheets, path)
+
+    def shutdown(self) -> None:
+        """Остановить процессы пула."""
+        if self.__executor:
+            self.__executor.shutdown(cancel_futures=True)
+            self.__executor = None
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        """Создаёт пул при первом формировании отчёта.
+
+        Процессы запускаются методом spawn, чтобы не копировать состояние работающего приложения.
+        """
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(
+                max_workers=self.__workers_count, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self.__executor
+
+    @staticmethod
+    async def __read_report(path: str) -> AsyncIterator[bytes]:
+        """Отдаёт файл отчёта частями и удаляет его. Файл читается в потоке, чтобы не блокировать цикл событий."""
+        try:
+            with open(path, "rb") as report_file:
+                while chunk := await asyncio.to_thread(report_file.read, REPORT_CHUNK_SIZE):
+                    yield chunk
+        finally:
+            os.remove(path)
+
+
+report_renderer = ReportRenderer()
@@ -1,11 +1,27 @@
+import abc
 from dataclasses import dataclass
 
 
 @dataclass
-class BaseAnalyticReportSettings:
+class BaseAnalyticReportSettings(abc.ABC):
+    """Базовая конфигурация отчёта.
+
+    Конфигурации используются как классы, без создания экземпляров, поэтому отсутствие
+    get_footer_data проверяется при объявлении подкласса.
+    """
+
     sheet_name: str
     header_data: tuple[str]
-    row_coun: int
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if getattr(cls.get_footer_data, "__isabstractmethod__", False):
+            raise TypeError(f"В конфигурации отчёта {cls.__name__} не задан метод get_footer_data")
+
+    @staticmethod
+    @abc.abstractmethod
+    def get_footer_data(last_row: int) -> tuple[str]:
+        """Возвращает итоговую строку отчёта с формулами по строкам данных до last_row включительно."""
 
 
 class TaskAnalyticReportSettings(BaseAnalyticReportSettings):
@@ -19,15 +35,13 @@ class TaskAnalyticReportSettings(BaseAnalyticReportSettings):
         "Кол-во отклонённых отчётов",
         "Кол-во не предоставленных отчётов",
     )
-    row_count: int = 0
 
-    @classmethod
-    @property
-    def footer_data(cls):
+    @staticmethod
+    def get_footer_data(last_row: int) -> tuple[str]:
         return (
             "ИТОГО:",
             "",
-            f"=SUM(B2:B{cls.row_count})",
-            f"=SUM(C2:C{cls.row_count})",
-            f"=SUM(D2:D{cls.row_count})",
+            f"=SUM(C2:C{last_row})",
+            f"=SUM(D2:D{last_row})",
+            f"=SUM(E2:E{last_row})",
         )